@@ -0,0 +1,114 @@
+# Modules/anpr_pairing.py
+import heapq
+from datetime import datetime
+from Modules.helpers import plate_key
+
+DEDUP_WINDOW_SECONDS = 60
+# İçerideki aracın bu süreden kısa aralıkla gelen yeni girişi kamera tekrarıdır; daha uzunsa çıkış kaçırılmıştır
+REENTRY_GUARD_SECONDS = 600
+
+class PairingEngine:
+    """Doğrulanmış okumaları (ingest_server.validate_event çıktısı, 'timestamp' dahil) olaylara çevirir"""
+
+    def __init__(self, dedup_window=DEDUP_WINDOW_SECONDS, reentry_guard=REENTRY_GUARD_SECONDS):
+        self.dedup_window = dedup_window
+        self.reentry_guard = reentry_guard
+        self._last_seen = {}   # (plaka anahtarı, yön) -> son okuma zamanı (epoch sn)
+        self._expiry = []      # (süre dolumu, anahtar) öncelik kuyruğu; eskimiş girdiler atılarak temizlenir
+        self._open = {}        # plaka anahtarı -> [giriş zamanı epoch sn, event_id, kayıt id'si (yazılınca)]
+        self.stats = {'reads': 0, 'duplicates': 0, 'entries': 0, 'exits': 0, 'flagged': 0}
+
+    def load_open_visits(self, visits):
+        """Açık ziyaret indeksini veritabanındaki (id, plaka, giriş tarihi) satırlarıyla kurar; plakanın en son girişi tutulur"""
+        self._open = {}
+        for record_id, plate, entry_date in visits:
+            try:
+                entered = datetime.strptime(entry_date, "%Y-%m-%d %H:%M").timestamp()
+            except (TypeError, ValueError):
+                entered = 0
+            key = plate_key(plate)
+            current = self._open.get(key)
+            if current is None or (entered, record_id) > (current[0], current[2]):
+                self._open[key] = [entered, None, record_id]
+
+    @property
+    def open_visits(self):
+        return len(self._open)
+
+    def _expire(self, now):
+        expiry, last_seen = self._expiry, self._last_seen
+        while expiry and expiry[0][0] <= now:
+            _, key = heapq.heappop(expiry)
+            seen = last_seen.get(key)
+            if seen is not None and seen + self.dedup_window <= now:
+                del last_seen[key]
+
+    def _is_duplicate(self, key, now):
+        """Pencere son okumadan itibaren kayar: araç kamera önünde beklerken gelen okumalar da tekrardır"""
+        seen = self._last_seen.get(key)
+        self._last_seen[key] = now if seen is None else max(seen, now)
+        heapq.heappush(self._expiry, (self._last_seen[key] + self.dedup_window, key))
+        return seen is not None and now - seen < self.dedup_window
+
+    def _flag(self, flags, kind, read):
+        self.stats['flagged'] += 1
+        flags.append({'flag': kind, 'plate': read['plate'], 'time': read['time'], 'camera': read.get('camera'), 'event_id': read['event_id']})
+
+    def process(self, read, events, flags):
+        """Bir okumayı işler; üretilen olayları events'e, işaretleri flags'e ekler"""
+        self.stats['reads'] += 1
+        now, key = read['timestamp'], plate_key(read['plate'])
+        self._expire(now)
+        if self._is_duplicate((key, read['type']), now):
+            self.stats['duplicates'] += 1
+            return
+        if read['type'] == "entry":
+            visit = self._open.get(key)
+            if visit is not None:
+                if now - visit[0] < self.reentry_guard:
+                    self._flag(flags, "duplicate_entry", read)
+                    return
+                self._flag(flags, "missed_exit", read)
+            self._open[key] = [now, read['event_id'], None]
+            self.stats['entries'] += 1
+            events.append({field: value for field, value in read.items() if field != 'timestamp'})
+            return
+        event = {field: value for field, value in read.items() if field != 'timestamp'}
+        visit = self._open.pop(key, None)
+        if visit is None:
+            # Yine de yazıcıya iletilir: ziyaret arayüzden elle açılmış olabilir
+            self._flag(flags, "unmatched_exit", read)
+        elif visit[2] is not None:
+            event['record_id'] = visit[2]  # yazıcı plakayla aramadan kayda gider
+        self.stats['exits'] += 1
+        events.append(event)
+
+    def process_many(self, reads):
+        """Okumaları sırayla işler; (olaylar, işaretler) döndürür"""
+        events, flags = [], []
+        for read in reads:
+            self.process(read, events, flags)
+        return events, flags
+
+    def confirm(self, event, result):
+        """Yazıcının sonucunu indekse işler; yazılmayan veya tekrar gönderilen girişin ziyareti indeksten çıkarılır"""
+        if event['type'] != "entry":
+            return
+        key = plate_key(event['plate'])
+        visit = self._open.get(key)
+        if visit is None or visit[1] != event['event_id']:
+            return
+        if result.get('status') == "created" and result.get('record_id') is not None and not result.get('duplicate'):
+            visit[2] = result['record_id']
+        else:
+            del self._open[key]
+
+    def observe(self, event, result):
+        """Eşleştirmeden geçmeden doğrudan yazılan olayları (POST /events) indekse işler"""
+        if result.get('duplicate'):
+            return
+        key = plate_key(event['plate'])
+        if event['type'] == "entry" and result.get('status') == "created":
+            self._open[key] = [event['timestamp'], event['event_id'], result.get('record_id')]
+        elif event['type'] == "exit" and result.get('status') == "checked_out":
+            self._open.pop(key, None)
@@ -0,0 +1,158 @@
+# Modules/autocomplete.py
+import heapq
+import math
+import time
+from bisect import bisect_left
+from Modules.helpers import plate_key, turkish_sort_key
+
+# Form alanı (main_tab_widgets.create_form_frame anahtarları) -> vehicles sütunu
+FORM_FIELD_COLUMNS = {
+    "Plaka": "plaka", "Dorse": "dorsePlaka", "Sürücü": "surucu",
+    "Telefon": "telefon", "Sürücünün": "surucuFirma", "Gelinen": "gelinenFirma",
+}
+# Boşluk ve tire farkı gözetilmeyen alanlar (helpers.plate_key); diğerleri helpers.turkish_sort_key
+COMPACT_KEY_FIELDS = ("Plaka", "Dorse", "Telefon")
+SUGGESTION_LIMIT = 8
+# Bu kadar değerden geniş önek aralıkları taranmaz; en iyi öneriler önceden hesaplanır
+SCAN_LIMIT = 256
+# Son kullanım zamanının ağırlığı: bu kadar gün yeni kullanılan değer, iki kat sık kullanılanla eşit sayılır
+RECENCY_HALF_LIFE_DAYS = 30
+_PREFIX_END = chr(0x10FFFF)
+
+def _score(count, last_used):
+    """Sıklık ve yakınlık puanı: count * 2^(gün / yarı ömür) değerinin logaritması (zamanla yeniden hesap gerekmez)"""
+    return math.log2(count) + last_used / (86400 * RECENCY_HALF_LIFE_DAYS)
+
+class SuggestionIndex:
+    """Bir alanın değerleri: anahtar sıralı dizi + önek aralığında sıklık/yakınlık sıralaması"""
+
+    def __init__(self, key_function=turkish_sort_key, limit=SUGGESTION_LIMIT):
+        self.key_function = key_function
+        self.limit = limit
+        self._keys = []     # sıralı arama anahtarları
+        self._scores = []   # _keys ile aynı sırada puanlar
+        self._values = {}   # anahtar -> [gösterilen değer, kullanım sayısı, son kullanım epoch sn]
+        self._top = {}      # geniş önek -> [(puan, anahtar), ...] en iyi öneriler, büyükten küçüğe
+
+    def __len__(self):
+        return len(self._keys)
+
+    def build(self, rows):
+        """Dizini Database.get_autocomplete_values satırlarından (anahtar, yazım, sayı, son kullanım) baştan kurar"""
+        self._values = {key: [value, count, last_used or 0] for key, value, count, last_used in rows if key}
+        self._keys = sorted(self._values)
+        self._scores = [_score(self._values[key][1], self._values[key][2]) for key in self._keys]
+        self._top = {}
+        self._precompute_top()
+
+    def _precompute_top(self):
+        """Geniş önek aralıklarının en iyi önerileri; her derinlikte aralıklar ayrık olduğundan toplam maliyet n * derinlik"""
+        ranges = [(0, len(self._keys))]
+        depth = 0
+        while ranges:
+            depth += 1
+            wide = []
+            for lo, hi in ranges:
+                start = lo
+                while start < hi:
+                    key = self._keys[start]
+                    if len(key) < depth:
+                        start += 1
+                        continue
+                    prefix = key[:depth]
+                    end = bisect_left(self._keys, prefix + _PREFIX_END, start, hi)
+                    if end - start > SCAN_LIMIT:
+                        self._top[prefix] = self._rank(start, end)
+                        wide.append((start, end))
+                    start = end
+            ranges = wide
+
+    def _rank(self, lo, hi):
+        best = heapq.nlargest(self.limit, range(lo, hi), key=self._scores.__getitem__)
+        return [(self._scores[i], self._keys[i]) for i in best]
+
+    def add(self, value, when=None):
+        """Yeni kayıtta kullanılan değeri ekler veya sayısını artırır; puan yalnızca artar"""
+        key = self.key_function(value)
+        if not key:
+            return
+        when = time.time() if when is None else when
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = [value, 1, when]
+            position = bisect_left(self._keys, key)
+            self._keys.insert(position, key)
+            self._scores.insert(position, _score(1, when))
+        else:
+            entry[1] += 1
+            entry[2] = max(entry[2], when)
+            position = bisect_left(self._keys, key)
+            self._scores[position] = _score(entry[1], entry[2])
+        score = self._scores[position]
+        # Puan yalnızca arttığından saklanan listelerde değer ya yükselir ya da listeye yeni girer
+        for depth in range(1, len(key) + 1):
+            top = self._top.get(key[:depth])
+            if top is None:
+                continue
+            top[:] = [item for item in top if item[1] != key]
+            top.append((score, key))
+            top.sort(reverse=True)
+            del top[self.limit:]
+
+    def suggest(self, prefix):
+        """Önekle başlayan değerler, en sık/yakın kullanılan önce"""
+        key = self.key_function(prefix)
+        if not key:
+            return []
+        top = self._top.get(key)
+        if top is None:
+            lo = bisect_left(self._keys, key)
+            hi = bisect_left(self._keys, key + _PREFIX_END, lo)
+            top = self._rank(lo, hi)
+            if hi - lo > SCAN_LIMIT:
+                # Eklemelerle genişleyen aralık: bir kez hesaplanır, sonra artımlı güncellenir
+                self._top[key] = top
+        return [self._values[item_key][0] for _, item_key in top]
+
+def _new_indexes(limit):
+    return {field: SuggestionIndex(plate_key if field in COMPACT_KEY_FIELDS else turkish_sort_key, limit) for field in FORM_FIELD_COLUMNS}
+
+def build_form_indexes(db, limit=SUGGESTION_LIMIT):
+    """Alanların öneri dizinlerini veritabanındaki değerlerden kurar; arka plan iş parçacığında çağrılır"""
+    indexes = _new_indexes(limit)
+    for field, column in FORM_FIELD_COLUMNS.items():
+        indexes[field].build(db.get_autocomplete_values(column))
+    return indexes
+
+class FormAutocomplete:
+    """Giriş formunun altı alanının öneri dizinleri"""
+
+    def __init__(self, limit=SUGGESTION_LIMIT):
+        self.indexes = _new_indexes(limit)
+        self.loaded = False
+        self._pending = []  # yükleme bitmeden eklenen kayıtlar
+
+    def load(self, indexes):
+        """Arka planda kurulan dizinleri devreye alır; yükleme sırasında eklenen kayıtlar sonra işlenir"""
+        self.indexes = indexes
+        self.loaded = True
+        for data, when in self._pending:
+            self.add_record(data, when)
+        self._pending = []
+
+    def add_record(self, data, when=None):
+        """Forma girilen yeni kaydın değerlerini dizinlere ekler (data: form alanı -> değer)"""
+        if not self.loaded:
+            self._pending.append((dict(data), time.time() if when is None else when))
+            return
+        for field, index in self.indexes.items():
+            value = (data.get(field) or "").strip()
+            if value:
+                # Kayıtlar büyük harfle saklanır (Database.add_record); öneriler de öyle gösterilir
+                index.add(value.upper(), when)
+
+    def suggest(self, field, prefix):
+        index = self.indexes.get(field)
+        if index is None or not self.loaded:
+            return []
+        return index.suggest(prefix)
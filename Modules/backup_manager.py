@@ -1,15 +1,114 @@
 # Modules/backup_manager.py
 import os
 import calendar
-import zipfile
-import time
-import tempfile
-import shutil
-import gc  # <-- Gerekli modül eklendi
 from datetime import datetime, time as dt_time, timedelta
-from Modules.custom_windows import BackupNotificationWindow
+from Modules.helpers import get_backup_dir
 from Modules.logger import logger
 
+# Yedek türü -> alt klasör
+BACKUP_SUBFOLDERS = {"daily": "Gunluk", "monthly": "Aylik", "manual": "Manuel"}
+MONTH_NAMES = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran", "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+
+def create_backup(db, settings, kind="manual"):
+    """Veritabanını ayarlardaki yedek klasörüne yedekler (sıkıştırma ve saklama süresi dahil), dosya yolunu döndürür."""
+    import shutil, tempfile, zipfile
+    temp_dir = None
+    try:
+        base_path = get_backup_dir(settings)
+        now = datetime.now()
+        
+        subfolder = BACKUP_SUBFOLDERS[kind]
+        if kind == "monthly":
+            prev_month_date = now - timedelta(days=1)
+            month_name = MONTH_NAMES[prev_month_date.month - 1]
+            timestamp = f"{prev_month_date.year}_{prev_month_date.month:02d}_{month_name}"
+        elif kind == "manual":
+            timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
+        else:
+            timestamp = now.strftime("%Y-%m-%d")
+
+        dest_folder = os.path.join(base_path, subfolder)
+        os.makedirs(dest_folder, exist_ok=True)
+        
+        # Sunucu istemcisinde db_path bir adres olduğundan sabit bir ad kullanılır
+        db_name = getattr(db, "backup_name", None) or os.path.splitext(os.path.basename(db.db_path))[0]
+        db_backup_filename = f"{db_name}_{timestamp}.db"
+        
+        temp_dir = tempfile.mkdtemp()
+        temp_db_path = os.path.join(temp_dir, db_backup_filename)
+        
+        # Veritabanı bağlantısını bu blok içinde açıp kapattığından emin ol
+        db.backup_database(temp_db_path)
+
+        if settings.get('enable_backup_compression', True):
+            final_backup_path = os.path.join(dest_folder, f"{db_name}_{timestamp}.zip")
+            with zipfile.ZipFile(final_backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                zipf.write(temp_db_path, db_backup_filename)
+        else:
+            final_backup_path = os.path.join(dest_folder, db_backup_filename)
+            shutil.copy2(temp_db_path, final_backup_path)
+
+        logger.log_info(f"Yedekleme tamamlandı: {final_backup_path}")
+        
+        if kind == "daily":
+            retention_map = {"7 Gün": 7, "45 Gün": 45}
+            retention_days = retention_map.get(settings.get('daily_retention', '45 Gün'), 45)
+            db.cleanup_old_backups(dest_folder, retention_days, db_name)
+        return final_backup_path
+    finally:
+        if temp_dir and os.path.exists(temp_dir):
+            try:
+                shutil.rmtree(temp_dir)
+            except Exception as e:
+                logger.log_error("Geçici yedekleme klasörü silinemedi", e)
+
+def restore_backup(file_path, db_path):
+    """Sıkıştırılmış (.zip) veya normal (.db) yedeği db_path'in üzerine yazar. Bağlantılar önceden kapatılmalıdır."""
+    import shutil, tempfile, zipfile
+    db_to_restore = file_path
+    temp_dir = None
+    try:
+        # Eğer dosya sıkıştırılmışsa, önce geçici bir dizine aç
+        if file_path.endswith(".zip"):
+            temp_dir = tempfile.mkdtemp()
+            with zipfile.ZipFile(file_path, 'r') as zip_ref:
+                # Zip içindeki ilk .db dosyasını bul ve aç
+                db_filename = next((f for f in zip_ref.namelist() if f.endswith('.db')), None)
+                if not db_filename:
+                    raise Exception(".zip arşivi içinde .db dosyası bulunamadı.")
+                zip_ref.extract(db_filename, temp_dir)
+                db_to_restore = os.path.join(temp_dir, db_filename)
+
+        # Eski dosyanın WAL/SHM artıkları geri yüklenen dosyaya uygulanmasın
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+        shutil.copyfile(db_to_restore, db_path)
+        # İşlem günlüğü yedek anına geri döndü; eşler bu kimliğin daha yeni işlemlerini almış sayar.
+        # Yeni kimlikle eşler günlüğü baştan alır, kaybolan kayıtlar da eşlerden geri gelir.
+        from database import Database
+        db = Database(db_path)
+        try:
+            replica_id = db.reset_replica_id()
+        finally:
+            db.close()
+        logger.log_info(f"Veritabanı geri yüklendi: {file_path} (yeni replika kimliği {replica_id})")
+    finally:
+        # Geçici dosyaları temizle
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+def create_archive(db, settings, date_str):
+    """date_str'den eski kayıtları yedek klasöründeki yeni bir arşiv veritabanına taşır; (kayıt sayısı, arşiv yolu) döndürür."""
+    archive_folder = os.path.join(get_backup_dir(settings), "Arsiv")
+    os.makedirs(archive_folder, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
+    archive_db_path = os.path.join(archive_folder, f"arsiv_{timestamp}.db")
+    
+    count = db.archive_records_before_date(archive_db_path, date_str)
+    logger.log_info(f"Arşivleme tamamlandı: {count} kayıt")
+    return count, archive_db_path
+
 class BackupManager:
     def __init__(self, app_instance):
         self.app = app_instance
@@ -42,11 +141,13 @@ class BackupManager:
 
     def _perform_monthly_backup(self):
         """Aylık yedekleme işlemini başlatır."""
+        from Modules.custom_windows import BackupNotificationWindow
         notification = BackupNotificationWindow(self.app.root, title="Aylık Yedekleme", message="Ay sonu yedeklemesi yapılıyor...")
         self.app.root.after(100, lambda: self._backup_task(notification, is_monthly=True))
 
     def perform_backup(self, manual=False, is_auto=False):
         """Standart yedekleme işlemini başlatır."""
+        from Modules.custom_windows import BackupNotificationWindow
         title = "Otomatik Yedekleme" if is_auto else "Manuel Yedekleme"
         message = "Yedekleme yapılıyor, lütfen bekleyin..."
         notification = BackupNotificationWindow(self.app.root, title=title, message=message)
@@ -54,51 +155,11 @@ class BackupManager:
 
     def _backup_task(self, notification, manual=False, is_monthly=False):
         """Yedekleme ve sıkıştırma görevini en sağlam yöntemle yürütür."""
-        final_backup_path = None
-        temp_dir = None
         try:
-            base_path = self.app.settings.get('backup_path', 'Yedekler')
-            now = datetime.now()
-            
-            if is_monthly:
-                subfolder = "Aylik"
-                prev_month_date = now - timedelta(days=1)
-                month_name = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran", "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"][prev_month_date.month - 1]
-                timestamp = f"{prev_month_date.year}_{prev_month_date.month:02d}_{month_name}"
-            elif manual:
-                subfolder = "Manuel"
-                timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
-            else:
-                subfolder = "Gunluk"
-                timestamp = now.strftime("%Y-%m-%d")
-
-            dest_folder = os.path.join(base_path, subfolder)
-            os.makedirs(dest_folder, exist_ok=True)
-            
-            db_name = os.path.splitext(os.path.basename(self.app.db.db.db_path))[0]
-            db_backup_filename = f"{db_name}_{timestamp}.db"
-            
-            temp_dir = tempfile.mkdtemp()
-            temp_db_path = os.path.join(temp_dir, db_backup_filename)
-            
-            # Veritabanı bağlantısını bu blok içinde açıp kapattığından emin ol
-            self.app.db.db.backup_database(temp_db_path)
-
-            if self.app.settings.get('enable_backup_compression', True):
-                final_backup_path = os.path.join(dest_folder, f"{db_name}_{timestamp}.zip")
-                with zipfile.ZipFile(final_backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    zipf.write(temp_db_path, db_backup_filename)
-            else:
-                final_backup_path = os.path.join(dest_folder, db_backup_filename)
-                shutil.copy2(temp_db_path, final_backup_path)
-
-            logger.log_info(f"Yedekleme tamamlandı: {final_backup_path}")
-            
-            if subfolder == "Gunluk":
-                retention_map = {"7 Gün": 7, "45 Gün": 45}
-                retention_days = retention_map.get(self.app.settings.get('daily_retention', '45 Gün'), 45)
-                self.app.db.db.cleanup_old_backups(dest_folder, retention_days, db_name)
+            kind = "monthly" if is_monthly else "manual" if manual else "daily"
+            final_backup_path = create_backup(self.app.db.db, self.app.settings, kind)
             
+            now = datetime.now()
             if is_monthly: self.last_monthly_backup = now.month
             if not manual: self.app.last_backup_date = now.date()
             
@@ -107,38 +168,21 @@ class BackupManager:
             logger.log_error("Yedekleme hatası", e)
             message = f"Yedekleme sırasında bir hata oluştu!"
         finally:
-            # --- HATA DÜZELTMESİNİN SON VE EN GÜÇLÜ HALİ ---
-            # Geçici klasörü ve içindekileri silmeden önce tüm referansları temizle
-            temp_db_path = None
-            gc.collect()  # Python'un çöp toplayıcısını zorla çalıştır
-            time.sleep(0.5) # İşletim sistemine dosyayı serbest bırakması için yarım saniye ver
-            
-            if temp_dir and os.path.exists(temp_dir):
-                try:
-                    shutil.rmtree(temp_dir)
-                except Exception as e:
-                    logger.log_error("Geçici yedekleme klasörü silinemedi", e)
-            
             notification.on_complete(message)
             self.app.update_status_bar()
 
     def run_archive_process(self, date_str):
+        from Modules.custom_windows import BackupNotificationWindow
         notification = BackupNotificationWindow(self.app.root, title="Arşivleme", message="Kayıtlar arşivleniyor...")
         self.app.root.after(100, lambda: self._archive_task(notification, date_str))
 
     def _archive_task(self, notification, date_str):
         try:
-            archive_folder = os.path.join(self.app.settings.get('backup_path', 'Yedekler'), "Arsiv")
-            os.makedirs(archive_folder, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
-            archive_db_path = os.path.join(archive_folder, f"arsiv_{timestamp}.db")
-            
-            count = self.app.db.db.archive_records_before_date(archive_db_path, date_str)
+            count, _ = create_archive(self.app.db.db, self.app.settings, date_str)
             message = f"{count} adet kayıt başarıyla arşivlendi."
-            logger.log_info(f"Arşivleme tamamlandı: {count} kayıt")
         except Exception as e:
             logger.log_error("Arşivleme hatası", e)
             message = "Arşivleme sırasında bir hata oluştu!"
         finally:
             notification.on_complete(message)
-            self.app.populate_treeview()
\ No newline at end of file
+            self.app.populate_treeview()
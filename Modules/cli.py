@@ -0,0 +1,311 @@
+# Modules/cli.py
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from database import Database
+from Modules.helpers import get_db_path, load_settings, format_duration
+from Modules.logger import logger
+from Modules.query_stats import query_stats, format_query_stats
+
+# Komut satırı biçim adı -> exporters.EXPORTERS anahtarı
+EXPORT_FORMATS = {"excel": "Excel", "pdf": "PDF", "html": "HTML", "csv": "CSV", "csv-gz": "CSV (gzip)", "ndjson": "NDJSON"}
+STATUS_FILTERS = {"inside": "inside", "checked_out": "checked_out"}
+
+def _parse_date(value):
+    """GG.AA.YYYY veya YYYY-AA-GG biçimindeki tarihi YYYY-AA-GG'ye çevirir"""
+    for date_format in ("%Y-%m-%d", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(value, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"Geçersiz tarih: {value} (YYYY-AA-GG veya GG.AA.YYYY)")
+
+def _parse_filter(value):
+    column, separator, text = value.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"Filtre 'sütun=değer' biçiminde olmalı: {value}")
+    return column.strip(), text.strip()
+
+def _print_json(data):
+    print(json.dumps(data, ensure_ascii=False, indent=2, default=str))
+
+def cmd_backup(args, settings):
+    from Modules.backup_manager import create_backup
+    db = Database(args.db)
+    try:
+        path = create_backup(db, settings, args.kind)
+    finally:
+        db.close()
+    print(path)
+    return 0
+
+def cmd_restore(args, settings):
+    from Modules.backup_manager import restore_backup
+    if not args.yes:
+        print("Mevcut veritabanının üzerine yazılacak. Onaylamak için --yes kullanın.", file=sys.stderr)
+        return 2
+    restore_backup(args.file, args.db)
+    print(f"Geri yüklendi: {args.file} -> {args.db}")
+    return 0
+
+def cmd_archive(args, settings):
+    from Modules.backup_manager import create_archive
+    date_str = args.before or (datetime.now() - timedelta(days=args.older_than_days)).strftime("%Y-%m-%d")
+    db = Database(args.db)
+    try:
+        count, path = create_archive(db, settings, date_str)
+    finally:
+        db.close()
+    print(f"{count} kayıt arşivlendi ({date_str} öncesi): {path}")
+    return 0
+
+def _export_spec(args):
+    if args.kind == "records":
+        return {'kind': 'records', 'year': args.year, 'month': args.month, 'status_filter': STATUS_FILTERS.get(args.status),
+                'search_term': args.search, 'descending': not args.ascending}
+    from Modules.report_rows import REPORT_COLUMNS
+    names_by_key = {key: name for name, key in REPORT_COLUMNS.items()}
+    columns = []
+    for column in (args.columns.split(",") if args.columns else REPORT_COLUMNS.values()):
+        column = REPORT_COLUMNS.get(column.strip(), column.strip())
+        if column not in names_by_key:
+            raise ValueError(f"Bilinmeyen sütun: {column} (geçerli: {', '.join(names_by_key)})")
+        columns.append(column)
+    today = datetime.now()
+    return {
+        'kind': 'custom_report', 'start_date': args.start or today.replace(day=1).strftime("%Y-%m-%d"),
+        'end_date': args.end or today.strftime("%Y-%m-%d"), 'filters': dict(args.filter or []),
+        'columns': columns, 'headers': [names_by_key[column] for column in columns],
+        'sort_by': args.sort, 'descending': not args.ascending if args.sort else False, 'match_mode': args.match,
+    }
+
+def cmd_export(args, settings):
+    from Modules.exporters import EXPORTERS, export_to_file
+    output_format = EXPORT_FORMATS[args.format]
+    output = args.output
+    if not output.endswith(EXPORTERS[output_format].extension):
+        output += EXPORTERS[output_format].extension
+
+    def progress(written, total):
+        if not args.quiet:
+            print(f"\r{written}/{total or '?'} satır", end="", file=sys.stderr, flush=True)
+
+    written = export_to_file(args.db, _export_spec(args), output_format, output, progress=progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"{written} satır yazıldı: {output}")
+    return 0
+
+def cmd_report(args, settings):
+    from Modules.dwell_analytics import compute_dwell_report
+    today = datetime.now()
+    start_date = args.start or today.replace(day=1).strftime("%Y-%m-%d")
+    end_date = args.end or today.strftime("%Y-%m-%d")
+    reader = Database.open_reader(args.db)
+    try:
+        data = reader.get_report_aggregates(start_date, end_date, ('entry_data', 'top_firms', 'top_drivers', 'top_vehicles',
+                                                                   'unique_vehicles', 'average_dwell_minutes'))
+        dwell = compute_dwell_report(reader.iter_dwell_times(start_date, end_date))
+    finally:
+        reader.close()
+    if args.json:
+        _print_json({'start_date': start_date, 'end_date': end_date, **data, 'dwell': dwell})
+        return 0
+
+    overall = dwell['overall']
+    print(f"Rapor: {start_date} - {end_date}")
+    print(f"  Toplam giriş      : {sum(count for _, count in data['entry_data'])}")
+    print(f"  Farklı araç       : {data['unique_vehicles'] or 0}")
+    print(f"  Bekleme (ort/p50/p90/p99): {format_duration(overall['mean'])} / {format_duration(overall['p50'])} / "
+          f"{format_duration(overall['p90'])} / {format_duration(overall['p99'])}")
+    for title, key in (("En çok gelen firmalar", 'top_firms'), ("En çok gelen sürücüler", 'top_drivers'), ("En çok gelen araçlar", 'top_vehicles')):
+        print(f"  {title}:")
+        for name, count in data[key][:args.top]:
+            print(f"    {count:>6}  {name}")
+    return 0
+
+def cmd_integrity(args, settings):
+    reader = Database.open_reader(args.db)
+    try:
+        problems = [row[0] for row in reader.conn.execute("PRAGMA quick_check" if args.quick else "PRAGMA integrity_check")]
+        problems = [problem for problem in problems if problem != "ok"]
+        missing_keys = reader.conn.execute("SELECT COUNT(*) FROM vehicles WHERE plaka_key IS NULL").fetchone()[0]
+    finally:
+        reader.close()
+    if missing_keys:
+        problems.append(f"{missing_keys} kaydın sıralama anahtarı eksik (program bir kez açıldığında doldurulur)")
+    for problem in problems:
+        print(problem)
+    if problems:
+        logger.log_warning(f"Bütünlük kontrolü sorun buldu: {len(problems)} sorun")
+        return 1
+    print("ok")
+    return 0
+
+def cmd_stats(args, settings):
+    reader = Database.open_reader(args.db)
+    try:
+        query = reader.conn.execute
+        total, inside, oldest, newest = query("SELECT COUNT(*), COALESCE(SUM(status = 'inside'), 0), MIN(entryDate), MAX(entryDate) FROM vehicles").fetchone()
+        page_size = query("PRAGMA page_size").fetchone()[0]
+        page_count = query("PRAGMA page_count").fetchone()[0]
+        freelist = query("PRAGMA freelist_count").fetchone()[0]
+    finally:
+        reader.close()
+    stats = {
+        'db_path': args.db, 'file_size_bytes': os.path.getsize(args.db), 'page_size': page_size, 'page_count': page_count,
+        'freelist_pages': freelist, 'records': total, 'inside': inside, 'checked_out': total - inside,
+        'oldest_entry': oldest, 'newest_entry': newest,
+    }
+    if args.json:
+        _print_json(stats)
+    else:
+        for key, value in stats.items():
+            print(f"{key:<16}: {value}")
+    return 0
+
+def cmd_serve(args, settings):
+    from Modules.sync_server import run_server
+    run_server(args.db, args.host, args.port, args.readers, args.token or settings.get("sync_token"))
+    return 0
+
+def cmd_ingest(args, settings):
+    from Modules.ingest_server import run_ingest_server, DEFAULT_INGEST_PORT, MAX_WRITE_BATCH
+    run_ingest_server(args.db, args.host, args.port or DEFAULT_INGEST_PORT, args.token or settings.get("ingest_token"),
+                      args.max_batch or MAX_WRITE_BATCH)
+    return 0
+
+def cmd_sync(args, settings):
+    from Modules.replication import synchronize
+    from Modules.sync_client import RemoteDatabase, is_remote_location
+    db = Database(args.db)
+    try:
+        if args.new_replica_id:
+            print(f"Yeni replika kimliği: {db.reset_replica_id()}")
+            return 0
+        if not args.peer:
+            print("Eşitlenecek veritabanı dosyası veya sunucu adresi gerekli", file=sys.stderr)
+            return 2
+        peer = RemoteDatabase(args.peer, args.token or settings.get("sync_token")) if is_remote_location(args.peer) else Database(args.peer)
+        try:
+            result = synchronize(db, peer, args.batch_size)
+        finally:
+            peer.close()
+    finally:
+        db.close()
+    print(f"{result['pulled']} işlem alındı, {result['pushed']} işlem gönderildi")
+    return 0
+
+def build_parser():
+    # --db hem komuttan önce hem sonra yazılabilsin
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--db", default=argparse.SUPPRESS, help="Veritabanı dosyası (varsayılan: programın veritabanı)")
+    common.add_argument("--query-stats", action="store_true", default=argparse.SUPPRESS,
+                        help="Komut bitince veritabanı çağrılarının süre istatistiklerini yaz (stderr)")
+    common.add_argument("--slow-query-ms", type=float, default=argparse.SUPPRESS,
+                        help="Bu süreyi aşan sorguları planıyla günlüğe yaz (varsayılan: ayarlardaki slow_query_ms)")
+    parser = argparse.ArgumentParser(prog="python -m Modules.cli", description="Araç Takip - arayüzsüz bakım ve raporlama komutları",
+                                     parents=[common])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backup = commands.add_parser("backup", parents=[common], help="Veritabanını yedekle (ayarlardaki klasör, sıkıştırma ve saklama süresi)")
+    backup.add_argument("--kind", choices=["manual", "daily", "monthly"], default="manual")
+    backup.set_defaults(func=cmd_backup)
+
+    restore = commands.add_parser("restore", parents=[common], help="Yedekten (.zip/.db) geri yükle")
+    restore.add_argument("file")
+    restore.add_argument("--yes", action="store_true", help="Üzerine yazmayı onayla")
+    restore.set_defaults(func=cmd_restore)
+
+    archive = commands.add_parser("archive", parents=[common], help="Eski kayıtları arşiv veritabanına taşı")
+    group = archive.add_mutually_exclusive_group(required=True)
+    group.add_argument("--before", type=_parse_date, help="Bu tarihten önceki kayıtlar")
+    group.add_argument("--older-than-days", type=int, help="Bu kadar günden eski kayıtlar")
+    archive.set_defaults(func=cmd_archive)
+
+    export = commands.add_parser("export", parents=[common], help="Kayıtları veya özel raporu dosyaya aktar")
+    export.add_argument("kind", choices=["records", "report"], help="records: ana liste, report: özel rapor")
+    export.add_argument("--format", choices=list(EXPORT_FORMATS), default="excel")
+    export.add_argument("-o", "--output", required=True)
+    export.add_argument("--year", type=int, help="records: yıl")
+    export.add_argument("--month", type=int, help="records: ay (1-12)")
+    export.add_argument("--status", choices=list(STATUS_FILTERS), help="records: durum filtresi")
+    export.add_argument("--search", help="records: arama terimi")
+    export.add_argument("--start", type=_parse_date, help="report: başlangıç tarihi")
+    export.add_argument("--end", type=_parse_date, help="report: bitiş tarihi")
+    export.add_argument("--columns", help="report: virgülle ayrılmış sütunlar (ör. entryDate,plaka,calculated_wait_time)")
+    export.add_argument("--filter", type=_parse_filter, action="append", help="report: plaka=..., surucu=... veya gelinenFirma=...")
+    export.add_argument("--match", choices=["contains", "prefix", "exact"], default="contains")
+    export.add_argument("--sort", help="report: sıralama sütunu")
+    export.add_argument("--ascending", action="store_true", help="Artan sırala")
+    export.add_argument("-q", "--quiet", action="store_true", help="İlerleme gösterme")
+    export.set_defaults(func=cmd_export)
+
+    report = commands.add_parser("report", parents=[common], help="Tarih aralığı için özet rapor")
+    report.add_argument("--start", type=_parse_date)
+    report.add_argument("--end", type=_parse_date)
+    report.add_argument("--top", type=int, default=5)
+    report.add_argument("--json", action="store_true")
+    report.set_defaults(func=cmd_report)
+
+    integrity = commands.add_parser("integrity", parents=[common], help="Veritabanı bütünlük kontrolü (sorun varsa çıkış kodu 1)")
+    integrity.add_argument("--quick", action="store_true", help="PRAGMA quick_check kullan")
+    integrity.set_defaults(func=cmd_integrity)
+
+    stats = commands.add_parser("stats", parents=[common], help="Veritabanı istatistikleri")
+    stats.add_argument("--json", action="store_true")
+    stats.set_defaults(func=cmd_stats)
+
+    from Modules.sync_client import DEFAULT_PORT
+    serve = commands.add_parser("serve", parents=[common], help="Kapı bilgisayarları için veritabanı sunucusunu başlat (Ctrl+C ile durur)")
+    serve.add_argument("--host", default="127.0.0.1", help="Dinlenecek adres (varsayılan: yalnızca bu bilgisayar; "
+                       "kapılar için 0.0.0.0 ve erişim anahtarı gerekir)")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--readers", type=int, default=4, help="Salt okunur bağlantı sayısı")
+    serve.add_argument("--token", help="İstemcilerin göndermesi gereken erişim anahtarı (varsayılan: ayarlardaki sync_token)")
+    serve.set_defaults(func=cmd_serve)
+
+    ingest = commands.add_parser("ingest", parents=[common], help="Plaka tanıma kameraları/turnikeler için olay alım servisini başlat")
+    ingest.add_argument("--host", default="127.0.0.1", help="Dinlenecek adres (varsayılan: yalnızca bu bilgisayar; "
+                        "kameralar için 0.0.0.0 ve erişim anahtarı gerekir)")
+    ingest.add_argument("--port", type=int, help="Port (varsayılan: 8766)")
+    ingest.add_argument("--token", help="Cihazların göndermesi gereken erişim anahtarı (varsayılan: ayarlardaki ingest_token)")
+    ingest.add_argument("--max-batch", type=int, help="Tek işlemde yazılan en fazla olay (varsayılan: 2000)")
+    ingest.set_defaults(func=cmd_ingest)
+
+    sync = commands.add_parser("sync", parents=[common], help="Başka bir replikayla (dosya veya sunucu adresi) iki yönlü eşitle")
+    sync.add_argument("peer", nargs="?", help="Eş veritabanı dosyası veya http://sunucu:port")
+    sync.add_argument("--token", help="Sunucu erişim anahtarı (varsayılan: ayarlardaki sync_token)")
+    sync.add_argument("--batch-size", type=int, default=1000, help="Bir istekte aktarılan en fazla işlem")
+    sync.add_argument("--new-replica-id", action="store_true", help="Kopyalanarak kurulan veritabanına yeni replika kimliği ver")
+    sync.set_defaults(func=cmd_sync)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.db = getattr(args, "db", None) or get_db_path()
+    settings = load_settings()
+    query_stats.configure({**settings, **({"slow_query_ms": args.slow_query_ms} if hasattr(args, "slow_query_ms") else {})})
+    logger.log_info(f"Komut satırı: {args.command}")
+    try:
+        return args.func(args, settings)
+    except Exception as e:
+        logger.log_error(f"Komut satırı hatası ({args.command})", e)
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if getattr(args, "query_stats", False):
+            _print_query_stats()
+
+def _print_query_stats():
+    snapshot = query_stats.snapshot()
+    print(format_query_stats(snapshot) if snapshot else "Veritabanı çağrısı yapılmadı", file=sys.stderr)
+    for entry in query_stats.slow_queries():
+        print(f"Yavaş: {entry['method']} {entry['elapsed_ms']:.0f} ms - {' '.join((entry['sql'] or '').split())[:120]}", file=sys.stderr)
+        for line in entry['plan'] or []:
+            print(f"    {line}", file=sys.stderr)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,13 @@
 # Modules/custom_windows.py
+import os
 import tkinter as tk
-from tkinter import ttk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk, filedialog
+from datetime import datetime
+from Modules.diagnostics import collect_database_info, collect_diagnostics, format_bytes, write_diagnostics_bundle
+from Modules.helpers import open_path
 from Modules.logger import logger
+from Modules.report_jobs import DONE, FAILED
 
 class CustomMessageBox(tk.Toplevel):
     def __init__(self, parent, title, message, dialog_type='info'):
@@ -131,4 +137,294 @@ class BackupNotificationWindow(tk.Toplevel):
         parent_h = parent.winfo_height()
         x = parent_x + (parent_w // 2) - (w // 2)
         y = parent_y + (parent_h // 2) - (h // 2)
-        self.geometry(f'{w}x{h}+{x}+{y}')
\ No newline at end of file
+        self.geometry(f'{w}x{h}+{x}+{y}')
+
+class ReportJobsWindow(tk.Toplevel):
+    """Rapor iş kuyruğunu listeler; modal değildir, işler sürerken program kullanılmaya devam eder"""
+    COLUMNS = ("#", "Rapor", "Biçim", "Durum", "İlerleme", "Dosya")
+
+    def __init__(self, parent, job_queue):
+        super().__init__(parent)
+        self.title("Rapor İşleri")
+        self.transient(parent)
+        self.job_queue = job_queue
+        
+        main_frame = ttk.Frame(self, padding="15")
+        main_frame.pack(expand=True, fill="both")
+        
+        self.tree = ttk.Treeview(main_frame, columns=self.COLUMNS, show="headings", height=8)
+        for col, width in zip(self.COLUMNS, (40, 200, 80, 100, 140, 260)):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, anchor="w")
+        self.tree.pack(expand=True, fill="both")
+        
+        button_frame = ttk.Frame(main_frame, padding="0 10 0 0")
+        button_frame.pack(fill="x")
+        ttk.Button(button_frame, text="Kapat", command=self.destroy).pack(side="right")
+        ttk.Button(button_frame, text="Bitenleri Temizle", command=self._clear_finished).pack(side="right", padx=5)
+        ttk.Button(button_frame, text="Dosyayı Aç", command=self._open_selected).pack(side="right", padx=5)
+        ttk.Button(button_frame, text="Seçili İşi İptal Et", command=self._cancel_selected).pack(side="right", padx=5)
+        
+        self.refresh()
+        self.center_window(parent)
+
+    def _progress_text(self, job):
+        if job.status == FAILED:
+            return str(job.error)
+        if job.total:
+            return f"{job.written} / {job.total} (%{job.written * 100 // job.total})"
+        return f"{job.written}" if job.written else "-"
+
+    def refresh(self):
+        jobs = {str(job.id): job for job in self.job_queue.jobs}
+        for item in self.tree.get_children():
+            if item not in jobs:
+                self.tree.delete(item)
+        for item, job in jobs.items():
+            values = (job.id, job.title, job.output_format, job.status, self._progress_text(job), job.file_path)
+            if self.tree.exists(item):
+                self.tree.item(item, values=values)
+            else:
+                self.tree.insert("", 0, iid=item, values=values)
+
+    def _selected_job(self):
+        selection = self.tree.selection()
+        return next((job for job in self.job_queue.jobs if str(job.id) in selection), None)
+
+    def _cancel_selected(self):
+        job = self._selected_job()
+        if job:
+            self.job_queue.cancel(job)
+            self.refresh()
+
+    def _open_selected(self):
+        job = self._selected_job()
+        if job and job.status == DONE and os.path.exists(job.file_path):
+            open_path(job.file_path)
+
+    def _clear_finished(self):
+        self.job_queue.clear_finished()
+        self.refresh()
+
+    def center_window(self, parent):
+        self.update_idletasks()
+        w, h = 860, 300
+        parent_x = parent.winfo_x()
+        parent_y = parent.winfo_y()
+        parent_w = parent.winfo_width()
+        parent_h = parent.winfo_height()
+        x = parent_x + (parent_w // 2) - (w // 2)
+        y = parent_y + (parent_h // 2) - (h // 2)
+        self.geometry(f'{w}x{h}+{x}+{y}')
+
+
+class PerformanceWindow(tk.Toplevel):
+    """Veritabanı, sorgu süreleri, önbellek ve olay döngüsü ölçümlerini gösteren pencere"""
+    REFRESH_MS = 2000
+    QUERY_COLUMNS = ("Metot", "Çağrı", "Toplam ms", "p50", "p95", "p99", "En çok", "Satır", "Yavaş")
+    INDEX_COLUMNS = ("İndeks", "Tablo", "Sütunlar", "Tür", "Boyut")
+    SLOW_COLUMNS = ("Zaman", "Metot", "Süre (ms)", "Satır")
+
+    def __init__(self, parent, app):
+        super().__init__(parent)
+        self.title("Performans")
+        self.transient(parent)
+        self.app = app
+        self.slow_queries = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tanilama")
+        self._refresh_id = None
+        
+        main_frame = ttk.Frame(self, padding="15")
+        main_frame.pack(expand=True, fill="both")
+        
+        notebook = ttk.Notebook(main_frame)
+        notebook.pack(expand=True, fill="both")
+        self._create_database_tab(notebook)
+        self._create_queries_tab(notebook)
+        self._create_runtime_tab(notebook)
+        self._create_slow_queries_tab(notebook)
+        
+        button_frame = ttk.Frame(main_frame, padding="0 10 0 0")
+        button_frame.pack(fill="x")
+        ttk.Button(button_frame, text="Kapat", command=self.destroy).pack(side="right")
+        self.export_button = ttk.Button(button_frame, text="Tanılama Paketi Dışa Aktar...", command=self._export_bundle)
+        self.export_button.pack(side="right", padx=5)
+        ttk.Button(button_frame, text="Yenile", command=self.refresh).pack(side="right", padx=5)
+        
+        self.bind("<Destroy>", self._on_destroy)
+        self.refresh()
+        self.center_window(parent)
+
+    def _create_tree(self, parent, columns, widths, height):
+        frame = ttk.Frame(parent)
+        frame.pack(expand=True, fill="both")
+        tree = ttk.Treeview(frame, columns=columns, show="headings", height=height)
+        for col, width in zip(columns, widths):
+            tree.heading(col, text=col)
+            tree.column(col, width=width, anchor="w" if width > 100 else "e")
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side="left", expand=True, fill="both")
+        scrollbar.pack(side="right", fill="y")
+        return tree
+
+    def _create_database_tab(self, notebook):
+        tab = ttk.Frame(notebook, padding="10")
+        notebook.add(tab, text="Veritabanı")
+        self.database_label = ttk.Label(tab, text="Veritabanı bilgisi okunuyor...", justify="left")
+        self.database_label.pack(anchor="w", pady=(0, 10))
+        self.index_tree = self._create_tree(tab, self.INDEX_COLUMNS, (220, 90, 260, 90, 90), 8)
+
+    def _create_queries_tab(self, notebook):
+        tab = ttk.Frame(notebook, padding="10")
+        notebook.add(tab, text="Sorgular")
+        self.queries_label = ttk.Label(tab, text="")
+        self.queries_label.pack(anchor="w", pady=(0, 10))
+        self.query_tree = self._create_tree(tab, self.QUERY_COLUMNS, (220, 60, 80, 70, 70, 70, 70, 80, 60), 12)
+
+    def _create_runtime_tab(self, notebook):
+        tab = ttk.Frame(notebook, padding="10")
+        notebook.add(tab, text="Önbellek ve Arayüz")
+        self.runtime_label = ttk.Label(tab, text="", justify="left")
+        self.runtime_label.pack(anchor="nw")
+
+    def _create_slow_queries_tab(self, notebook):
+        tab = ttk.Frame(notebook, padding="10")
+        notebook.add(tab, text="Yavaş Sorgular")
+        self.slow_tree = self._create_tree(tab, self.SLOW_COLUMNS, (150, 220, 80, 80), 6)
+        self.slow_tree.bind("<<TreeviewSelect>>", self._show_slow_query)
+        self.plan_text = tk.Text(tab, height=10, wrap="word", font=("Consolas", 9))
+        self.plan_text.pack(expand=True, fill="both", pady=(10, 0))
+        self.plan_text.configure(state="disabled")
+
+    def refresh(self):
+        """Veritabanı bilgisini arka planda yeniden okur, diğer verileri hemen günceller"""
+        db_path = self.app.db.db.db_path
+        self._poll(self._executor.submit(collect_database_info, db_path), self._show_database_info)
+        self._refresh_runtime()
+
+    def _poll(self, future, callback):
+        if not self.winfo_exists():
+            return
+        if not future.done():
+            self.after(50, lambda: self._poll(future, callback))
+            return
+        try:
+            callback(future.result())
+        except Exception as e:
+            logger.log_error("Performans penceresi verisi alınamadı", e)
+            self.database_label.config(text=f"Veri alınamadı: {e}")
+
+    def _refresh_runtime(self):
+        if self._refresh_id is not None:
+            self.after_cancel(self._refresh_id)
+        diagnostics = collect_diagnostics(self.app, include_database=False)
+        self._show_queries(diagnostics)
+        self._show_runtime(diagnostics)
+        self._show_slow_queries(diagnostics['slow_queries'])
+        self._refresh_id = self.after(self.REFRESH_MS, self._refresh_runtime)
+
+    def _show_database_info(self, info):
+        self.database_label.config(text=(
+            f"Dosya: {info['path']}\n"
+            f"Boyut: {format_bytes(info['file_bytes'])}   Kayıt: {info['records']}   SQLite {info['sqlite_version']}\n"
+            f"Sayfa: {info['page_count']} x {info['page_size']} bayt   Boş sayfa: {info['freelist_count']} "
+            f"({format_bytes(info['freelist_bytes'])})   Günlük modu: {info['journal_mode']}   Şema sürümü: {info['user_version']}"))
+        self.index_tree.delete(*self.index_tree.get_children())
+        for index in info['indexes']:
+            kind = "otomatik" if index['automatic'] else "kısmi" if index['partial'] else "benzersiz" if index['unique'] else "normal"
+            self.index_tree.insert("", "end", values=(index['name'], index['table'], ", ".join(index['columns']),
+                                                     kind, format_bytes(index['bytes'])))
+
+    def _show_queries(self, diagnostics):
+        def ms(value):
+            return f"{value:.2f}" if value is not None else "-"
+        self.queries_label.config(text=f"{diagnostics['query_stats_since']} itibarıyla, yavaş sorgu eşiği {diagnostics['slow_query_ms']} ms")
+        self.query_tree.delete(*self.query_tree.get_children())
+        for name, stats in diagnostics['queries'].items():
+            self.query_tree.insert("", "end", values=(name, stats['count'], f"{stats['total_ms']:.1f}", ms(stats['p50_ms']), ms(stats['p95_ms']),
+                                                     ms(stats['p99_ms']), ms(stats['max_ms']), stats['rows'], stats['slow']))
+
+    def _show_runtime(self, diagnostics):
+        cache = diagnostics['report_cache']
+        lines = [f"Rapor önbelleği: {cache['entries']} kayıt, isabet oranı %{cache['hit_rate'] * 100:.0f}",
+                 f"    güncel: {cache['hits']}   eski (arka planda yenilenen): {cache['stale_hits']}   ıska: {cache['misses']}", ""]
+        loop = diagnostics['event_loop']
+        if loop and loop['samples']:
+            lines += [f"Olay döngüsü gecikmesi ({loop['samples']} ölçüm, {loop['interval_ms']} ms aralıkla):",
+                      f"    p50 {loop['p50_ms']:.1f} ms   p95 {loop['p95_ms']:.1f} ms   p99 {loop['p99_ms']:.1f} ms   "
+                      f"en çok {loop['max_ms']:.0f} ms   son dakika en çok {loop['recent_max_ms']:.0f} ms"]
+        else:
+            lines.append("Olay döngüsü gecikmesi: henüz ölçüm yok")
+        if diagnostics['stalls']:
+            lines += ["", "Son arayüz donmaları:"]
+            lines += [f"    {stall['time']}  {stall['duration_ms']:.0f} ms  {stall['handler']}"
+                      f"{'  (' + stall['location'] + ')' if stall['location'] and stall['location'] != stall['handler'] else ''}"
+                      for stall in diagnostics['stalls'][-8:]]
+        if diagnostics['startup_ms']:
+            lines += ["", "Açılış aşamaları:"]
+            lines += [f"    {name}: {value:.0f} ms" for name, value in diagnostics['startup_ms'].items()]
+        self.runtime_label.config(text="\n".join(lines))
+
+    def _show_slow_queries(self, slow_queries):
+        if slow_queries[-1:] == self.slow_queries[-1:] and len(slow_queries) == len(self.slow_queries):
+            return  # Yeni yavaş sorgu yok; seçim korunur
+        self.slow_queries = slow_queries
+        self.slow_tree.delete(*self.slow_tree.get_children())
+        for i, entry in enumerate(slow_queries):
+            rows = entry['rows'] if entry['rows'] is not None else "-"
+            self.slow_tree.insert("", 0, iid=str(i), values=(entry['time'], entry['method'], f"{entry['elapsed_ms']:.0f}", rows))
+
+    def _show_slow_query(self, event=None):
+        selection = self.slow_tree.selection()
+        if not selection:
+            return
+        entry = self.slow_queries[int(selection[0])]
+        text = f"{entry['method']}: {entry['elapsed_ms']:.0f} ms\n\n"
+        if entry['sql']:
+            text += f"SQL ({entry['statement_ms']:.0f} ms):\n{entry['sql'].strip()}\n\nParametreler: {entry['params']}\n\n"
+        text += "Sorgu planı:\n" + "\n".join(entry['plan'] or ["(plan yok)"])
+        self.plan_text.configure(state="normal")
+        self.plan_text.delete("1.0", "end")
+        self.plan_text.insert("1.0", text)
+        self.plan_text.configure(state="disabled")
+
+    def _export_bundle(self):
+        file_path = filedialog.asksaveasfilename(
+            parent=self, title="Tanılama Paketini Kaydet", defaultextension=".zip",
+            initialfile=f"tanilama_{datetime.now():%Y-%m-%d_%H-%M-%S}.zip", filetypes=[("Zip Dosyası", "*.zip")])
+        if not file_path:
+            return
+        self.export_button.config(state="disabled")
+        future = self._executor.submit(lambda: write_diagnostics_bundle(file_path, collect_diagnostics(self.app)))
+        self._poll_export(future)
+
+    def _poll_export(self, future):
+        if not self.winfo_exists():
+            return
+        if not future.done():
+            self.after(100, lambda: self._poll_export(future))
+            return
+        self.export_button.config(state="normal")
+        try:
+            CustomMessageBox(self, "Başarılı", f"Tanılama paketi kaydedildi:\n{future.result()}", 'info')
+        except Exception as e:
+            logger.log_error("Tanılama paketi oluşturulamadı", e)
+            CustomMessageBox(self, "Hata", f"Tanılama paketi oluşturulamadı: {e}", 'info')
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            if self._refresh_id is not None:
+                self.after_cancel(self._refresh_id)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def center_window(self, parent):
+        self.update_idletasks()
+        w, h = 900, 520
+        parent_x = parent.winfo_x()
+        parent_y = parent.winfo_y()
+        parent_w = parent.winfo_width()
+        parent_h = parent.winfo_height()
+        x = parent_x + (parent_w // 2) - (w // 2)
+        y = parent_y + (parent_h // 2) - (h // 2)
+        self.geometry(f'{w}x{h}+{x}+{y}')
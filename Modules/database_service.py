@@ -1,6 +1,9 @@
 # Modules/database_service.py
+import time
 from datetime import datetime
 from Modules.logger import logger
+from Modules.dwell_analytics import compute_dwell_report
+from Modules.autocomplete import build_form_indexes
 
 class DatabaseService:
     """
@@ -34,24 +37,42 @@ class DatabaseService:
             logger.log_error("Kayıt ekleme hatası", e)
             return False
     
-    def get_filtered_records(self, year_var, month_var, status_filter=None, date_filter=None, search_term=None):
-        """Filtrelenmiş kayıtları getir - UI için optimize"""
+    def selected_year_month(self, year_var, month_var):
+        """Yıl/ay seçim kutularındaki değeri (yıl, ay) olarak döndürür; boşsa bu ay"""
+        year = int(year_var.get()) if year_var.get() else datetime.now().year
+        month = self.months[month_var.get()] if month_var.get() else datetime.now().month
+        return year, month
+    
+    def get_filtered_records(self, year_var, month_var, status_filter=None, date_filter=None, search_term=None,
+                             order_by=None, descending=True, limit=None, offset=0):
+        """Filtrelenmiş kayıtları getir - sıralama ve sayfalama SQL tarafında yapılır"""
         try:
             if search_term:
-                return self.db.search_records(search_term)
+                return self.db.search_records(search_term, order_by=order_by, descending=descending,
+                                              limit=limit if limit is not None else 1000, offset=offset)
             else:
-                year = int(year_var.get()) if year_var.get() else datetime.now().year
-                month = list(self.months.values())[list(self.months.keys()).index(month_var.get())] if month_var.get() else datetime.now().month
-                return self.db.fetch_records(year=year, month=month, status_filter=status_filter, date_filter=date_filter)
+                year, month = self.selected_year_month(year_var, month_var)
+                return self.db.fetch_records(year=year, month=month, status_filter=status_filter, date_filter=date_filter,
+                                             order_by=order_by, descending=descending, limit=limit, offset=offset)
         except Exception as e:
             logger.log_error("Kayıt getirme hatası", e)
             return []
     
+    def count_filtered_records(self, year_var, month_var, status_filter=None, date_filter=None, search_term=None):
+        """Filtreye uyan kayıt sayısını getir (sayfalama için)"""
+        try:
+            if search_term:
+                return self.db.count_search_records(search_term)
+            year, month = self.selected_year_month(year_var, month_var)
+            return self.db.count_records(year=year, month=month, status_filter=status_filter)
+        except Exception as e:
+            logger.log_error("Kayıt sayma hatası", e)
+            return 0
+    
     def get_status_counts(self, year_var, month_var):
         """Durum sayılarını getir - UI için optimize"""
         try:
-            year = int(year_var.get()) if year_var.get() else datetime.now().year
-            month = list(self.months.values())[list(self.months.keys()).index(month_var.get())] if month_var.get() else datetime.now().month
+            year, month = self.selected_year_month(year_var, month_var)
             
             inside, checked_out = self.db.get_status_counts(year, month)
             return {'inside': inside, 'checked_out': checked_out}
@@ -59,6 +80,32 @@ class DatabaseService:
             logger.log_error("Durum sayacı hatası", e)
             return {'inside': 0, 'checked_out': 0}
     
+    def compute_initial_view(self, year, month, order_by, descending, virtualization_threshold, enable_virtualization, page_size):
+        """Açılıştaki ay görünümünü ayrı bir okuma bağlantısında hazırlar (arka plan iş parçacığı için)"""
+        reader = self.db.open_reader(self.db.db_path)
+        try:
+            total_records = reader.get_record_count()
+            virtualize = enable_virtualization and total_records > virtualization_threshold
+            if virtualize:
+                count = reader.count_records(year=year, month=month)
+                records = reader.fetch_records(year=year, month=month, order_by=order_by, descending=descending, limit=page_size)
+            else:
+                records = reader.fetch_records(year=year, month=month, order_by=order_by, descending=descending)
+                count = len(records)
+            inside, checked_out = reader.get_status_counts(year, month)
+            return {'virtualize': virtualize, 'count': count, 'records': records,
+                    'counts': {'inside': inside, 'checked_out': checked_out}}
+        finally:
+            reader.close()
+    
+    def compute_autocomplete_indexes(self, limit):
+        """Form alanlarının otomatik tamamlama dizinlerini ayrı bir okuma bağlantısında kurar (arka plan iş parçacığı için)"""
+        reader = self.db.open_reader(self.db.db_path)
+        try:
+            return build_form_indexes(reader, limit)
+        finally:
+            reader.close()
+    
     def get_record_status(self, record_id):
         """Kayıt durumunu getir"""
         record = self.db.get_record_by_id(record_id)
@@ -68,6 +115,14 @@ class DatabaseService:
         """Araca çıkış ver"""
         self.db.checkout_vehicle(record_id)
     
+    def find_open_visit(self, plate):
+        """Plaka içerideyse açık kaydını getir (yoksa None)"""
+        return self.db.find_open_visit(plate)
+    
+    def checkout_by_plate(self, plate):
+        """Plakanın açık ziyaretine çıkış ver; kapatılan kaydın id'si veya None"""
+        return self.db.checkout_by_plate(plate)
+    
     def reactivate_vehicle(self, record_id):
         """Kaydı tekrar aktif yap"""
         self.db.reactivate_vehicle(record_id)
@@ -90,19 +145,46 @@ class DatabaseService:
         self.db.remove_from_blacklist(item_value, item_type)
     
     # --- Raporlama metodları ---
-    def get_report_data(self, start_date, end_date):
+    def get_data_version(self):
+        """Rapor önbelleği için veri sürümünü getir"""
+        try:
+            return self.db.get_data_version()
+        except Exception as e:
+            logger.log_error("Veri sürümü alınamadı", e)
+            return None
+    
+    def _collect_report_data(self, db, start_date, end_date, long_stay_hours):
+        report_data = db.get_report_aggregates(start_date, end_date)
+        report_data['dwell'] = compute_dwell_report(db.iter_dwell_times(start_date, end_date))
+        # Uzun bekleyenler tarihe değil ana bağlı olduğundan hesaplama zamanı da saklanır
+        report_data['long_stays'] = db.get_long_stays(long_stay_hours)
+        report_data['computed_at'] = time.monotonic()
+        return report_data
+    
+    def get_report_data(self, start_date, end_date, long_stay_hours=8):
         """Rapor verilerini getir"""
         try:
-            return {
-                'entry_data': self.db.get_entry_data_for_range(start_date, end_date),
-                'top_firms': self.db.get_top_firms(start_date, end_date),
-                'top_drivers': self.db.get_top_drivers(start_date, end_date),
-                'top_vehicles': self.db.get_top_vehicles(start_date, end_date)
-            }
+            return self._collect_report_data(self.db, start_date, end_date, long_stay_hours)
         except Exception as e:
             logger.log_error("Rapor verisi getirme hatası", e)
             return {}
     
+    def compute_report_data(self, start_date, end_date, long_stay_hours=8):
+        """Rapor verilerini ayrı bir okuma bağlantısında hesaplar; hata Future üzerinden yakalanır"""
+        reader = self.db.open_reader(self.db.db_path)
+        try:
+            return self._collect_report_data(reader, start_date, end_date, long_stay_hours)
+        finally:
+            reader.close()
+    
+    def get_dwell_report(self, start_date, end_date):
+        """Bekleme süresi analizini (ortalama, p50/p90/p99, histogram) getir"""
+        try:
+            return compute_dwell_report(self.db.iter_dwell_times(start_date, end_date))
+        except Exception as e:
+            logger.log_error("Bekleme süresi analizi hatası", e)
+            return {}
+    
     # --- Yedekleme ve arşiv metodları ---
     def backup_database(self, backup_path):
         return self.db.backup_database(backup_path)
@@ -119,8 +201,8 @@ class DatabaseService:
     def get_record_count_before_date(self, date_str):
         return self.db.get_record_count_before_date(date_str)
     
-    def fetch_custom_report_data(self, start_date, end_date, filters=None):
-        return self.db.fetch_custom_report_data(start_date, end_date, filters)
+    def fetch_custom_report_data(self, start_date, end_date, filters=None, **options):
+        return self.db.fetch_custom_report_data(start_date, end_date, filters, **options)
     
     def get_record_by_id(self, record_id):
         return self.db.get_record_by_id(record_id)
\ No newline at end of file
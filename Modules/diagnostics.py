@@ -0,0 +1,320 @@
+# Modules/diagnostics.py
+import json
+import os
+import platform
+import re
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+from Modules.dwell_analytics import QuantileSketch
+from Modules.query_stats import query_stats, format_query_stats
+from Modules.logger import logger
+
+# Olay döngüsü gecikmesi ölçüm aralığı ve saklanan son ölçüm sayısı
+LOOP_LAG_INTERVAL_MS = 250
+LOOP_LAG_HISTORY = 240
+# Pakete eklenen günlük dosyası sayısı (her klasörden en yeniler)
+BUNDLE_LOG_FILES = 3
+# Donma izleyicisi: varsayılan eşik, ana iş parçacığı yığınının örneklenme aralığı, saklanan
+# donma sayısı ve olay döngüsü hiç dönmezse donmanın bitmesi beklenmeden yazılacağı süre
+STALL_THRESHOLD_MS = 250
+STALL_SAMPLE_MS = 50
+STALL_HISTORY = 50
+STALL_REPORT_UNFINISHED_MS = 10_000
+# Pakete yazılmadan gizlenen ayarlar (sync_token, ingest_token, parola vb.) ve adreslerdeki kullanıcı:parola kısmı
+SECRET_SETTING_PATTERN = re.compile(r"token|passw|secret|credential|api_?key|private", re.IGNORECASE)
+_URL_USERINFO = re.compile(r"(://)[^/@\s]+@")
+REDACTED = "<gizlendi>"
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_TKINTER_DIR = os.path.join(os.path.dirname(threading.__file__), "tkinter")
+
+class EventLoopLagMonitor:
+    """Tk olay döngüsünün gecikmesini after() geri çağrılarının gecikmesinden ölçer"""
+
+    def __init__(self, root, interval_ms=LOOP_LAG_INTERVAL_MS, watchdog=None):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.watchdog = watchdog
+        self.sketch = QuantileSketch()
+        self.recent = deque(maxlen=LOOP_LAG_HISTORY)
+        self._expected = None
+        self._after_id = None
+
+    def start(self):
+        if self._after_id is None:
+            if self.watchdog:
+                self.watchdog.start()
+            self._schedule()
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self.watchdog:
+            self.watchdog.stop()
+
+    def _schedule(self, lag_ms=None):
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+        if self.watchdog:
+            self.watchdog.heartbeat(self._expected, lag_ms)
+
+    def _tick(self):
+        lag_ms = max(0.0, (time.perf_counter() - self._expected) * 1000)
+        self.sketch.add(lag_ms)
+        self.recent.append(lag_ms)
+        self._schedule(lag_ms)
+
+    def summary(self):
+        sketch = self.sketch
+        return {
+            'samples': sketch.count, 'interval_ms': self.interval_ms, 'mean_ms': sketch.mean,
+            'p50_ms': sketch.quantile(0.50), 'p95_ms': sketch.quantile(0.95), 'p99_ms': sketch.quantile(0.99),
+            'max_ms': sketch.max if sketch.count else None,
+            'recent_max_ms': max(self.recent) if self.recent else None,
+        }
+
+class StallWatchdog:
+    """Arayüz donmalarını ana iş parçacığının yığın örnekleriyle birlikte günlüğe yazar"""
+
+    def __init__(self, threshold_ms=STALL_THRESHOLD_MS, sample_ms=STALL_SAMPLE_MS):
+        self.threshold_ms = threshold_ms
+        self.sample_ms = sample_ms
+        self.stalls = deque(maxlen=STALL_HISTORY)
+        self._ui_thread_id = threading.get_ident()
+        self._expected = None
+        self._samples = []
+        self._unfinished_reported = False
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.threshold_ms > 0 and self._thread is None:
+            self._stopped = threading.Event()
+            self._thread = threading.Thread(target=self._run, name="donma_izleyici", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread = None
+
+    def heartbeat(self, expected, lag_ms):
+        """Olay döngüsü turu (Tk iş parçacığında): biten donmayı kaydeder, yeni turun zamanını bildirir"""
+        with self._lock:
+            samples, self._samples = self._samples, []
+            unfinished_reported, self._unfinished_reported = self._unfinished_reported, False
+            self._expected = expected
+        if lag_ms is not None and self.threshold_ms > 0 and lag_ms >= self.threshold_ms:
+            self._record(lag_ms, samples, finished=True, already_reported=unfinished_reported)
+
+    def _run(self):
+        stopped = self._stopped
+        while not stopped.wait(self.sample_ms / 1000):
+            with self._lock:
+                expected = self._expected
+            if expected is None:
+                continue
+            overdue_ms = (time.perf_counter() - expected) * 1000
+            if overdue_ms < self.sample_ms:
+                continue
+            frame = sys._current_frames().get(self._ui_thread_id)
+            if frame is None:
+                continue
+            stack = tuple((f.filename, f.lineno, f.name, f.line) for f in traceback.extract_stack(frame))
+            del frame
+            with self._lock:
+                if self._expected != expected:
+                    continue  # örnek alınırken tur geldi
+                self._samples.append(stack)
+                report_unfinished = overdue_ms >= STALL_REPORT_UNFINISHED_MS and not self._unfinished_reported
+                if report_unfinished:
+                    self._unfinished_reported = True
+                    samples = list(self._samples)
+            if report_unfinished:
+                self._record(overdue_ms, samples, finished=False)
+
+    def _record(self, duration_ms, samples, finished, already_reported=False):
+        handlers = Counter(_stall_handler(stack) for stack in samples)
+        stack = Counter(samples).most_common(1)[0][0] if samples else ()
+        app_frames = _app_frames(stack)
+        stall = {
+            'time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 'duration_ms': duration_ms, 'finished': finished,
+            'handler': handlers.most_common(1)[0][0] if handlers else "bilinmiyor",
+            'location': _frame_name(app_frames[-1]) if app_frames else None,
+            'samples': len(samples), 'stack': traceback.format_list(traceback.StackSummary.from_list(stack)) if stack else [],
+        }
+        with self._lock:
+            unfinished = next((s for s in reversed(self.stalls) if not s['finished']), None) if already_reported else None
+            if unfinished:
+                unfinished.update(duration_ms=duration_ms, finished=True)
+            else:
+                self.stalls.append(stall)
+        state = "sürüyor" if not finished else "bitti, önceden bildirildi" if already_reported else None
+        message = f"Arayüz donması: {duration_ms:.0f} ms{f' ({state})' if state else ''}, işleyici: {stall['handler']}"
+        if stall['location'] and stall['location'] != stall['handler']:
+            message += f", konum: {stall['location']}"
+        if stall['stack'] and not already_reported:
+            message += f"\n  Yığın ({len(samples)} örnek):\n" + "".join(stall['stack']).rstrip()
+        logger.log_warning(message)
+
+    def recent_stalls(self):
+        """Son donmalar (en yenisi sonda)"""
+        with self._lock:
+            return list(self.stalls)
+
+def _app_frames(stack):
+    return [frame for frame in stack if frame[0].startswith(ROOT)]
+
+def _frame_name(frame):
+    module = os.path.splitext(os.path.relpath(frame[0], ROOT))[0].replace(os.sep, ".")
+    return f"{module}.{frame[2]}"
+
+def _stall_handler(stack):
+    """Yığında Tk'nin en son çağırdığı olay işleyicisi (lambda sarmalayıcıları atlanır)"""
+    dispatch = max((i for i, frame in enumerate(stack) if frame[2] == "__call__" and frame[0].startswith(_TKINTER_DIR)), default=-1)
+    frames = _app_frames(stack[dispatch + 1:])
+    named = [frame for frame in frames if frame[2] not in ("<lambda>", "<module>")]
+    if named:
+        return _frame_name(named[0])
+    return _frame_name(frames[-1]) if frames else "bilinmiyor"
+
+def collect_database_info(db_path):
+    """Veritabanı dosyasının boyut, sayfa ve indeks bilgilerini salt okunur bir bağlantıyla toplar"""
+    from database import Database
+    info = {'path': db_path, 'file_bytes': os.path.getsize(db_path) if os.path.exists(db_path) else None,
+            'sqlite_version': sqlite3.sqlite_version}
+    reader = Database.open_reader(db_path)
+    try:
+        query = reader.conn.execute
+        for pragma in ("page_size", "page_count", "freelist_count", "journal_mode", "user_version", "auto_vacuum"):
+            info[pragma] = query(f"PRAGMA {pragma}").fetchone()[0]
+        info['freelist_bytes'] = info['freelist_count'] * info['page_size']
+        info['records'] = query("SELECT COUNT(*) FROM vehicles").fetchone()[0]
+        info['indexes'] = _index_list(reader.conn)
+        info['schema'] = [row[0] for row in query("SELECT sql FROM sqlite_master WHERE sql IS NOT NULL ORDER BY type DESC, name")]
+    finally:
+        reader.close()
+    return info
+
+def _index_list(conn):
+    """Tablo indeksleri: ad, tablo, sütunlar, benzersiz/kısmi olup olmadığı ve (varsa dbstat ile) boyutu"""
+    sizes = {}
+    try:
+        sizes = dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall())
+    except sqlite3.Error:
+        pass  # dbstat sanal tablosu her SQLite derlemesinde yok
+    indexes = []
+    for name, table, sql in conn.execute("SELECT name, tbl_name, sql FROM sqlite_master WHERE type = 'index' ORDER BY tbl_name, name"):
+        columns = [row[2] or "<ifade>" for row in conn.execute(f"PRAGMA index_info('{name}')")]
+        indexes.append({'name': name, 'table': table, 'columns': columns, 'automatic': sql is None,
+                        'unique': bool(sql and "UNIQUE" in sql.upper()), 'partial': bool(sql and " WHERE " in sql.upper()),
+                        'bytes': sizes.get(name)})
+    return indexes
+
+def redact_settings(settings):
+    """Ayarların paylaşılabilir kopyası: gizli değerler REDACTED olur (boş olanlar ayarlanmadığı görülsün diye kalır)"""
+    redacted = {}
+    for key, value in settings.items():
+        if SECRET_SETTING_PATTERN.search(str(key)):
+            redacted[key] = REDACTED if value else value
+        elif isinstance(value, str):
+            redacted[key] = _URL_USERINFO.sub(rf"\1{REDACTED}@", value)
+        else:
+            redacted[key] = value
+    return redacted
+
+def collect_diagnostics(app, include_database=True):
+    """Performans penceresi ve tanılama paketi için tüm ölçümleri toplar"""
+    diagnostics = {
+        'created_at': datetime.now().isoformat(timespec="seconds"),
+        'python': sys.version.split()[0], 'platform': platform.platform(),
+        'queries': query_stats.snapshot(), 'slow_queries': query_stats.slow_queries(),
+        'query_stats_since': query_stats.started_at.isoformat(timespec="seconds"),
+        'slow_query_ms': query_stats.slow_query_ms,
+        'report_cache': app.report_cache.get_stats(),
+        'event_loop': app.loop_monitor.summary() if getattr(app, 'loop_monitor', None) else None,
+        'stalls': app.stall_watchdog.recent_stalls() if getattr(app, 'stall_watchdog', None) else [],
+        'startup_ms': dict(getattr(app, 'startup_timings', {})),
+        'report_jobs': [{'id': job.id, 'title': job.title, 'format': job.output_format, 'status': job.status}
+                        for job in app.report_jobs.jobs],
+        'settings': redact_settings(app.settings),
+    }
+    if not include_database:
+        return diagnostics
+    try:
+        diagnostics['database'] = collect_database_info(app.db.db.db_path)
+    except Exception as e:
+        logger.log_error("Veritabanı tanılama bilgisi alınamadı", e)
+        diagnostics['database'] = {'error': str(e)}
+    return diagnostics
+
+def format_diagnostics(diagnostics):
+    """Tanılama verilerinin okunabilir metin özeti (paketteki ozet.txt)"""
+    database = diagnostics.get('database', {})
+    lines = [f"Tanılama raporu - {diagnostics['created_at']}", f"Python {diagnostics['python']} / {diagnostics['platform']}", ""]
+    if 'error' in database:
+        lines.append(f"Veritabanı: okunamadı ({database['error']})")
+    else:
+        lines += [
+            f"Veritabanı: {database['path']}",
+            f"  Boyut: {format_bytes(database['file_bytes'])}, {database['records']} kayıt, SQLite {database['sqlite_version']}",
+            f"  Sayfa: {database['page_count']} x {database['page_size']} bayt, boş sayfa: {database['freelist_count']} "
+            f"({format_bytes(database['freelist_bytes'])}), günlük modu: {database['journal_mode']}, şema: {database['user_version']}",
+            "  İndeksler:",
+        ]
+        lines += [f"    {index['name']} ({index['table']}: {', '.join(index['columns'])})"
+                  f"{' [kısmi]' if index['partial'] else ''}{' ' + format_bytes(index['bytes']) if index['bytes'] else ''}"
+                  for index in database['indexes']]
+    cache = diagnostics['report_cache']
+    lines += ["", f"Rapor önbelleği: {cache['entries']} kayıt, isabet %{cache['hit_rate'] * 100:.0f} "
+                  f"(güncel {cache['hits']}, eski {cache['stale_hits']}, ıska {cache['misses']})"]
+    loop = diagnostics['event_loop']
+    if loop and loop['samples']:
+        lines.append(f"Olay döngüsü gecikmesi: p50 {loop['p50_ms']:.1f} ms, p95 {loop['p95_ms']:.1f} ms, "
+                     f"p99 {loop['p99_ms']:.1f} ms, en çok {loop['max_ms']:.0f} ms ({loop['samples']} ölçüm)")
+    for stall in diagnostics['stalls']:
+        lines.append(f"Arayüz donması: {stall['time']} {stall['duration_ms']:.0f} ms, {stall['handler']}"
+                     f"{' (' + stall['location'] + ')' if stall['location'] else ''}")
+    if diagnostics['startup_ms']:
+        lines.append("Açılış: " + ", ".join(f"{name} {value:.0f} ms" for name, value in diagnostics['startup_ms'].items()))
+    lines += ["", f"Sorgu süreleri ({diagnostics['query_stats_since']} itibarıyla):",
+              format_query_stats(diagnostics['queries']) if diagnostics['queries'] else "  (henüz sorgu yok)", ""]
+    lines.append(f"Yavaş sorgular (eşik {diagnostics['slow_query_ms']} ms):")
+    for entry in diagnostics['slow_queries']:
+        lines.append(f"  {entry['time']} {entry['method']} {entry['elapsed_ms']:.0f} ms")
+        if entry['sql']:
+            lines.append(f"    SQL: {' '.join(entry['sql'].split())}")
+        lines += [f"      {line}" for line in entry['plan'] or []]
+    return "\n".join(lines)
+
+def format_bytes(size):
+    if size is None:
+        return "-"
+    for unit in ("bayt", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "bayt" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def _recent_files(folder, count):
+    if not os.path.isdir(folder):
+        return []
+    paths = [os.path.join(folder, name) for name in os.listdir(folder)]
+    return sorted((path for path in paths if os.path.isfile(path)), key=os.path.getmtime, reverse=True)[:count]
+
+def write_diagnostics_bundle(file_path, diagnostics):
+    """Tanılama verilerini (veritabanı şeması dahil, kayıtlar hariç) ve son günlük dosyalarını zip olarak yazar"""
+    import zipfile
+    with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as bundle:
+        bundle.writestr("tanilama.json", json.dumps(diagnostics, ensure_ascii=False, indent=2, default=str))
+        bundle.writestr("ozet.txt", format_diagnostics(diagnostics))
+        for folder in (logger.get_gunluk_dir(), logger.get_log_dir()):
+            for path in _recent_files(folder, BUNDLE_LOG_FILES):
+                bundle.write(path, f"gunluk/{os.path.basename(folder)}/{os.path.basename(path)}")
+    logger.log_info(f"Tanılama paketi oluşturuldu: {file_path}")
+    return file_path
@@ -0,0 +1,105 @@
+# Modules/dwell_analytics.py
+import math
+from bisect import bisect_right
+from collections import defaultdict
+
+# Histogram aralıkları: (üst sınır saniye, etiket)
+DWELL_BINS = (
+    (15 * 60, "0-15 dk"), (30 * 60, "15-30 dk"), (60 * 60, "30-60 dk"), (2 * 3600, "1-2 sa"),
+    (4 * 3600, "2-4 sa"), (8 * 3600, "4-8 sa"), (24 * 3600, "8-24 sa"), (math.inf, "24+ sa"),
+)
+_BIN_UPPER_BOUNDS = [upper for upper, _ in DWELL_BINS]
+
+class QuantileSketch:
+    """Akış halinde, sabit bellekli yüzdelik taslağı (DDSketch benzeri)"""
+
+    def __init__(self, relative_accuracy=0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = defaultdict(int)
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def bucket_index(self, value):
+        """Değerin kova numarası (0 ve altı için None)"""
+        return math.ceil(math.log(value) / self._log_gamma) if value > 0 else None
+
+    def add(self, value, index=None):
+        """Değeri ekler; kova numarası önceden hesaplandıysa tekrar logaritma alınmaz"""
+        if value <= 0:
+            self.zero_count += 1
+            value = 0
+        else:
+            self.buckets[self.bucket_index(value) if index is None else index] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min: self.min = value
+        if value > self.max: self.max = value
+
+    def merge(self, other):
+        for index, count in other.buckets.items():
+            self.buckets[index] += count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q):
+        """q (0-1) yüzdeliğinin tahmini değeri"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                estimate = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+class DwellStats:
+    """Bir grup (firma, sürücü, gün) için bekleme süresi özeti"""
+
+    def __init__(self):
+        self.sketch = QuantileSketch()
+        self.histogram = [0] * len(DWELL_BINS)
+
+    def add(self, seconds, bucket=None, bin_index=None):
+        self.sketch.add(seconds, bucket)
+        self.histogram[bisect_right(_BIN_UPPER_BOUNDS, seconds) if bin_index is None else bin_index] += 1
+
+    def summary(self):
+        sketch = self.sketch
+        return {
+            'count': sketch.count, 'mean': sketch.mean,
+            'p50': sketch.quantile(0.50), 'p90': sketch.quantile(0.90), 'p99': sketch.quantile(0.99),
+            'histogram': [(label, count) for (_, label), count in zip(DWELL_BINS, self.histogram)],
+        }
+
+def compute_dwell_report(rows):
+    """(firma, saniye) satırlarını tek geçişte genel ve firma bazında özetler"""
+    overall = DwellStats()
+    by_firm = defaultdict(DwellStats)
+    bucket_index = overall.sketch.bucket_index
+    invalid = 0
+    for firm, seconds in rows:
+        if seconds is None or seconds < 0:
+            invalid += 1
+            continue
+        # Kova ve histogram aralığı satır başına bir kez hesaplanıp firma grubunda da kullanılır
+        bucket, bin_index = bucket_index(seconds), bisect_right(_BIN_UPPER_BOUNDS, seconds)
+        overall.add(seconds, bucket, bin_index)
+        if firm: by_firm[firm].add(seconds, bucket, bin_index)
+
+    return {'overall': overall.summary(), 'invalid': invalid,
+            'by_firm': {key: value.summary() for key, value in by_firm.items()}}
@@ -0,0 +1,370 @@
+# Modules/exporters.py
+import os
+import csv
+import gzip
+import html
+import json
+import importlib.util
+from datetime import datetime
+from itertools import islice
+from database import Database
+from Modules.report_rows import format_report_rows
+from Modules.logger import logger
+
+# Ana listeden yapılan dışa aktarımların sütun başlıkları (database.RECORD_COLUMNS sırası)
+RECORD_HEADERS = ["ID", "Plaka", "Dorse Plaka", "Sürücü", "Telefon", "Sürücü Firması", "Gelinen Firma",
+                  "Giriş Zamanı", "Çıkış Zamanı", "Durum", "Notlar"]
+
+class ExportCancelled(Exception):
+    """Kullanıcı dışa aktarmayı iptal etti"""
+
+class StreamingExporter:
+    """Ortak dışa aktarıcı arayüzü: open -> write_rows... -> close; abort yarım dosyayı siler"""
+    extension = ""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def open(self, columns):
+        raise NotImplementedError
+
+    def write_rows(self, rows):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def abort(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+        if os.path.exists(self.file_path):
+            try:
+                os.remove(self.file_path)
+            except OSError as e:
+                logger.log_warning(f"Yarım kalan dışa aktarım dosyası silinemedi: {self.file_path} ({e})")
+
+class ExcelExporter(StreamingExporter):
+    """openpyxl'in yalnızca-yazma kipiyle satırları doğrudan XLSX akışına yazar"""
+    extension = ".xlsx"
+
+    def open(self, columns):
+        from openpyxl import Workbook
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("Rapor")
+        self.sheet.append(list(columns))
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.sheet.append(row)
+
+    def close(self):
+        if getattr(self, "workbook", None) is not None:
+            workbook, self.workbook = self.workbook, None
+            workbook.save(self.file_path)
+
+# Metin tabanlı dışa aktarıcıların yazma tamponu; dosyaya bu boyutta parçalar halinde yazılır
+TEXT_BUFFER_SIZE = 1 << 16
+
+class TextExporter(StreamingExporter):
+    """Metin dosyasına yazan dışa aktarıcıların ortak tabanı"""
+    encoding = "utf-8"
+
+    def _open_file(self):
+        return open(self.file_path, "w", encoding=self.encoding, newline="", buffering=TEXT_BUFFER_SIZE)
+
+    def close(self):
+        if getattr(self, "file", None) is not None:
+            file, self.file = self.file, None
+            file.close()
+
+class CsvExporter(TextExporter):
+    """Virgülle ayrılmış CSV; BOM sayesinde Excel Türkçe karakterleri doğru açar"""
+    extension = ".csv"
+    encoding = "utf-8-sig"
+
+    def open(self, columns):
+        self.file = self._open_file()
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+
+class GzipCsvExporter(CsvExporter):
+    """Sistemler arası aktarım için gzip ile sıkıştırılmış, BOM'suz CSV"""
+    extension = ".csv.gz"
+    encoding = "utf-8"
+
+    def _open_file(self):
+        return gzip.open(self.file_path, "wt", encoding=self.encoding, newline="", compresslevel=6)
+
+class NdjsonExporter(TextExporter):
+    """Her satır bir JSON nesnesi (sütun başlığı -> değer)"""
+    extension = ".ndjson"
+
+    def open(self, columns):
+        self.file = self._open_file()
+        self.columns = list(columns)
+
+    def write_rows(self, rows):
+        columns = self.columns
+        self.file.write("".join(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows))
+
+HTML_SECTION_ROWS = 1000
+_HTML_HEAD = """<!DOCTYPE html><html lang="tr"><head><meta charset="utf-8"><title>Özel Rapor</title><style>body{font-family:-apple-system,BlinkMacSystemFont,"Segoe UI",Roboto,"Helvetica Neue",Arial,sans-serif;background-color:#f5f5f5;color:#333}h1{color:#005fb8}h2{font-size:14px;color:#666;margin:30px 0 0}table{width:100%;border-collapse:collapse;margin-top:10px;box-shadow:0 2px 4px rgba(0,0,0,.1)}th,td{padding:8px 12px;text-align:left;border-bottom:1px solid #ddd}thead tr{background-color:#0078d4;color:#fff}tbody tr:nth-child(even){background-color:#f2f2f2}tbody tr:hover{background-color:#e2e2e2}section{page-break-after:always}section:last-of-type{page-break-after:auto}nav a{margin-right:8px}</style></head><body>"""
+
+class HtmlExporter(TextExporter):
+    """HTML tablosunu her biri kendi başlığıyla HTML_SECTION_ROWS satırlık bölümler halinde yazar"""
+    extension = ".html"
+
+    def open(self, columns):
+        self.file = self._open_file()
+        self.header = "<thead><tr>" + "".join(f"<th>{html.escape(str(column))}</th>" for column in columns) + "</tr></thead>"
+        self.section_rows = 0
+        self.sections = 0
+        self.file.write(_HTML_HEAD)
+        self.file.write(f"<h1>Özel Rapor - {datetime.now().strftime('%d.%m.%Y %H:%M')}</h1>")
+
+    def _start_section(self):
+        self.sections += 1
+        self.section_rows = 0
+        self.file.write(f'<section id="sayfa-{self.sections}"><h2>Sayfa {self.sections}</h2><table>{self.header}<tbody>')
+
+    def _end_section(self):
+        self.file.write("</tbody></table></section>")
+
+    def write_rows(self, rows):
+        parts = []
+        for row in rows:
+            if self.section_rows == 0:
+                self.file.write("".join(parts)); parts = []
+                self._start_section()
+            parts.append("<tr>" + "".join(f"<td>{'-' if value is None else html.escape(str(value))}</td>" for value in row) + "</tr>")
+            self.section_rows += 1
+            if self.section_rows == HTML_SECTION_ROWS:
+                self.file.write("".join(parts)); parts = []
+                self._end_section()
+                self.section_rows = 0
+        self.file.write("".join(parts))
+
+    def close(self):
+        if getattr(self, "file", None) is not None:
+            if self.section_rows:
+                self._end_section()
+            if self.sections > 1:
+                links = "".join(f'<a href="#sayfa-{index}">{index}</a>' for index in range(1, self.sections + 1))
+                self.file.write(f"<nav>Sayfalar: {links}</nav>")
+            self.file.write("</body></html>")
+        super().close()
+
+REPORTLAB_AVAILABLE = importlib.util.find_spec("reportlab") is not None
+if not REPORTLAB_AVAILABLE:
+    logger.log_warning("ReportLab kütüphanesi yüklü değil, PDF export özelliği devre dışı")
+
+# Bu sayıdan fazla sütun seçildiğinde PDF yatay sayfaya basılır
+PDF_LANDSCAPE_COLUMNS = 6
+PDF_FONT_SIZE = 8
+PDF_CELL_PADDING = 3
+_pdf_font_name = None
+
+def register_pdf_font():
+    """Türkçe karakterleri destekleyen bir sistem fontunu bir kez kaydeder, font adını döndürür"""
+    global _pdf_font_name
+    if _pdf_font_name is None:
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        _pdf_font_name = 'Helvetica'
+        font_dir = os.path.join(os.environ.get("SystemRoot", "C:\\Windows"), "Fonts")
+        fonts_to_try = [('SegoeUI', os.path.join(font_dir, 'segoeui.ttf')), ('Arial', os.path.join(font_dir, 'arial.ttf')),
+                        ('DejaVuSans', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf')]
+        for font_name, font_path in fonts_to_try:
+            try:
+                if os.path.exists(font_path):
+                    pdfmetrics.registerFont(TTFont(font_name, font_path))
+                    _pdf_font_name = font_name
+                    break
+            except Exception as e:
+                logger.log_warning(f"Font yükleme hatası: {font_name}", e)
+    return _pdf_font_name
+
+class PdfExporter(StreamingExporter):
+    """Satırları sabit sütun genişlikli, sayfa boyutlu tablolar halinde her sayfayı bitirerek yazar"""
+    extension = ".pdf"
+    margin = 30
+
+    def open(self, columns):
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.pdfgen.canvas import Canvas
+        from reportlab.platypus import Paragraph, Spacer, TableStyle
+
+        self.columns = list(columns)
+        self.font_name = register_pdf_font()
+        self.pagesize = landscape(A4) if len(self.columns) > PDF_LANDSCAPE_COLUMNS else A4
+        self.width = self.pagesize[0] - 2 * self.margin
+        self.height = self.pagesize[1] - 2 * self.margin
+        self.canvas = Canvas(self.file_path, pagesize=self.pagesize)
+        self.canvas.setTitle("Özel Rapor")
+        self.page = 0
+
+        self.row_height = PDF_FONT_SIZE + 2 * PDF_CELL_PADDING + 2
+        self.style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#0078d4")),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#f2f2f2")]),
+            ('FONTNAME', (0, 0), (-1, -1), self.font_name),
+            ('FONTSIZE', (0, 0), (-1, -1), PDF_FONT_SIZE),
+            ('LEADING', (0, 0), (-1, -1), PDF_FONT_SIZE + 1),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('TOPPADDING', (0, 0), (-1, -1), PDF_CELL_PADDING),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), PDF_CELL_PADDING),
+            ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+        ])
+        self.col_widths = None
+        self.pending = []
+
+        title_style = getSampleStyleSheet()['h1']
+        title_style.fontName = self.font_name
+        title_style.textColor = colors.HexColor("#005fb8")
+        title = Paragraph(f"Özel Rapor - {datetime.now().strftime('%d.%m.%Y')}", title_style)
+        # İlk sayfanın başına tablodan önce eklenir
+        self.heading = [title, Spacer(1, 12)]
+        title_height = title.wrap(self.width, self.height)[1] + title_style.spaceBefore + title_style.spaceAfter + 12
+        self.rows_per_page = max(1, int(self.height // self.row_height) - 1)
+        self.rows_left_on_page = max(1, int((self.height - title_height) // self.row_height) - 1)
+
+    def _compute_col_widths(self, sample):
+        """Genişlikleri başlık ve ilk parçadaki en uzun metinlerden orantılı olarak hesaplar"""
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        natural = []
+        for index, header in enumerate(self.columns):
+            widest = max([stringWidth(row[index], self.font_name, PDF_FONT_SIZE) for row in sample[:500]] or [0])
+            natural.append(max(stringWidth(header, self.font_name, PDF_FONT_SIZE), widest) + 2 * 6)
+        scale = self.width / sum(natural)
+        self.col_widths = [width * scale for width in natural]
+        # Bu uzunluğa kadar olan metinler en geniş karakterle bile sığar, ölçülmeden geçer
+        widest_char = stringWidth("W", self.font_name, PDF_FONT_SIZE)
+        self.safe_chars = [int((width - 12) / widest_char) for width in self.col_widths]
+
+    def _fit(self, value, index):
+        """Sütuna sığmayan metni kısaltır"""
+        if len(value) <= self.safe_chars[index]:
+            return value
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        limit = self.col_widths[index] - 12
+        if stringWidth(value, self.font_name, PDF_FONT_SIZE) <= limit:
+            return value
+        while value and stringWidth(value + "…", self.font_name, PDF_FONT_SIZE) > limit:
+            value = value[:-1]
+        return value + "…"
+
+    def _cell_rows(self, rows):
+        for row in rows:
+            yield ["-" if value is None else str(value) for value in row]
+
+    def write_rows(self, rows):
+        self.pending.extend(self._cell_rows(rows))
+        if self.col_widths is None:
+            self._compute_col_widths(self.pending)
+        while len(self.pending) >= self.rows_left_on_page:
+            self._write_page(self.rows_left_on_page)
+
+    def _write_page(self, count):
+        """Bir sayfayı (ilk sayfada başlıkla) çizip sayfa numarasıyla bitirir"""
+        from reportlab.platypus import Frame, LayoutError, Table
+        chunk, self.pending = self.pending[:count], self.pending[count:]
+        flowables, self.heading = self.heading, []
+        if chunk:
+            data = [self.columns]
+            for row in chunk:
+                data.append([self._fit(value, index) for index, value in enumerate(row)])
+            flowables.append(Table(data, colWidths=self.col_widths, rowHeights=self.row_height, style=self.style))
+        frame = Frame(self.margin, self.margin, self.width, self.height, leftPadding=0, rightPadding=0, topPadding=0, bottomPadding=0)
+        frame.addFromList(flowables, self.canvas)
+        if flowables:
+            raise LayoutError("PDF tablosu sayfaya sığmadı")
+        self.page += 1
+        self.canvas.saveState()
+        self.canvas.setFont(self.font_name, 7)
+        self.canvas.drawRightString(self.pagesize[0] - self.margin, self.margin / 2, f"Sayfa {self.page}")
+        self.canvas.restoreState()
+        self.canvas.showPage()
+        self.rows_left_on_page = self.rows_per_page
+
+    def close(self):
+        canvas = getattr(self, "canvas", None)
+        if canvas is None:
+            return
+        if self.pending and self.col_widths is None:
+            self._compute_col_widths(self.pending)
+        if self.pending or not self.page:
+            self._write_page(len(self.pending))
+        self.canvas = None
+        canvas.save()
+
+EXPORTERS = {
+    "Excel": ExcelExporter,
+    "PDF": PdfExporter,
+    "HTML": HtmlExporter,
+    "CSV": CsvExporter,
+    "CSV (gzip)": GzipCsvExporter,
+    "NDJSON": NdjsonExporter,
+}
+
+def run_export(rows, columns, exporter, total=None, progress=None, cancel_event=None, chunk_size=2000):
+    """rows akışını parçalar halinde exporter'a yazar; ilerlemeyi bildirir, iptali denetler"""
+    exporter.open(columns)
+    written = 0
+    try:
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled()
+            exporter.write_rows(chunk)
+            written += len(chunk)
+            if progress:
+                progress(written, total)
+        exporter.close()
+    except BaseException:
+        exporter.abort()
+        raise
+    return written
+
+def open_export_rows(reader, spec):
+    """Dışa aktarım tanımına göre (başlıklar, satır akışı, toplam satır) döndürür"""
+    if spec['kind'] == 'records':
+        if spec.get('search_term'):
+            total = reader.count_search_records(spec['search_term'])
+        else:
+            total = reader.count_records(spec.get('year'), spec.get('month'), spec.get('status_filter'))
+        rows = reader.iter_records(spec.get('year'), spec.get('month'), spec.get('status_filter'), spec.get('search_term'),
+                                   spec.get('order_by'), spec.get('descending', True))
+        return RECORD_HEADERS, rows, total
+    if spec['kind'] == 'custom_report':
+        match_mode = spec.get('match_mode', 'contains')
+        total = reader.count_custom_report_data(spec['start_date'], spec['end_date'], spec.get('filters'), match_mode)
+        raw_rows = reader.fetch_custom_report_data(spec['start_date'], spec['end_date'], spec.get('filters'), columns=spec['columns'],
+                                                   sort_by=spec.get('sort_by'), descending=spec.get('descending', False), match_mode=match_mode)
+        return spec['headers'], format_report_rows(raw_rows, spec['columns']), total
+    raise ValueError(f"Bilinmeyen dışa aktarım türü: {spec['kind']}")
+
+def export_to_file(db_path, spec, output_format, file_path, progress=None, cancel_event=None):
+    """Salt okunur ayrı bir bağlantı açıp spec'e uyan satırları istenen formatta dosyaya yazar"""
+    reader = Database.open_reader(db_path)
+    rows = None
+    try:
+        headers, rows, total = open_export_rows(reader, spec)
+        exporter = EXPORTERS[output_format](file_path)
+        written = run_export(rows, headers, exporter, total, progress, cancel_event)
+        logger.log_info(f"{output_format} dışa aktarımı tamamlandı: {file_path} ({written} satır)")
+        return written
+    finally:
+        if rows is not None:
+            rows.close()
+        reader.close()
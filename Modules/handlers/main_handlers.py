@@ -1,6 +1,7 @@
 # Modules/handlers/main_handlers.py
 from Modules.custom_windows import CustomMessageBox
 from Modules.logger import logger
+from Modules.ui.treeview_setup import update_sort_indicators
 
 def add_record(app):
     """Yeni kayıt ekler."""
@@ -17,9 +18,20 @@ def add_record(app):
         for key, placeholder in app.placeholder_map.items():
             if data[key] == placeholder:
                 data[key] = ""
+        
+        # Mükerrer giriş uyarısı: plaka zaten içerideyse onay istenir
+        open_visit = app.db.find_open_visit(data["Plaka"])
+        if open_visit:
+            dialog = CustomMessageBox(app.root, "Araç İçeride",
+                f"'{open_visit[1]}' plakalı araç {open_visit[7]} tarihinden beri içeride görünüyor.\n"
+                "Yine de yeni giriş eklensin mi?", 'yesno')
+            if not dialog.result:
+                return
                 
         success = app.db.add_record(data, notes)
         if success:
+            if app.autocomplete:
+                app.autocomplete.add_record(data)
             app.clear_form()
             app.check_virtualization_and_populate()
             CustomMessageBox(app.root, "Başarılı", "Yeni araç kaydı eklendi.", 'info')
@@ -62,6 +74,23 @@ def checkout_selected(app):
         app.db.checkout_vehicle(record_id)
         app.check_virtualization_and_populate()
 
+def checkout_by_plate(app):
+    """Plakayla hızlı çıkış alanındaki aracın açık ziyaretine çıkış verir."""
+    plate = app.plate_checkout_entry.get().strip()
+    if not plate:
+        return
+    try:
+        record_id = app.db.checkout_by_plate(plate)
+    except Exception as e:
+        logger.log_error("Plakayla çıkış hatası", e)
+        CustomMessageBox(app.root, "Hata", "Çıkış verilirken bir hata oluştu!", 'info')
+        return
+    if record_id is None:
+        CustomMessageBox(app.root, "Bilgi", f"'{plate.upper()}' plakalı içeride araç bulunamadı.", 'info')
+        return
+    app.plate_checkout_entry.delete(0, 'end')
+    app.check_virtualization_and_populate()
+
 def reactivate_record(app):
     """Seçili kaydı tekrar aktif hale getirir."""
     selected_item = app.tree.focus()
@@ -87,3 +116,12 @@ def on_search(app):
         app.populate_treeview(search_term=search_term)
     elif not search_term:
         apply_filters(app)
+
+def sort_by_column(app, column):
+    """Başlığa tıklanan sütuna göre sıralar; aynı sütuna tekrar tıklanınca yönü değiştirir."""
+    if app.sort_column == column:
+        app.sort_descending = not app.sort_descending
+    else:
+        app.sort_column, app.sort_descending = column, False
+    update_sort_indicators(app.tree, app.sort_column, app.sort_descending)
+    app.populate_treeview(**app.current_filters)
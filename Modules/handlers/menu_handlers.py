@@ -1,16 +1,13 @@
 # Modules/handlers/menu_handlers.py
 import os
 import sys
-import webbrowser
-import pandas as pd
-import zipfile
-import tempfile
 from tkinter import filedialog
 from Modules.settings import SettingsWindow
 from Modules.blacklist import BlacklistManager
-from Modules.reporting import CustomReportGenerator
-from Modules.custom_windows import CustomMessageBox, AboutWindow
-from Modules.helpers import get_db_path, get_log_dir
+from Modules.custom_windows import CustomMessageBox, AboutWindow, ReportJobsWindow, PerformanceWindow
+from Modules.handlers.window_handlers import poll_report_jobs
+from Modules.backup_manager import restore_backup
+from Modules.helpers import get_backup_dir, get_db_path, get_log_dir
 from Modules.logger import logger
 
 def open_settings_window(app):
@@ -25,22 +22,38 @@ def export_to_excel(app):
         )
         if not file_path: return
         
-        records = app.db.get_filtered_records(app.year_var, app.month_var, search_term=app.search_var.get())
-        if not records:
+        search_term = app.search_var.get().strip()
+        year, month = app.db.selected_year_month(app.year_var, app.month_var)
+        if not app.db.count_filtered_records(app.year_var, app.month_var, search_term=search_term):
             CustomMessageBox(app.root, "Uyarı", "Aktarılacak veri yok.", 'info')
             return
         
-        columns = ["ID", "Plaka", "Dorse Plaka", "Sürücü", "Telefon", "Sürücü Firması", "Gelinen Firma", "Giriş Zamanı", "Çıkış Zamanı", "Durum", "Notlar"]
-        df = pd.DataFrame(records, columns=columns)
-        df.to_excel(file_path, index=False)
-        
-        CustomMessageBox(app.root, "Başarılı", f"Veriler başarıyla aktarıldı.", 'info')
+        # Satırlar rapor iş havuzunda, veritabanının anlık kopyasından XLSX'e yazılır; arayüz donmaz
+        spec = {'kind': 'records', 'year': year, 'month': month, 'search_term': search_term}
+        submit_report_job(app, spec, "Excel", file_path, "Kayıt Listesi")
     except Exception as e:
         logger.log_error("Excel aktarım hatası", e)
         CustomMessageBox(app.root, "Hata", f"Excel'e aktarım sırasında hata oluştu: {e}", 'info')
 
+def submit_report_job(app, spec, output_format, file_path, title):
+    """Dışa aktarımı iş kuyruğuna ekler ve işler penceresini gösterir"""
+    app.report_jobs.submit(app.db.db.db_path, spec, output_format, file_path, title)
+    show_report_jobs(app)
+    if not app.report_jobs_polling:
+        app.report_jobs_polling = True
+        app.root.after(300, lambda: poll_report_jobs(app))
+
+def show_report_jobs(app):
+    if app.jobs_window is not None and app.jobs_window.winfo_exists():
+        app.jobs_window.refresh()
+        app.jobs_window.lift()
+    else:
+        app.jobs_window = ReportJobsWindow(app.root, app.report_jobs)
+
 def open_custom_report_generator(app):
-    CustomReportGenerator(app.root, app.db)
+    # Rapor penceresi ve dışa aktarıcılar ilk kullanımda yüklenir (açılış süresini kısaltır)
+    from Modules.reporting import CustomReportGenerator
+    CustomReportGenerator(app.root, app.db, lambda spec, output_format, file_path, title: submit_report_job(app, spec, output_format, file_path, title))
 
 def open_blacklist_manager(app):
     BlacklistManager(app.root, app.db)
@@ -50,9 +63,12 @@ def manual_backup(app):
 
 def restore_from_backup(app):
     """Sıkıştırılmış veya normal yedekten geri yükleme yapar."""
+    if app.settings.get("sync_mode") == "client":
+        CustomMessageBox(app.root, "Bilgi", "Sunucuya bağlıyken geri yükleme yapılamaz. Geri yüklemeyi sunucu bilgisayarında yapın.", 'info')
+        return
     try:
         file_path = filedialog.askopenfilename(
-            initialdir=app.settings.get('backup_path', 'Yedekler'), 
+            initialdir=get_backup_dir(app.settings), 
             title="Yedek Seçin", 
             filetypes=[("Yedek Dosyaları", "*.zip *.db")]
         )
@@ -62,33 +78,11 @@ def restore_from_backup(app):
             return
 
         app.db.db.close() # Mevcut veritabanı bağlantısını kapat
-        
-        db_to_restore = file_path
-        temp_dir = None
-
-        # Eğer dosya sıkıştırılmışsa, önce geçici bir dizine aç
-        if file_path.endswith(".zip"):
-            temp_dir = tempfile.mkdtemp()
-            with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                # Zip içindeki ilk .db dosyasını bul ve aç
-                db_filename = next((f for f in zip_ref.namelist() if f.endswith('.db')), None)
-                if not db_filename:
-                    raise Exception(".zip arşivi içinde .db dosyası bulunamadı.")
-                zip_ref.extract(db_filename, temp_dir)
-                db_to_restore = os.path.join(temp_dir, db_filename)
-
-        # Geri yükleme işlemini yap
-        import shutil
-        shutil.copyfile(db_to_restore, get_db_path())
-
-        # Geçici dosyaları temizle
-        if temp_dir:
-            shutil.rmtree(temp_dir)
+        restore_backup(file_path, get_db_path())
 
         CustomMessageBox(app.root, "Başarılı", "Veritabanı geri yüklendi. Program yeniden başlatılacak.", 'info')
-        logger.log_info(f"Veritabanı geri yüklendi: {file_path}")
-        
         app.root.destroy()
+        logger.shutdown()  # execl atexit işleyicilerini çalıştırmaz; kuyruktaki kayıtlar yazılsın
         os.execl(sys.executable, sys.executable, *sys.argv)
 
     except Exception as e:
@@ -96,15 +90,26 @@ def restore_from_backup(app):
         CustomMessageBox(app.root, "Hata", f"Geri yükleme sırasında hata: {e}", 'info')
         # Hata durumunda programı yeniden başlat ki eski veritabanı açılsın
         app.root.destroy()
+        logger.shutdown()  # execl atexit işleyicilerini çalıştırmaz; kuyruktaki kayıtlar yazılsın
         os.execl(sys.executable, sys.executable, *sys.argv)
 
 
 def show_error_logs(app):
-    log_dir = get_log_dir()
-    if os.path.exists(log_dir) and os.listdir(log_dir):
-        try: os.startfile(log_dir)
-        except AttributeError: webbrowser.open(f'file://{os.path.realpath(log_dir)}')
-    else: CustomMessageBox(app.root, "Bilgi", "Henüz kaydedilmiş bir hata bulunmuyor.", 'info')
+    # Görüntüleyici ilk kullanımda yüklenir; hata dosyası yoksa günlük kayıtlarıyla açılır
+    from Modules.log_viewer import LogViewerWindow
+    if app.log_viewer is not None and app.log_viewer.winfo_exists():
+        app.log_viewer.refresh()
+        app.log_viewer.lift()
+        return
+    folder = "Hata Kayıtları" if any(name.endswith("_hatalar.txt") for name in os.listdir(get_log_dir())) else "Günlük Kayıtları"
+    app.log_viewer = LogViewerWindow(app.root, folder)
+
+def show_performance(app):
+    if app.performance_window is not None and app.performance_window.winfo_exists():
+        app.performance_window.refresh()
+        app.performance_window.lift()
+    else:
+        app.performance_window = PerformanceWindow(app.root, app)
 
 def show_about(app):
     AboutWindow(app.root)
\ No newline at end of file
@@ -1,24 +1,119 @@
 # Modules/handlers/window_handlers.py
+import calendar
+import time
 from datetime import datetime
+from functools import partial
 from Modules.custom_windows import CustomMessageBox
+from Modules.report_jobs import DONE, FAILED
+from Modules.helpers import open_path
 from Modules.logger import logger
-from Modules.ui.reports_tab import update_reports_data_on_ui
+from Modules.ui.reports_tab import update_reports_data_on_ui, set_refresh_indicator
+
+# Veri değişmese de uzun bekleyen araç listesi bu süreden eskiyse rapor arka planda yenilenir
+LONG_STAY_MAX_AGE_SECONDS = 60
 
 def on_tab_change(app, event):
-    """Sekme değiştirildiğinde raporlar sekmesini günceller."""
+    """Sekme değiştirildiğinde raporlar sekmesini (ilk seferde oluşturup) günceller."""
     if app.notebook.index(app.notebook.select()) == 1:
+        app.ensure_reports_tab()
         update_reports_data(app)
 
+def _selected_report_range(app):
+    start_date = datetime.strptime(app.start_date_var.get(), "%d.%m.%Y").strftime("%Y-%m-%d")
+    end_date = datetime.strptime(app.end_date_var.get(), "%d.%m.%Y").strftime("%Y-%m-%d")
+    return start_date, end_date
+
+def _report_compute(app):
+    return partial(app.db.compute_report_data, long_stay_hours=app.settings.get("long_stay_threshold_hours", 8))
+
 def update_reports_data(app):
-    """Rapor verilerini alır ve UI'da günceller."""
+    """Rapor verilerini önbellekten gösterir; eskiyse arka planda yeniden hesaplatır."""
     try:
-        start_date = datetime.strptime(app.start_date_var.get(), "%d.%m.%Y").strftime("%Y-%m-%d")
-        end_date = datetime.strptime(app.end_date_var.get(), "%d.%m.%Y").strftime("%Y-%m-%d")
+        start_date, end_date = _selected_report_range(app)
+        version = app.db.get_data_version()
         
-        report_data = app.db.get_report_data(start_date, end_date)
-        update_reports_data_on_ui(app.report_widgets, report_data) # UI fonksiyonunu çağır
+        report_data, is_fresh = app.report_cache.lookup(start_date, end_date, version)
+        if report_data is not None:
+            _render_reports(app, report_data)
+        if is_fresh and time.monotonic() - report_data.get('computed_at', 0) < LONG_STAY_MAX_AGE_SECONDS:
+            set_refresh_indicator(app.report_refresh_label)
+            return
+        
+        set_refresh_indicator(app.report_refresh_label, "🔄 Yenileniyor..." if report_data is not None else "⏳ Hesaplanıyor...")
+        future = app.report_cache.refresh(start_date, end_date, version, _report_compute(app))
+        app.root.after(100, lambda: _poll_report_result(app, future, (start_date, end_date)))
         
     except ValueError:
         CustomMessageBox(app.root, "Hata", "Lütfen tarihleri GG.AA.YYYY formatında girin.", "info")
     except Exception as e:
         logger.log_error("Rapor güncelleme hatası", e)
+
+def _render_reports(app, report_data):
+    update_reports_data_on_ui(app.report_widgets, report_data) # UI fonksiyonunu çağır
+
+def _poll_report_result(app, future, requested_range):
+    """Arka plandaki rapor hesaplamasını Tk döngüsünü bloklamadan takip eder."""
+    if not future.done():
+        app.root.after(100, lambda: _poll_report_result(app, future, requested_range))
+        return
+    try:
+        report_data = future.result()
+    except Exception as e:
+        set_refresh_indicator(app.report_refresh_label, "❌ Rapor hesaplanamadı")
+        logger.log_error("Arka plan rapor hesaplama hatası", e)
+        return
+    try:
+        selected_range = _selected_report_range(app)
+    except ValueError:
+        # Tarih alanı düzenleniyor; sonuç önbellekte kalır, geçerli tarih girilince gösterilir
+        set_refresh_indicator(app.report_refresh_label)
+        return
+    # Kullanıcı bu arada başka bir aralık seçtiyse eski sonucu ekrana basma
+    if selected_range != requested_range:
+        return
+    try:
+        _render_reports(app, report_data)
+        set_refresh_indicator(app.report_refresh_label)
+    except Exception as e:
+        set_refresh_indicator(app.report_refresh_label, "❌ Rapor hesaplanamadı")
+        logger.log_error("Rapor gösterme hatası", e)
+
+def schedule_report_prewarm(app):
+    """Varsayılan (bu ay) rapor aralığını periyodik olarak arka planda hazır tutar."""
+    try:
+        today = datetime.now()
+        start_date = today.replace(day=1).strftime("%Y-%m-%d")
+        end_date = today.replace(day=calendar.monthrange(today.year, today.month)[1]).strftime("%Y-%m-%d")
+        version = app.db.get_data_version()
+        if not app.report_cache.is_fresh(start_date, end_date, version):
+            app.report_cache.refresh(start_date, end_date, version, _report_compute(app))
+    except Exception as e:
+        logger.log_error("Rapor ön hazırlık hatası", e)
+    interval_minutes = app.settings.get("report_prewarm_minutes", 5)
+    if interval_minutes > 0:
+        app.root.after(int(interval_minutes * 60000), lambda: schedule_report_prewarm(app))
+
+def poll_report_jobs(app):
+    """Rapor işlerinin ilerlemesini okur, açıksa işler penceresini günceller; iş kalmayınca durur."""
+    try:
+        app.report_jobs.poll()
+        if app.jobs_window is not None and app.jobs_window.winfo_exists():
+            app.jobs_window.refresh()
+        for job in app.report_jobs.jobs:
+            if job.done and job.id not in app.notified_jobs:
+                app.notified_jobs.add(job.id)
+                _on_report_job_finished(app, job)
+    except Exception as e:
+        logger.log_error("Rapor işi takip hatası", e)
+    if app.report_jobs.active_jobs():
+        app.root.after(300, lambda: poll_report_jobs(app))
+    else:
+        app.report_jobs_polling = False
+
+def _on_report_job_finished(app, job):
+    if job.status == DONE:
+        logger.log_info(f"Rapor işi #{job.id} tamamlandı: {job.file_path} ({job.result} satır)")
+        if job.output_format == "HTML":
+            open_path(job.file_path)
+    elif job.status == FAILED:
+        CustomMessageBox(app.root, "Hata", f"Rapor oluşturulurken bir hata oluştu:\n{job.error}", 'info')
@@ -2,8 +2,9 @@
 import os
 import sys
 import json
-import traceback
+import re
 from datetime import datetime, timedelta
+from Modules.logger import logger
 
 # --- AYAR YÖNETİMİ ---
 SETTINGS_FILE = "settings.json"
@@ -18,9 +19,77 @@ DEFAULT_SETTINGS = {
     "enable_virtualization": True,
     "virtualization_threshold": 100,  # <-- DEĞİŞİKLİK BURADA (150'den 100'e düşürüldü)
     "page_size": 100,
-    "enable_backup_compression": True
+    "enable_backup_compression": True,
+    "report_cache_size": 12,
+    "report_job_workers": 2,
+    "report_prewarm_minutes": 5,
+    "long_stay_threshold_hours": 8,
+    "autocomplete_limit": 8,  # giriş formu alanlarında gösterilen en fazla öneri (0: otomatik tamamlama kapalı)
+    "slow_query_ms": 200,  # bu süreyi aşan veritabanı çağrıları sorgu planıyla günlüğe yazılır (0: kapalı)
+    "query_debug": False,  # True: çalışan tüm SQL ifadeleri DEBUG seviyesinde günlüğe yazılır
+    "stall_threshold_ms": 250,  # arayüzü bu süreden uzun donduran işlemler yığın izleriyle günlüğe yazılır (0: kapalı)
+    "log_format": "text",  # "json": günlük ve hata dosyalarında her kayıt tek satır JSON
+    "log_max_mb": 10,  # bir günlük dosyası bu boyutu aşınca aynı gün için _2, _3... dosyasına geçilir
+    "sync_mode": "local",  # "client": veritabanı yerine sync_server_url'deki sunucu kullanılır (python -m Modules.cli serve)
+    "sync_server_url": "http://127.0.0.1:8765",
+    "sync_token": "",
+    "ingest_token": ""  # kamera/turnike olay servisine (python -m Modules.cli ingest) erişim anahtarı
 }
 
+# --- METİN / SIRALAMA ---
+# Türkçe alfabe sırası; Q, W, X yabancı plakalar için araya yerleştirildi
+_TR_ALPHABET = "ABCÇDEFGĞHIİJKLMNOÖPQRSŞTUÜVWXYZ"
+_TR_FOLD = {"Â": "A", "Î": "İ", "Û": "U", "Ä": "A", "Ë": "E"}
+_TR_SORT_TABLE = {ord(ch): chr(0x100 + i) for i, ch in enumerate(_TR_ALPHABET)}
+_TR_SORT_TABLE.update({ord(src): chr(0x100 + _TR_ALPHABET.index(dst)) for src, dst in _TR_FOLD.items()})
+
+def turkish_upper(text):
+    """Türkçe kurallarına göre büyük harfe çevirir (i -> İ, ı -> I)"""
+    return str(text).replace("i", "İ").replace("ı", "I").upper()
+
+def turkish_sort_key(text):
+    """Türkçe alfabe sırasına göre byte karşılaştırmasıyla sıralanabilen anahtar üretir"""
+    if not text:
+        return ""
+    return " ".join(turkish_upper(text).split()).translate(_TR_SORT_TABLE)
+
+def plate_key(plate):
+    """Plakayı boşluk/tire farkı gözetmeden sıralama ve arama anahtarına çevirir"""
+    return turkish_sort_key("".join(ch for ch in str(plate or "") if ch.isalnum()))
+
+# Türkiye plakası: il kodu (01-81), 1-3 harf, 2-5 rakam
+_TR_PLATE_RE = re.compile(r"(0[1-9]|[1-7][0-9]|8[01])([A-Z]{1,3})([0-9]{2,5})")
+
+def canonical_plate(plate):
+    """Okuyucudan gelen plakayı tek biçime getirir ("34abc-123" -> "34 ABC 123")"""
+    compact = "".join(ch for ch in str(plate or "").upper() if ch.isalnum())
+    match = _TR_PLATE_RE.fullmatch(compact)
+    return " ".join(match.groups()) if match else compact
+
+def format_duration(seconds):
+    """Saniyeyi '1 gün 2 sa 5 dk' biçiminde okunabilir süreye çevirir"""
+    if seconds is None:
+        return "-"
+    days, remainder = divmod(int(seconds), 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes, _ = divmod(remainder, 60)
+    text = ""
+    if days > 0:
+        text += f"{days} gün "
+    if hours > 0:
+        text += f"{hours} sa "
+    if minutes > 0:
+        text += f"{minutes} dk"
+    return text.strip() or "0 dk"
+
+def open_path(path):
+    """Dosya veya klasörü işletim sisteminin varsayılan uygulamasıyla açar"""
+    try:
+        os.startfile(path)
+    except AttributeError:
+        import webbrowser  # yalnızca Windows dışında ve ilk kullanımda yüklenir
+        webbrowser.open(f'file://{os.path.realpath(path)}')
+
 def get_app_path():
     """Ana uygulama dizinini döndürür"""
     if getattr(sys, 'frozen', False): 
@@ -49,6 +118,11 @@ def get_gunluk_dir():
     os.makedirs(gunluk_dir, exist_ok=True)
     return gunluk_dir
 
+def get_backup_dir(settings):
+    """Ayarlardaki yedek klasörü; göreli yol çalışma dizinine değil uygulama dizinine göre çözülür"""
+    backup_path = os.path.expanduser(settings.get('backup_path') or DEFAULT_SETTINGS['backup_path'])
+    return os.path.join(get_app_path(), backup_path)
+
 def load_settings():
     """Ayarları settings.json dosyasından yükler."""
     app_path = get_app_path()
@@ -134,14 +208,5 @@ def manual_cleanup_logs():
         return 0
 
 def log_error(message, exception=None):
-    """Detaylı hata kaydı oluşturur"""
-    try:
-        log_dir = get_log_dir()
-        log_file = os.path.join(log_dir, f"{datetime.now().strftime('%Y-%m-%d')}_hatalar.txt")
-        with open(log_file, 'a', encoding='utf-8') as f:
-            f.write(f"\n{'='*50}\nZaman: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\nHata: {message}\n")
-            if exception:
-                f.write(f"Exception Türü: {type(exception).__name__}\nException Mesajı: {str(exception)}\nTraceback:\n")
-                traceback.print_exc(file=f)
-            f.write(f"{'='*50}\n\n")
-    except Exception: pass
\ No newline at end of file
+    """Detaylı hata kaydı oluşturur (günlüğe ve günün hata dosyasına, bkz. Modules.logger)"""
+    logger.log_error(message, exception)
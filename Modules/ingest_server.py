@@ -0,0 +1,239 @@
+# Modules/ingest_server.py
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from Modules.anpr_pairing import PairingEngine
+from Modules.helpers import canonical_plate
+from Modules.logger import logger
+from Modules.sync_server import HttpError, open_wal_writer, read_request, require_token_for_host, token_matches, write_json
+
+DEFAULT_INGEST_PORT = 8766
+EVENT_TYPES = ("entry", "exit")
+TEXT_FIELDS = ("camera", "trailer", "driver", "phone", "firm", "destination", "notes")
+MAX_EVENTS_PER_REQUEST = 1000
+# Yazıcının tek işlemde yazdığı en fazla olay (bekleyen istekler birleştirilirken)
+MAX_WRITE_BATCH = 2000
+MAX_TEXT_LENGTH = 200
+# Kamera saatindeki bu kadar ileri tarihli olaylar reddedilir
+MAX_CLOCK_SKEW = timedelta(minutes=10)
+
+def _parse_time(value):
+    """ISO 8601 veya 'YYYY-AA-GG SS:DD[:ss]' zamanı yerel saatli datetime'a çevirir (yoksa şimdiki an)"""
+    if value is None:
+        return datetime.now()
+    if not isinstance(value, str):
+        raise ValueError("time metin olmalı")
+    moment = datetime.fromisoformat(value.strip())
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    if moment > datetime.now() + MAX_CLOCK_SKEW:
+        raise ValueError(f"Gelecek tarihli olay: {value}")
+    return moment
+
+def validate_event(raw, require_id=True):
+    """Olayı doğrulayıp Database.ingest_events sözlüğüne çevirir; geçersizse ValueError"""
+    if not isinstance(raw, dict):
+        raise ValueError("Olay bir JSON nesnesi olmalı")
+    event_type = raw.get("type")
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"type şunlardan biri olmalı: {', '.join(EVENT_TYPES)}")
+    plate = canonical_plate(raw.get("plate")) if isinstance(raw.get("plate"), str) else ""
+    if not 2 <= len(plate.replace(" ", "")) <= 12:
+        raise ValueError(f"Geçersiz plaka: {raw.get('plate')!r}")
+    moment = _parse_time(raw.get("time"))
+    event_id = raw.get("event_id")
+    if event_id is None and not require_id:
+        # Aynı okuma yeniden gönderilirse aynı kimlik oluşur
+        event_id = f"{raw.get('camera') or 'kamera'}-{event_type}-{plate.replace(' ', '')}-{moment:%Y%m%d%H%M%S}"
+    if not isinstance(event_id, str) or not 0 < len(event_id.strip()) <= 100:
+        raise ValueError("event_id gerekli (en fazla 100 karakter)")
+    event = {"event_id": event_id.strip(), "type": event_type, "plate": plate, "time": moment.strftime("%Y-%m-%d %H:%M"),
+             "timestamp": moment.timestamp()}
+    for field in TEXT_FIELDS:
+        value = raw.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, str) or len(value) > MAX_TEXT_LENGTH:
+            raise ValueError(f"{field} en fazla {MAX_TEXT_LENGTH} karakterlik metin olmalı")
+        event[field] = value.strip()
+    if "trailer" in event:
+        event["trailer"] = canonical_plate(event["trailer"])
+    return event
+
+class IngestWriter:
+    """Eşzamanlı isteklerin olaylarını tek yazıcı bağlantısında birleştirerek yazar"""
+
+    def __init__(self, db_path, max_batch=MAX_WRITE_BATCH):
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.batches = self.events = 0
+        self._db = None
+        self._executor = None
+        self._queue = None
+        self._task = None
+
+    def _open(self):
+        self._db = open_wal_writer(self.db_path)
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="olay_yazici", initializer=self._open)
+        await asyncio.get_running_loop().run_in_executor(self._executor, lambda: None)
+        self._task = asyncio.create_task(self._run())
+
+    async def call(self, method, *args):
+        """Yazıcı bağlantısında tek bir Database metodu çalıştırır (yazmalarla sıralı)"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, lambda: getattr(self._db, method)(*args))
+
+    async def submit(self, events):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((events, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            count = len(pending[0][0])
+            # Önceki yazma sürerken biriken istekler bir sonraki işleme birlikte girer
+            while count < self.max_batch and not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+                count += len(pending[-1][0])
+            events = [event for batch, _ in pending for event in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, self._db.ingest_events, events)
+            except Exception as e:
+                logger.log_error(f"Olaylar yazılamadı ({len(events)} olay)", e)
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.events += len(events)
+            position = 0
+            for batch, future in pending:
+                if not future.done():
+                    future.set_result(results[position:position + len(batch)])
+                position += len(batch)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+        if self._executor is not None:
+            self._executor.submit(lambda: self._db.close())
+            self._executor.shutdown(wait=True)
+
+class IngestServer:
+    """POST /events isteklerini doğrulayıp IngestWriter'a iletir"""
+
+    def __init__(self, db_path, host="127.0.0.1", port=DEFAULT_INGEST_PORT, token=None, max_batch=MAX_WRITE_BATCH):
+        self.host, self.port = host, port
+        self.token = require_token_for_host(host, token)
+        self.writer = IngestWriter(db_path, max_batch)
+        self.engine = PairingEngine()
+        self.requests = self.rejected = 0
+        self._server = None
+
+    async def start(self):
+        await self.writer.start()
+        self.engine.load_open_visits(await self.writer.call("get_open_visits"))
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.log_info(f"Olay alım servisi başlatıldı: http://{self.host}:{self.port} ({self.writer.db_path}, "
+                        f"{self.engine.open_visits} açık ziyaret)")
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.writer.close()
+            logger.log_info(f"Olay alım servisi durduruldu ({self.writer.events} olay, {self.writer.batches} yazma)")
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while (request := await read_request(reader, writer)) is not None:
+                method, path, headers, body, keep_alive = request
+                self.requests += 1
+                status, payload = await self._dispatch(method, path, headers, body)
+                await write_json(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, headers, body):
+        try:
+            if not token_matches(headers, self.token):
+                raise HttpError(401, "Geçersiz erişim anahtarı")
+            if path == "/health":
+                return 200, {"ok": True, "events": self.writer.events, "batches": self.writer.batches, "rejected": self.rejected,
+                             "pairing": {**self.engine.stats, 'open_visits': self.engine.open_visits}}
+            if path not in ("/events", "/reads"):
+                raise HttpError(404, f"Bilinmeyen adres: {path}")
+            if method != "POST":
+                raise HttpError(405, "POST bekleniyor")
+            if path == "/reads":
+                return 200, await self._ingest_reads(self._parse_events(body))
+            return 200, await self._ingest(self._parse_events(body))
+        except HttpError as e:
+            return e.status, {"error": str(e), "type": "HttpError"}
+        except Exception as e:
+            logger.log_error("Olay isteği işlenemedi", e)
+            return 500, {"error": str(e), "type": type(e).__name__}
+
+    def _parse_events(self, body):
+        try:
+            data = json.loads(body.decode("utf-8"))
+        except ValueError as e:
+            raise HttpError(400, f"Geçersiz JSON: {e}")
+        events = data.get("events") if isinstance(data, dict) and "events" in data else data
+        events = events if isinstance(events, list) else [events]
+        if not 0 < len(events) <= MAX_EVENTS_PER_REQUEST:
+            raise HttpError(400, f"Bir istekte 1-{MAX_EVENTS_PER_REQUEST} olay olmalı")
+        return events
+
+    def _validate(self, raw_events, require_id=True):
+        """(sonuç listesi - geçersizler dolu, geçerli olaylar, geçerlilerin konumları)"""
+        results, valid, positions = [None] * len(raw_events), [], []
+        for position, raw in enumerate(raw_events):
+            try:
+                valid.append(validate_event(raw, require_id))
+                positions.append(position)
+            except ValueError as e:
+                event_id = raw.get("event_id") if isinstance(raw, dict) else None
+                results[position] = {"event_id": event_id, "status": "invalid", "error": str(e)}
+        self.rejected += len(raw_events) - len(valid)
+        return results, valid, positions
+
+    async def _ingest(self, raw_events):
+        results, valid, positions = self._validate(raw_events)
+        if valid:
+            for position, event, result in zip(positions, valid, await self.writer.submit(valid)):
+                self.engine.observe(event, result)
+                results[position] = result
+        return {"results": results, "accepted": len(valid), "rejected": len(raw_events) - len(valid)}
+
+    async def _ingest_reads(self, raw_reads):
+        results, reads, _ = self._validate(raw_reads, require_id=False)
+        duplicates = self.engine.stats['duplicates']
+        events, flags = self.engine.process_many(reads)
+        written = await self.writer.submit(events) if events else []
+        for event, result in zip(events, written):
+            self.engine.confirm(event, result)
+        for flag in flags:
+            logger.log_warning(f"Kamera okuması eşleşmedi ({flag['flag']}): {flag['plate']} {flag['time']} (kaynak: {flag['camera'] or '-'})")
+        return {"accepted": len(reads), "rejected": len(raw_reads) - len(reads), "duplicates": self.engine.stats['duplicates'] - duplicates,
+                "results": written, "flags": flags, "invalid": [result for result in results if result is not None]}
+
+def run_ingest_server(db_path, host="127.0.0.1", port=DEFAULT_INGEST_PORT, token=None, max_batch=MAX_WRITE_BATCH):
+    """Servisi Ctrl+C'ye kadar çalıştırır"""
+    server = IngestServer(db_path, host, port, token, max_batch)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
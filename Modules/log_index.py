@@ -0,0 +1,257 @@
+# Modules/log_index.py
+import mmap
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+LEVEL_CODES = {name: code for code, name in enumerate(LEVELS)}
+# Seviye dizisinde kayıt başlangıcı satırlarını işaretleyen bit
+RECORD_START = 0x80
+# index_more'un bir çağrıda indekslediği en fazla satır (ilerleme ve iptal için)
+INDEX_CHUNK_LINES = 50_000
+# Seviye/zaman ayrıştırması için okunan satır başı uzunluğu
+_HEAD_BYTES = 160
+
+_TEXT_RE = re.compile(rb"(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) - .*? - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - ")
+_JSON_RE = re.compile(rb'\{"time": "(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)", "level": "(DEBUG|INFO|WARNING|ERROR|CRITICAL)"')
+_BLOCK_TIME_RE = re.compile(rb"Zaman: (\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)")
+_BLOCK_LEVEL_RE = re.compile(rb"Seviye: (DEBUG|INFO|WARNING|ERROR|CRITICAL)")
+_BLOCK_SEPARATOR = b"=" * 50
+_FILE_DATE_RE = re.compile(r"(\d{4}-\d\d-\d\d)")
+# Türkçe büyük/küçük harf eşleşmeleri (re.IGNORECASE bayt desenlerinde yalnızca ASCII'yi kapsar).
+# Python ve Türkçe büyük harf dönüşümü farklı olduğundan ("kimlik".upper() == "KIMLIK") i, I, ı ve İ tek harf sayılır.
+_I_VARIANTS = "iIıİ"
+_TR_CASE = {char: _I_VARIANTS for char in _I_VARIANTS}
+
+def file_date(path):
+    """Dosya adındaki tarih (cleanup_logs ile aynı kural); bulunamazsa None"""
+    match = _FILE_DATE_RE.search(os.path.basename(path))
+    return datetime.strptime(match.group(1), "%Y-%m-%d") if match else None
+
+def list_log_files(directory):
+    """Klasördeki günlük/hata dosyaları, tarih ve parça sırasına göre (eskiden yeniye)"""
+    if not os.path.isdir(directory):
+        return []
+    paths = [os.path.join(directory, name) for name in os.listdir(directory)
+             if name.endswith((".log", "_hatalar.txt")) and file_date(name)]
+    return sorted(paths, key=lambda path: (file_date(path), os.path.getmtime(path)))
+
+def text_pattern(text):
+    """Büyük/küçük harf duyarsız, UTF-8 bayt arama deseni (i, I, ı, İ birbirinin yerine geçer)"""
+    parts = []
+    for char in text:
+        variants = set(_TR_CASE.get(char, char.lower() + char.upper()))
+        parts.append(b"(?:" + b"|".join(re.escape(variant.encode("utf-8")) for variant in sorted(variants)) + b")")
+    return re.compile(b"".join(parts))
+
+class LogFileIndex:
+    """Tek bir günlük dosyasının satır indeksi; dosya büyüdükçe index_more ile kaldığı yerden devam eder"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.offsets = array("Q")
+        self.levels = array("B")
+        self.times = array("I")
+        # (satır sayısı, indekslenen bayt) birlikte yayımlanır; arayüz indeksleme sürerken yalnızca
+        # üç dizinin de tamamlandığı satırları görür
+        self._published = (0, 0)
+        self._file = None
+        self._mm = None
+        self._size = 0
+        self._lock = threading.Lock()
+        date = file_date(path)
+        self._level = LEVEL_CODES["ERROR"] if self.name.endswith("_hatalar.txt") else LEVEL_CODES["INFO"]
+        self._time = int(date.timestamp()) if date else 0
+        self._minutes = {}
+
+    def __len__(self):
+        return self._published[0]
+
+    @property
+    def indexed_bytes(self):
+        return self._published[1]
+
+    def _remap(self):
+        """Dosya büyüdüyse yeniden eşler (yazılmakta olan bugünkü dosya için)"""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size == self._size:
+            return
+        with self._lock:
+            self._close_map()
+            if size:
+                self._file = open(self.path, "rb")
+                self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._size = len(self._mm)
+
+    def _close_map(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._file.close()
+        self._file = self._mm = None
+        self._size = 0
+
+    def close(self):
+        with self._lock:
+            self._close_map()
+
+    def _epoch(self, stamp):
+        # strptime pahalı; aynı dakikadaki kayıtlar önbellekten hesaplanır
+        minute = stamp[:16]
+        base = self._minutes.get(minute)
+        if base is None:
+            base = self._minutes[minute] = int(datetime.strptime(minute.decode("ascii"), "%Y-%m-%d %H:%M").timestamp())
+        return base + int(stamp[17:19])
+
+    def _parse_head(self, head):
+        """Satır bir kayıt başlatıyorsa seviye/zamanı günceller; başlangıç ise True"""
+        first = head[:1]
+        if first.isdigit():
+            match = _TEXT_RE.match(head)
+            if match:
+                self._time, self._level = self._epoch(match.group(1)), LEVEL_CODES[match.group(2).decode("ascii")]
+                return True
+        elif first == b"{":
+            match = _JSON_RE.match(head)
+            if match:
+                self._time, self._level = self._epoch(match.group(1)), LEVEL_CODES[match.group(2).decode("ascii")]
+                return True
+        elif first == b"=":
+            return head.startswith(_BLOCK_SEPARATOR)
+        elif first == b"Z":
+            match = _BLOCK_TIME_RE.match(head)
+            if match:
+                self._time = self._epoch(match.group(1))
+        elif first == b"S":
+            match = _BLOCK_LEVEL_RE.match(head)
+            if match:
+                self._level = LEVEL_CODES[match.group(1).decode("ascii")]
+        return False
+
+    def index_more(self, max_lines=INDEX_CHUNK_LINES):
+        """En fazla max_lines satır indeksler; tamamlanmış satır kalmadıysa True döndürür"""
+        self._remap()
+        mm, end, pos = self._mm, self._size, self._published[1]
+        if mm is None:
+            return True
+        offsets, levels, times = self.offsets, self.levels, self.times
+        count = 0
+        while count < max_lines:
+            newline = mm.find(b"\n", pos, end)
+            if newline == -1:
+                break  # son satır henüz tamamlanmamış olabilir
+            starts = self._parse_head(mm[pos:min(newline, pos + _HEAD_BYTES)])
+            offsets.append(pos)
+            levels.append(self._level | (RECORD_START if starts else 0))
+            times.append(self._time)
+            pos = newline + 1
+            count += 1
+        self._published = (len(offsets), pos)
+        return count < max_lines
+
+    def line(self, number):
+        """number'ıncı satırın metni (satır sonu olmadan)"""
+        count, indexed = self._published
+        start = self.offsets[number]
+        end = self.offsets[number + 1] - 1 if number + 1 < count else indexed - 1
+        with self._lock:
+            raw = self._mm[start:end] if self._mm is not None else b""
+        return raw.rstrip(b"\r").decode("utf-8", errors="replace")
+
+    def level(self, number):
+        return self.levels[number] & ~RECORD_START
+
+    def is_record_start(self, number):
+        return bool(self.levels[number] & RECORD_START)
+
+    def search(self, min_level=0, start=None, end=None, pattern=None, should_stop=None):
+        """Filtreye uyan satır numaraları (array). Zamanlar dosyada artan sırada olduğundan aralık ikili aramayla bulunur."""
+        count, indexed = self._published
+        low = bisect_left(self.times, start, 0, count) if start is not None else 0
+        high = bisect_right(self.times, end, 0, count) if end is not None else count
+        levels = self.levels
+        if pattern is None:
+            if min_level == 0:
+                return array("Q", range(low, high))
+            return array("Q", (i for i in range(low, high) if levels[i] & ~RECORD_START >= min_level))
+        result = array("Q")
+        if low >= high:
+            return result
+        offsets = self.offsets
+        pos, stop = offsets[low], offsets[high] if high < count else indexed
+        with self._lock:
+            mm = self._mm
+            while pos < stop:
+                match = pattern.search(mm, pos, stop)
+                if match is None:
+                    break
+                number = bisect_right(offsets, match.start(), 0, count) - 1
+                if levels[number] & ~RECORD_START >= min_level:
+                    result.append(number)
+                pos = offsets[number + 1] if number + 1 < count else stop
+                if should_stop and len(result) % 1000 == 0 and should_stop():
+                    break
+        return result
+
+class LogCollection:
+    """Birden fazla dosyayı tek satır dizisi gibi gösterir (eskiden yeniye, dosyalar art arda)"""
+
+    def __init__(self, paths):
+        self.files = [LogFileIndex(path) for path in paths]
+        self._next_file = 0
+
+    def __len__(self):
+        return sum(len(index) for index in self.files)
+
+    def _starts(self):
+        starts, total = [], 0
+        for index in self.files:
+            starts.append(total)
+            total += len(index)
+        return starts
+
+    def locate(self, number):
+        """Genel satır numarası -> (dosya indeksi, dosyadaki satır numarası)"""
+        starts = self._starts()
+        position = bisect_right(starts, number) - 1
+        return self.files[position], number - starts[position]
+
+    def index_step(self, max_lines=INDEX_CHUNK_LINES):
+        """Sıradaki dosyadan bir parça indeksler; tüm dosyalar bittiyse True"""
+        while self._next_file < len(self.files):
+            if self.files[self._next_file].index_more(max_lines):
+                self._next_file += 1
+            else:
+                return False
+        return True
+
+    def refresh(self):
+        """Dosyalara sonradan eklenen satırlar için indekslemeyi yeniden başlatır (eski satırlar korunur)"""
+        self._next_file = 0
+
+    def indexed_bytes(self):
+        return sum(index.indexed_bytes for index in self.files)
+
+    def total_bytes(self):
+        return sum(os.path.getsize(index.path) for index in self.files if os.path.exists(index.path))
+
+    def search(self, min_level=0, start=None, end=None, text=None, should_stop=None):
+        """Filtreye uyan genel satır numaraları (array)"""
+        pattern = text_pattern(text) if text else None
+        result, base = array("Q"), 0
+        for index in self.files:
+            if should_stop and should_stop():
+                break
+            count = len(index)
+            if count and (start is None or index.times[count - 1] >= start) and (end is None or index.times[0] <= end):
+                result.extend(base + number for number in index.search(min_level, start, end, pattern, should_stop))
+            base += count
+        return result
+
+    def close(self):
+        for index in self.files:
+            index.close()
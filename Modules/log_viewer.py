@@ -0,0 +1,301 @@
+# Modules/log_viewer.py
+import os
+import tkinter as tk
+from tkinter import ttk
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from Modules.helpers import open_path
+from Modules.log_index import LEVELS, LEVEL_CODES, LogCollection, list_log_files
+from Modules.logger import logger
+
+FOLDERS = {"Hata Kayıtları": logger.get_log_dir, "Günlük Kayıtları": logger.get_gunluk_dir}
+ALL_FILES = "Tüm dosyalar"
+ALL_LEVELS = "Tümü"
+# Seçili satırın ayrıntısında gösterilen en fazla devam satırı (traceback vb.)
+DETAIL_MAX_LINES = 200
+POLL_MS = 100
+
+def _parse_time(text, end=False):
+    """'GG.AA.YYYY [SS:DD]' veya 'YYYY-AA-GG [SS:DD]' -> epoch saniye; boşsa None"""
+    text = text.strip()
+    if not text:
+        return None
+    for fmt in ("%d.%m.%Y %H:%M", "%Y-%m-%d %H:%M", "%d.%m.%Y", "%Y-%m-%d"):
+        try:
+            value = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if end and ":" not in text:
+            value = value.replace(hour=23, minute=59, second=59)
+        elif end:
+            value = value.replace(second=59)
+        return int(value.timestamp())
+    raise ValueError(f"Geçersiz tarih: {text}")
+
+class LogViewerWindow(tk.Toplevel):
+    """Günlük ve hata dosyalarını sanal kaydırmalı listede gösterir; modal değildir"""
+    COLUMNS = ("Dosya", "Satır", "Metin")
+
+    def __init__(self, parent, folder="Hata Kayıtları"):
+        super().__init__(parent)
+        self.title("Kayıt Görüntüleyici")
+        self.transient(parent)
+        self.collection = None
+        self.matches = None  # Filtre yoksa None: tüm satırlar
+        self.top = 0
+        self.visible_rows = 30
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kayit_indeks")
+        # Yeni dosya seçimi indekslemeyi, yeni filtre önceki aramayı geçersiz kılar
+        self._index_generation = 0
+        self._filter_generation = 0
+
+        self.folder_var = tk.StringVar(value=folder)
+        self.file_var = tk.StringVar(value=ALL_FILES)
+        self.level_var = tk.StringVar(value=ALL_LEVELS)
+        self.start_var = tk.StringVar()
+        self.end_var = tk.StringVar()
+        self.search_var = tk.StringVar()
+
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(expand=True, fill="both")
+        self._create_filter_bar(main_frame)
+        self._create_list(main_frame)
+
+        self.detail_text = tk.Text(main_frame, height=8, wrap="none", font=("Consolas", 9))
+        self.detail_text.pack(fill="x", pady=(10, 0))
+        self.detail_text.configure(state="disabled")
+
+        button_frame = ttk.Frame(main_frame, padding="0 10 0 0")
+        button_frame.pack(fill="x")
+        self.status_label = ttk.Label(button_frame, text="")
+        self.status_label.pack(side="left")
+        ttk.Button(button_frame, text="Kapat", command=self.destroy).pack(side="right")
+        ttk.Button(button_frame, text="Klasörü Aç", command=lambda: open_path(FOLDERS[self.folder_var.get()]())).pack(side="right", padx=5)
+        ttk.Button(button_frame, text="Yenile", command=self.refresh).pack(side="right", padx=5)
+
+        self.bind("<Destroy>", self._on_destroy)
+        self.bind("<Escape>", lambda e: self.destroy())
+        self.center_window(parent)
+        self._load_folder()
+
+    def _create_filter_bar(self, parent):
+        bar = ttk.Frame(parent)
+        bar.pack(fill="x", pady=(0, 10))
+        ttk.Label(bar, text="Klasör:").pack(side="left")
+        folder_combo = ttk.Combobox(bar, textvariable=self.folder_var, values=list(FOLDERS), state="readonly", width=16)
+        folder_combo.pack(side="left", padx=(5, 10))
+        folder_combo.bind("<<ComboboxSelected>>", lambda e: self._load_folder())
+        ttk.Label(bar, text="Dosya:").pack(side="left")
+        self.file_combo = ttk.Combobox(bar, textvariable=self.file_var, state="readonly", width=28)
+        self.file_combo.pack(side="left", padx=(5, 10))
+        self.file_combo.bind("<<ComboboxSelected>>", lambda e: self._load_files())
+        ttk.Label(bar, text="Seviye ≥").pack(side="left")
+        level_combo = ttk.Combobox(bar, textvariable=self.level_var, values=(ALL_LEVELS,) + LEVELS, state="readonly", width=10)
+        level_combo.pack(side="left", padx=(5, 10))
+        level_combo.bind("<<ComboboxSelected>>", lambda e: self.apply_filter())
+        ttk.Label(bar, text="Başlangıç:").pack(side="left")
+        ttk.Entry(bar, textvariable=self.start_var, width=16).pack(side="left", padx=(5, 10))
+        ttk.Label(bar, text="Bitiş:").pack(side="left")
+        ttk.Entry(bar, textvariable=self.end_var, width=16).pack(side="left", padx=(5, 10))
+        ttk.Label(bar, text="Ara:").pack(side="left")
+        search_entry = ttk.Entry(bar, textvariable=self.search_var, width=24)
+        search_entry.pack(side="left", padx=(5, 10))
+        for entry in bar.winfo_children():
+            if isinstance(entry, ttk.Entry) and not isinstance(entry, ttk.Combobox):
+                entry.bind("<Return>", lambda e: self.apply_filter())
+        ttk.Button(bar, text="Filtrele", command=self.apply_filter, style="Accent.TButton").pack(side="left")
+
+    def _create_list(self, parent):
+        frame = ttk.Frame(parent)
+        frame.pack(expand=True, fill="both")
+        self.tree = ttk.Treeview(frame, columns=self.COLUMNS, show="headings", height=self.visible_rows, selectmode="browse")
+        for col, width, stretch in zip(self.COLUMNS, (170, 70, 900), (False, False, True)):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, anchor="e" if col == "Satır" else "w", stretch=stretch)
+        self.tree.tag_configure("ERROR", foreground="#c0392b")
+        self.tree.tag_configure("CRITICAL", foreground="#c0392b", font=("Consolas", 9, "bold"))
+        self.tree.tag_configure("WARNING", foreground="#d68910")
+        self.tree.tag_configure("DEBUG", foreground="gray")
+        self.scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self._on_scrollbar)
+        self.tree.pack(side="left", expand=True, fill="both")
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._show_detail)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_to(self.top - 3 * (e.delta // 120)))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_to(self.top - 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_to(self.top + 3))
+        self.tree.bind("<Prior>", lambda e: self.scroll_to(self.top - self.visible_rows))
+        self.tree.bind("<Next>", lambda e: self.scroll_to(self.top + self.visible_rows))
+        self.tree.bind("<Control-Home>", lambda e: self.scroll_to(0))
+        self.tree.bind("<Control-End>", lambda e: self.scroll_to(self.row_count()))
+
+    # --- Veri kaynağı ---
+
+    def _load_folder(self):
+        self.paths = list_log_files(FOLDERS[self.folder_var.get()]())
+        names = [os.path.basename(path) for path in self.paths]
+        self.file_combo.config(values=[ALL_FILES] + names[::-1])
+        self.file_var.set(ALL_FILES)
+        self._load_files()
+
+    def _load_files(self):
+        selected = self.file_var.get()
+        paths = self.paths if selected == ALL_FILES else [path for path in self.paths if os.path.basename(path) == selected]
+        self._index_generation += 1
+        self._filter_generation += 1
+        if self.collection is not None:
+            collection = self.collection
+            self._executor.submit(collection.close)
+        self.collection = LogCollection(paths)
+        self.matches = None
+        self._start_indexing()
+
+    def refresh(self):
+        """Dosyalara eklenen yeni satırları indeksler, yeni dosya varsa listeyi baştan yükler"""
+        if list_log_files(FOLDERS[self.folder_var.get()]()) != self.paths:
+            self._load_folder()
+        else:
+            self.collection.refresh()
+            self._start_indexing()
+
+    def _start_indexing(self):
+        generation, collection = self._index_generation, self.collection
+        is_current = lambda: generation == self._index_generation
+        self._poll(self._executor.submit(self._index_all, collection, is_current), is_current, self.apply_filter)
+
+    def _index_all(self, collection, is_current):
+        while is_current() and not collection.index_step():
+            pass
+
+    def _poll(self, future, is_current, on_done):
+        if not self.winfo_exists() or not is_current():
+            return
+        if future.done():
+            try:
+                future.result()
+            except Exception as e:
+                logger.log_error("Kayıt dosyası okunamadı", e)
+                self.status_label.config(text=f"Hata: {e}")
+                return
+            on_done()
+            return
+        total = self.collection.total_bytes()
+        if self.matches is None:
+            self.status_label.config(text=f"İndeksleniyor... %{self.collection.indexed_bytes() * 100 // max(total, 1)} "
+                                          f"({len(self.collection)} satır)")
+            self.render()
+        self.after(POLL_MS, lambda: self._poll(future, is_current, on_done))
+
+    def apply_filter(self):
+        try:
+            start, end = _parse_time(self.start_var.get()), _parse_time(self.end_var.get(), end=True)
+        except ValueError as e:
+            self.status_label.config(text=str(e))
+            return
+        level = self.level_var.get()
+        min_level = LEVEL_CODES.get(level, 0)
+        text = self.search_var.get().strip() or None
+        if not any((start, end, text, min_level)):
+            self.matches = None
+            self._on_filtered()
+            return
+        self._filter_generation += 1
+        generation, collection = self._filter_generation, self.collection
+        is_current = lambda: generation == self._filter_generation
+        self.status_label.config(text="Filtreleniyor...")
+        future = self._executor.submit(collection.search, min_level, start, end, text, lambda: not is_current())
+        self._poll(future, is_current, lambda: self._set_matches(future.result()))
+
+    def _set_matches(self, matches):
+        self.matches = matches
+        self._on_filtered()
+
+    def _on_filtered(self):
+        total = len(self.collection)
+        if self.matches is None:
+            self.status_label.config(text=f"{total} satır, {len(self.collection.files)} dosya")
+        else:
+            self.status_label.config(text=f"{len(self.matches)} / {total} satır filtreye uyuyor")
+        # Filtresiz listede en yeni kayıtlar (sonda) görünsün
+        self.top = 0 if self.matches is not None else max(0, total - self.visible_rows)
+        self.render()
+
+    def row_count(self):
+        return len(self.matches) if self.matches is not None else len(self.collection)
+
+    def _line_number(self, row):
+        return self.matches[row] if self.matches is not None else row
+
+    # --- Sanal kaydırma ---
+
+    def _on_resize(self, event):
+        row_height = ttk.Style().lookup("Treeview", "rowheight") or 20
+        rows = max(1, (event.height - 25) // int(row_height))
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.tree.config(height=rows)
+            self.render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(value) * self.row_count()))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_to(self.top + int(value) * step)
+
+    def scroll_to(self, top):
+        self.top = max(0, min(top, self.row_count() - self.visible_rows))
+        self.render()
+
+    def render(self):
+        """Yalnızca görünen satırları Treeview'a yazar"""
+        if self.collection is None:
+            return
+        count = self.row_count()
+        self.top = max(0, min(self.top, count - self.visible_rows))
+        self.tree.delete(*self.tree.get_children())
+        for row in range(self.top, min(self.top + self.visible_rows, count)):
+            index, number = self.collection.locate(self._line_number(row))
+            self.tree.insert("", "end", iid=str(row), values=(index.name, number + 1, index.line(number)),
+                             tags=(LEVELS[index.level(number)],))
+        if count:
+            self.scrollbar.set(self.top / count, min(1.0, (self.top + self.visible_rows) / count))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _show_detail(self, event=None):
+        """Seçili satırı ve (kayıt başlangıcıysa) ona ait devam satırlarını gösterir"""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        index, number = self.collection.locate(self._line_number(int(selection[0])))
+        lines = [index.line(number)]
+        following = number + 1
+        while following < len(index) and not index.is_record_start(following) and len(lines) < DETAIL_MAX_LINES:
+            lines.append(index.line(following))
+            following += 1
+        self.detail_text.configure(state="normal")
+        self.detail_text.delete("1.0", "end")
+        self.detail_text.insert("1.0", "\n".join(lines))
+        self.detail_text.configure(state="disabled")
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            self._index_generation += 1
+            self._filter_generation += 1
+            collection = self.collection
+            if collection is not None:
+                self._executor.submit(collection.close)
+            self._executor.shutdown(wait=False)
+
+    def center_window(self, parent):
+        self.update_idletasks()
+        w, h = 1200, 700
+        parent_x = parent.winfo_x()
+        parent_y = parent.winfo_y()
+        parent_w = parent.winfo_width()
+        parent_h = parent.winfo_height()
+        x = parent_x + (parent_w // 2) - (w // 2)
+        y = parent_y + (parent_h // 2) - (h // 2)
+        self.geometry(f'{w}x{h}+{x}+{y}')
@@ -1,8 +1,86 @@
 # Modules/logger.py
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+DEFAULT_LOG_MAX_MB = 10
+LOG_FORMATS = ("text", "json")
+
+class DatedFileHandler(TimedRotatingFileHandler):
+    """Gece yarısı ve boyut sınırında yeni tarihli dosyaya geçen handler"""
+
+    def __init__(self, directory, pattern, max_bytes=0, delay=False):
+        self.directory, self.pattern, self.max_bytes = directory, pattern, max_bytes
+        super().__init__(self._current_path(), when="midnight", encoding="utf-8", delay=delay)
+
+    def _path(self, date, part):
+        return os.path.join(self.directory, self.pattern.format(date=date, part=f"_{part}" if part > 1 else ""))
+
+    def _current_path(self):
+        """Bugünün son parçası; o da doluysa bir sonraki"""
+        date = datetime.now().strftime("%Y-%m-%d")
+        part = 1
+        while os.path.exists(self._path(date, part + 1)):
+            part += 1
+        path = self._path(date, part)
+        if self.max_bytes and os.path.exists(path) and os.path.getsize(path) >= self.max_bytes:
+            path = self._path(date, part + 1)
+        return path
+
+    def shouldRollover(self, record):
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes and self.stream is not None:
+            return self.stream.tell() >= self.max_bytes
+        return False
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self.baseFilename = os.path.abspath(self._current_path())
+        self.rolloverAt = self.computeRollover(int(datetime.now().timestamp()))
+        if not self.delay:
+            self.stream = self._open()
+
+class ErrorBlockFormatter(logging.Formatter):
+    """Hata dosyasının okunabilir blok biçimi"""
+
+    def format(self, record):
+        text = f"{'=' * 50}\nZaman: {self.formatTime(record, self.datefmt)}\nSeviye: {record.levelname} ({record.name})\nHata: {record.getMessage()}\n"
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            text += f"Traceback:\n{record.exc_text}\n"
+        return text + f"{'=' * 50}\n"
+
+class JsonLinesFormatter(logging.Formatter):
+    """Her kayıt tek satır JSON: zaman, seviye, kaynak, iş parçacığı, mesaj ve varsa traceback"""
+
+    def format(self, record):
+        entry = {'time': self.formatTime(record, self.datefmt), 'level': record.levelname, 'logger': record.name,
+                 'thread': record.threadName, 'message': record.getMessage()}
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class _AppQueueHandler(QueueHandler):
+    """Mesajı ve traceback metnini kuyruğa eklemeden önce hazırlar; biçimlendirme dinleyicide yapılır"""
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
 class AppLogger:
     """Merkezi logging sınıfı - Tüm uygulama için standart logging"""
@@ -18,7 +96,9 @@ class AppLogger:
     def __init__(self):
         if not self._initialized:
             self._initialized = True
+            self._listener = None
             self.setup_logging()
+            atexit.register(self.shutdown)
     
     def get_app_path(self):
         """Ana uygulama dizinini döndürür"""
@@ -46,47 +126,47 @@ class AppLogger:
         return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
     def setup_logging(self, settings=None):
-        """Logging sistemini kur"""
+        """Logging sistemini kur: dosya yazımı arka plan dinleyicisinde, biçim ve boyut sınırı ayarlardan"""
+        settings = settings or {}
         try:
             log_dir = self.get_log_dir()
             gunluk_dir = self.get_gunluk_dir()
+            max_bytes = int(settings.get("log_max_mb", DEFAULT_LOG_MAX_MB) * 1024 * 1024)
             
-            # Klasörleri oluştur
-            os.makedirs(log_dir, exist_ok=True)
-            os.makedirs(gunluk_dir, exist_ok=True)
-            
-            # Günlük dosyası yolu
-            gunluk_file = os.path.join(gunluk_dir, f"gunluk_{datetime.now().strftime('%Y-%m-%d')}.log")
-            
-            # Mevcut handler'ları temizle
+            # Önceki kurulumu kapat (kuyruktaki kayıtlar yazılır), mevcut handler'ları temizle
+            self.shutdown()
             for handler in logging.root.handlers[:]:
                 logging.root.removeHandler(handler)
             
             # Logging formatı
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
+            if settings.get("log_format", "text") == "json":
+                formatter = error_formatter = JsonLinesFormatter(datefmt='%Y-%m-%d %H:%M:%S')
+            else:
+                formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+                error_formatter = ErrorBlockFormatter(datefmt='%Y-%m-%d %H:%M:%S')
             
-            # File handler - Günlük kayıtları
-            file_handler = logging.FileHandler(
-                gunluk_file, 
-                mode='a', 
-                encoding='utf-8'
-            )
+            # Günlük kayıtları
+            file_handler = DatedFileHandler(gunluk_dir, "gunluk_{date}{part}.log", max_bytes)
             file_handler.setLevel(logging.DEBUG)
             file_handler.setFormatter(formatter)
             
+            # Hata kayıtları - dosya ilk hatada oluşturulur
+            error_handler = DatedFileHandler(log_dir, "{date}{part}_hatalar.txt", max_bytes, delay=True)
+            error_handler.setLevel(logging.ERROR)
+            error_handler.setFormatter(error_formatter)
+            
             # Console handler - Sadece hatalar
             console_handler = logging.StreamHandler()
             console_handler.setLevel(logging.ERROR)
             console_formatter = logging.Formatter('%(levelname)s: %(message)s')
             console_handler.setFormatter(console_formatter)
             
-            # Root logger'ı ayarla
+            # Root logger yalnızca kuyruğa yazar
+            log_queue = queue.SimpleQueue()
+            self._listener = QueueListener(log_queue, file_handler, error_handler, console_handler, respect_handler_level=True)
+            self._listener.start()
             logging.getLogger().setLevel(logging.DEBUG)
-            logging.getLogger().addHandler(file_handler)
-            logging.getLogger().addHandler(console_handler)
+            logging.getLogger().addHandler(_AppQueueHandler(log_queue))
             
             # Bazı third-party loglarını sustur
             logging.getLogger('sqlite3').setLevel(logging.WARNING)
@@ -103,6 +183,14 @@ class AppLogger:
             logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
             print(f"Logging kurulumunda hata: {e}")
     
+    def shutdown(self):
+        """Kuyruktaki kayıtları yazar ve dinleyiciyi durdurur (çıkışta otomatik çağrılır)"""
+        listener, self._listener = getattr(self, '_listener', None), None
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+    
     def log_debug(self, message):
         """Debug seviyesinde log"""
         logging.debug(message)
@@ -118,14 +206,14 @@ class AppLogger:
     def log_error(self, message, exception=None):
         """Error seviyesinde log - Detaylı hata kaydı"""
         if exception:
-            logging.error(f"{message}: {type(exception).__name__}: {str(exception)}", exc_info=True)
+            logging.error(f"{message}: {type(exception).__name__}: {str(exception)}", exc_info=exception)
         else:
             logging.error(message)
     
     def log_critical(self, message, exception=None):
         """Critical seviyesinde log"""
         if exception:
-            logging.critical(f"{message}: {type(exception).__name__}: {str(exception)}", exc_info=True)
+            logging.critical(f"{message}: {type(exception).__name__}: {str(exception)}", exc_info=exception)
         else:
             logging.critical(message)
     
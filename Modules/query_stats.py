@@ -0,0 +1,236 @@
+# Modules/query_stats.py
+import functools
+import sqlite3
+import threading
+import time
+import types
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from Modules.dwell_analytics import QuantileSketch
+from Modules.logger import logger
+
+# Histogram kova üst sınırları (ms); son kova bunların üstü
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+LATENCY_LABELS = tuple(f"≤{bound:g} ms" for bound in LATENCY_BUCKETS_MS) + (f">{LATENCY_BUCKETS_MS[-1]:g} ms",)
+
+DEFAULT_SLOW_QUERY_MS = 200
+SLOW_QUERY_HISTORY = 100
+# EXPLAIN QUERY PLAN yalnızca bu komutlarla başlayan ifadeler için alınır
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+_local = threading.local()
+
+class MethodStats:
+    """Tek bir Database metodunun süre ve satır istatistikleri"""
+
+    def __init__(self):
+        self.sketch = QuantileSketch()
+        self.histogram = [0] * len(LATENCY_LABELS)
+        self.rows = 0
+        self.slow = 0
+
+    def add(self, elapsed_ms, rows):
+        self.sketch.add(elapsed_ms)
+        self.histogram[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        if rows:
+            self.rows += rows
+
+    def summary(self):
+        sketch = self.sketch
+        return {
+            'count': sketch.count, 'total_ms': sketch.total, 'mean_ms': sketch.mean, 'max_ms': sketch.max,
+            'p50_ms': sketch.quantile(0.50), 'p95_ms': sketch.quantile(0.95), 'p99_ms': sketch.quantile(0.99),
+            'rows': self.rows, 'slow': self.slow, 'histogram': list(zip(LATENCY_LABELS, self.histogram)),
+        }
+
+class QueryStats:
+    """Süreç genelindeki sorgu istatistikleri (iş parçacığı güvenli)"""
+
+    def __init__(self):
+        self.slow_query_ms = DEFAULT_SLOW_QUERY_MS
+        self.trace_sql = False
+        self._methods = {}
+        self._slow_queries = deque(maxlen=SLOW_QUERY_HISTORY)
+        self._lock = threading.Lock()
+        self.started_at = datetime.now()
+
+    def configure(self, settings):
+        """Ayarlardaki yavaş sorgu eşiğini ve SQL izleme (hata ayıklama) modunu uygular"""
+        self.slow_query_ms = settings.get("slow_query_ms", DEFAULT_SLOW_QUERY_MS)
+        self.trace_sql = settings.get("query_debug", False)
+
+    def attach(self, conn):
+        """Yeni açılan bağlantıya hata ayıklama modunda SQL izleme geri çağrısını bağlar"""
+        if self.trace_sql:
+            conn.set_trace_callback(lambda sql: logger.log_debug(f"SQL: {sql}"))
+
+    def record(self, method, elapsed_ms, rows, statements, conn):
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = MethodStats()
+            stats.add(elapsed_ms, rows)
+            is_slow = self.slow_query_ms > 0 and elapsed_ms >= self.slow_query_ms
+            if is_slow:
+                stats.slow += 1
+        if is_slow:
+            self._log_slow_query(method, elapsed_ms, rows, statements, conn)
+
+    def _log_slow_query(self, method, elapsed_ms, rows, statements, conn):
+        # Metodun en uzun süren ifadesi sorumlu kabul edilir
+        sql, params, statement_ms = max(statements, key=lambda statement: statement[2]) if statements else (None, None, None)
+        plan = explain_query_plan(conn, sql, params) if sql else None
+        entry = {
+            'time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 'method': method, 'elapsed_ms': elapsed_ms,
+            'rows': rows, 'sql': sql, 'params': repr(params)[:200] if params is not None else None,
+            'statement_ms': statement_ms, 'plan': plan,
+        }
+        with self._lock:
+            self._slow_queries.append(entry)
+        message = f"Yavaş sorgu: {method} {elapsed_ms:.0f} ms"
+        if rows is not None:
+            message += f", {rows} satır"
+        if sql:
+            message += f"\n  SQL: {' '.join(sql.split())}\n  Parametreler: {entry['params']}"
+        if plan:
+            message += "\n  Plan:\n" + "\n".join(f"    {line}" for line in plan)
+        logger.log_warning(message)
+
+    def snapshot(self):
+        """Metot adı -> özet sözlüğü (toplam süreye göre azalan sırada)"""
+        with self._lock:
+            summaries = {name: stats.summary() for name, stats in self._methods.items()}
+        return dict(sorted(summaries.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+
+    def slow_queries(self):
+        """Son yavaş sorgular (en yenisi sonda)"""
+        with self._lock:
+            return list(self._slow_queries)
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+            self._slow_queries.clear()
+            self.started_at = datetime.now()
+
+query_stats = QueryStats()
+
+def explain_query_plan(conn, sql, params=None):
+    """İfadenin sorgu planını girintili satırlar olarak döndürür; açıklanamıyorsa None"""
+    if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    try:
+        # Düz imleç: plan sorgusunun kendisi ölçülmez
+        cursor = conn.cursor(sqlite3.Cursor)
+        rows = cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params or ()).fetchall()
+    except sqlite3.Error as e:
+        return [f"(plan alınamadı: {e})"]
+    depths, lines = {0: -1}, []
+    for node_id, parent, _, detail in rows:
+        depths[node_id] = depths.get(parent, -1) + 1
+        lines.append("  " * depths[node_id] + detail)
+    return lines
+
+class TimedCursor(sqlite3.Cursor):
+    """Çalıştırılan her ifadeyi süresiyle birlikte o anki timed_query çağrısına kaydeder"""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _note_statement(sql, parameters, started)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _note_statement(sql, None, started)
+
+    def executescript(self, sql_script):
+        started = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            _note_statement(sql_script, None, started)
+
+class TimedConnection(sqlite3.Connection):
+    """Varsayılan imleci TimedCursor olan bağlantı"""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # sqlite3.Connection.execute* imleci C tarafında açar, cursor() ve TimedCursor'u atlar
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+def _note_statement(sql, parameters, started):
+    statements = getattr(_local, "statements", None)
+    if statements is not None:
+        statements.append((sql, parameters, (time.perf_counter() - started) * 1000))
+
+def _row_count(result):
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple):
+        return 1
+    return 0 if result is None else None
+
+def timed_query(method):
+    """Database metodunun süresini ve döndürdüğü satır sayısını query_stats'a işler"""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        outer = getattr(_local, "statements", None)
+        statements = _local.statements = []
+        started = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            _local.statements = outer
+            if outer is not None:
+                outer.extend(statements)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if isinstance(result, types.GeneratorType):
+            # Akış döndüren metotlarda satırlar tüketilirken okunur; ölçüm akış bitince (veya kapatılınca) yazılır
+            return _timed_stream(name, result, elapsed_ms, statements, self.conn)
+        query_stats.record(name, elapsed_ms, _row_count(result), statements, self.conn)
+        return result
+    return wrapper
+
+def _timed_stream(name, rows, elapsed_ms, statements, conn):
+    """Akıştaki satırları sayar; yalnızca satır okunurken geçen süreyi (tüketicinin işi hariç) ölçüme ekler"""
+    count = 0
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                row = next(rows)
+            except StopIteration:
+                break
+            finally:
+                elapsed_ms += (time.perf_counter() - started) * 1000
+            count += 1
+            yield row
+    finally:
+        rows.close()
+        query_stats.record(name, elapsed_ms, count, statements, conn)
+
+def format_query_stats(snapshot, top=None):
+    """snapshot() çıktısını komut satırı ve günlük için metin tablosuna çevirir"""
+    def ms(value):
+        return f"{value:.2f}" if value is not None else "-"
+    lines = [f"{'Metot':<32} {'Çağrı':>7} {'Toplam ms':>10} {'Ort.':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'En çok':>8} {'Satır':>9} {'Yavaş':>6}"]
+    for name, stats in list(snapshot.items())[:top]:
+        lines.append(f"{name:<32} {stats['count']:>7} {stats['total_ms']:>10.1f} {ms(stats['mean_ms']):>8} {ms(stats['p50_ms']):>8} "
+                     f"{ms(stats['p95_ms']):>8} {ms(stats['p99_ms']):>8} {ms(stats['max_ms']):>8} {stats['rows']:>9} {stats['slow']:>6}")
+    return "\n".join(lines)
@@ -0,0 +1,31 @@
+# Modules/replication.py
+from Modules.logger import logger
+
+def pull_operations(target, source, batch_size=1000):
+    """source'taki yeni işlemleri target'a uygular; (aktarılan, yeni uygulanan) işlem sayısını döndürür"""
+    source_id, target_id = source.get_replica_id(), target.get_replica_id()
+    if source_id == target_id:
+        raise ValueError(f"İki veritabanının replika kimliği aynı ({source_id}); kopyalanan dosyada "
+                         "'python -m Modules.cli sync --new-replica-id' çalıştırın")
+    if source.get_base_id() != target.get_base_id():
+        # Ayrı kurulmuş veritabanları: günlük öncesi kayıtlar id ile eşleştirilemez, tam kayıt olarak gönderilir
+        source.publish_legacy_records()
+    since = target.get_sync_watermark(source_id)
+    transferred = applied = 0
+    while True:
+        operations = source.get_operations_since(since, target_id, batch_size)
+        if not operations:
+            break
+        applied += target.apply_operations(source_id, operations)
+        transferred += len(operations)
+        since = operations[-1][0]
+        if len(operations) < batch_size:
+            break
+    return transferred, applied
+
+def synchronize(local, peer, batch_size=1000):
+    """İki yönlü eşitleme; her iki taraf da diğerinin bütün işlemlerini aldığında veriler aynıdır"""
+    pushed = pull_operations(peer, local, batch_size)
+    pulled = pull_operations(local, peer, batch_size)
+    logger.log_info(f"Eşitleme tamamlandı: {pulled[1]} işlem alındı, {pushed[1]} işlem gönderildi")
+    return {'pulled': pulled[1], 'pushed': pushed[1], 'transferred': pulled[0] + pushed[0]}
@@ -0,0 +1,84 @@
+# Modules/report_cache.py
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from Modules.logger import logger
+
+class ReportCache:
+    """Rapor sonuçları için (başlangıç, bitiş, veri sürümü) anahtarlı LRU önbellek"""
+
+    def __init__(self, max_entries=12):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rapor")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def lookup(self, start_date, end_date, version):
+        """(veri, güncel_mi) döndürür. Güncel sonuç yoksa aynı aralığın en son sonucu döner."""
+        key = (start_date, end_date, version)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key], True
+            for (start, end, _), data in reversed(self._entries.items()):
+                if (start, end) == (start_date, end_date):
+                    self.stale_hits += 1
+                    return data, False
+            self.misses += 1
+            return None, False
+
+    def is_fresh(self, start_date, end_date, version):
+        with self._lock:
+            return (start_date, end_date, version) in self._entries
+
+    def put(self, start_date, end_date, version, data):
+        with self._lock:
+            # Aynı aralığın eski sürümleri artık işe yaramaz
+            for key in [k for k in self._entries if k[:2] == (start_date, end_date) and k[2] != version]:
+                del self._entries[key]
+            self._entries[(start_date, end_date, version)] = data
+            self._entries.move_to_end((start_date, end_date, version))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh(self, start_date, end_date, version, compute):
+        """compute(start, end) fonksiyonunu arka planda çalıştırır; çalışan hesaplama varsa onun Future'ı döner"""
+        key = (start_date, end_date, version)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._compute_and_store, key, compute)
+            self._pending[key] = future
+            return future
+
+    def _compute_and_store(self, key, compute):
+        try:
+            data = compute(key[0], key[1])
+            self.put(*key, data)
+            return data
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """Önbellek isabet istatistiklerini döndürür"""
+        with self._lock:
+            total = self.hits + self.stale_hits + self.misses
+            return {
+                'entries': len(self._entries), 'hits': self.hits, 'stale_hits': self.stale_hits,
+                'misses': self.misses, 'hit_rate': (self.hits / total) if total else 0.0
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.log_info("Rapor önbelleği kapatıldı")
@@ -0,0 +1,74 @@
+# Modules/report_engine.py
+import sqlite3
+
+# 3.35 öncesi SQLite MATERIALIZED ipucunu tanımıyor; orada sorgu yine çalışır ama aralık metrik başına okunabilir
+_MATERIALIZED = "MATERIALIZED " if sqlite3.sqlite_version_info >= (3, 35, 0) else ""
+
+# Metriklerin kullanabileceği sütunlar ve vehicles tablosundaki karşılıkları
+RANGE_COLUMNS = {
+    "day": "substr(entryDate, 1, 10)",
+    "hour": "substr(entryDate, 12, 2)",
+    "entryDate": "entryDate",
+    "exitDate": "exitDate",
+    "plaka": "plaka",
+    "surucu": "surucu",
+    "gelinenFirma": "gelinenFirma",
+}
+
+class Metric:
+    """Aralık tablosu üzerinde (anahtar, değer) satırları döndüren bir metrik"""
+
+    def __init__(self, sql, columns, finalize=None):
+        self.sql = sql
+        self.columns = columns
+        self.finalize = finalize or (lambda rows: rows)
+
+def _sorted_by_key(rows):
+    return sorted(rows)
+
+def _top_rows(rows):
+    return sorted(rows, key=lambda row: (-row[1], row[0]))
+
+def _scalar(rows):
+    return rows[0][1] if rows else None
+
+def top_n(column, limit=10):
+    """Aralıkta en sık geçen ilk N değer (boş değerler hariç)"""
+    return Metric(f"SELECT {column}, COUNT(*) FROM r WHERE {column} != '' GROUP BY 1 ORDER BY 2 DESC LIMIT {int(limit)}",
+                  (column,), _top_rows)
+
+METRICS = {
+    'entry_data': Metric("SELECT day, COUNT(*) FROM r GROUP BY 1", ("day",), _sorted_by_key),
+    'top_firms': top_n("gelinenFirma"),
+    'top_drivers': top_n("surucu"),
+    'top_vehicles': top_n("plaka"),
+    'unique_vehicles': Metric("SELECT NULL, COUNT(DISTINCT plaka) FROM r", ("plaka",), _scalar),
+    'average_dwell_minutes': Metric("SELECT NULL, AVG((julianday(exitDate) - julianday(entryDate)) * 1440) FROM r WHERE exitDate IS NOT NULL",
+                                    ("entryDate", "exitDate"), _scalar),
+    'hourly_distribution': Metric("SELECT hour, COUNT(*) FROM r GROUP BY 1", ("hour",), _sorted_by_key),
+}
+
+DEFAULT_METRICS = ('entry_data', 'top_firms', 'top_drivers', 'top_vehicles')
+
+def register_metric(name, metric):
+    """Motora yeni bir metrik ekler"""
+    METRICS[name] = metric
+
+def build_query(metric_names):
+    """İstenen metrikler için tek SQL ifadesini oluşturur"""
+    metrics = [(name, METRICS[name]) for name in metric_names]
+    columns = sorted({column for _, metric in metrics for column in metric.columns})
+    select_list = ", ".join(f"{RANGE_COLUMNS[column]} AS {column}" for column in columns)
+    range_cte = (f"WITH r AS {_MATERIALIZED}(SELECT {select_list} FROM vehicles "
+                 "WHERE entryDate >= ? AND entryDate < date(?, '+1 day'))")
+    parts = [f"SELECT '{name}', * FROM ({metric.sql})" for name, metric in metrics]
+    return range_cte + "\n" + "\nUNION ALL ".join(parts)
+
+def aggregate_report(cursor, start_date, end_date, metric_names=DEFAULT_METRICS):
+    """Aralığı bir kez okuyarak istenen tüm metrikleri hesaplar"""
+    metric_names = tuple(metric_names)
+    rows_by_metric = {name: [] for name in metric_names}
+    cursor.execute(build_query(metric_names), (start_date, end_date))
+    for name, key, value in cursor:
+        rows_by_metric[name].append((key, value))
+    return {name: METRICS[name].finalize(rows) for name, rows in rows_by_metric.items()}
@@ -0,0 +1,144 @@
+# Modules/report_jobs.py
+import itertools
+import os
+import queue
+import threading
+from Modules.logger import logger
+
+# İş durumları
+QUEUED, RUNNING, DONE, CANCELLED, FAILED = "Sırada", "Çalışıyor", "Tamamlandı", "İptal edildi", "Hata"
+
+def _run_job(job_id, db_path, spec, output_format, file_path, messages, cancel_event):
+    """Havuz sürecinde çalışır: anlık kopyayı alır, dışa aktarır, kopyayı siler"""
+    import tempfile
+    from database import Database
+    from Modules.exporters import export_to_file
+    from Modules.sync_client import RemoteDatabase, is_remote_location
+    messages.put(('started', job_id))
+    handle, snapshot_path = tempfile.mkstemp(prefix="rapor_kopya_", suffix=".db")
+    os.close(handle)
+    try:
+        if is_remote_location(db_path):
+            # İstemci modu: kopya sunucudan indirilir
+            from Modules.helpers import load_settings
+            RemoteDatabase(db_path, load_settings().get("sync_token")).download_snapshot(snapshot_path)
+        else:
+            Database.create_snapshot(db_path, snapshot_path)
+        return export_to_file(snapshot_path, spec, output_format, file_path,
+                              progress=lambda written, total: messages.put(('progress', job_id, written, total)),
+                              cancel_event=cancel_event)
+    finally:
+        try:
+            os.remove(snapshot_path)
+        except OSError:
+            pass
+
+class ReportJob:
+    """Kuyruktaki tek bir dışa aktarım işi"""
+
+    def __init__(self, job_id, title, output_format, file_path):
+        self.id = job_id
+        self.title = title
+        self.output_format = output_format
+        self.file_path = file_path
+        self.status = QUEUED
+        self.written, self.total = 0, None
+        self.result, self.error = None, None
+        self.future = None
+        self.cancel_event = None
+
+    @property
+    def done(self):
+        return self.status in (DONE, CANCELLED, FAILED)
+
+class ReportJobQueue:
+    """Rapor işlerini ProcessPoolExecutor'da ('spawn' bağlamı) çalıştırır"""
+
+    def __init__(self, max_workers=2):
+        self.max_workers = max_workers
+        self.jobs = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._context = None
+        self._executor = None
+        self._manager = None
+        self._messages = None
+
+    def _ensure_started(self):
+        if self._executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            self._context = multiprocessing.get_context("spawn")
+            self._manager = self._context.Manager()
+            self._messages = self._manager.Queue()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._context)
+            logger.log_info(f"Rapor iş havuzu başlatıldı ({self.max_workers} süreç)")
+
+    def submit(self, db_path, spec, output_format, file_path, title):
+        """Yeni bir dışa aktarım işini kuyruğa ekler ve ReportJob nesnesini döndürür"""
+        with self._lock:
+            self._ensure_started()
+            job = ReportJob(next(self._ids), title, output_format, file_path)
+            job.cancel_event = self._manager.Event()
+            job.future = self._executor.submit(_run_job, job.id, db_path, spec, output_format, file_path,
+                                               self._messages, job.cancel_event)
+            self.jobs.append(job)
+        job.future.add_done_callback(lambda future, job=job: self._finish(job, future))
+        logger.log_info(f"Rapor işi kuyruğa eklendi: #{job.id} {title} -> {file_path}")
+        return job
+
+    def _finish(self, job, future):
+        from Modules.exporters import ExportCancelled
+        if future.cancelled():
+            job.status = CANCELLED
+            return
+        error = future.exception()
+        if error is None:
+            job.result = job.written = future.result()
+            job.status = DONE
+        elif isinstance(error, ExportCancelled):
+            job.status = CANCELLED
+        else:
+            job.error, job.status = error, FAILED
+            logger.log_error(f"Rapor işi #{job.id} başarısız", error)
+
+    def poll(self):
+        """Süreçlerden gelen ilerleme mesajlarını işler; arayüz periyodik olarak çağırır"""
+        if self._messages is None:
+            return
+        jobs = {job.id: job for job in self.jobs}
+        while True:
+            try:
+                message = self._messages.get_nowait()
+            except (queue.Empty, OSError, EOFError):
+                return
+            job = jobs.get(message[1])
+            if job is None or job.done:
+                continue
+            if message[0] == 'started':
+                job.status = RUNNING
+            elif message[0] == 'progress':
+                job.written, job.total = message[2], message[3]
+
+    def cancel(self, job):
+        """Sıradaki iş hemen düşer; çalışan iş bir sonraki parçada durur"""
+        if job.done:
+            return
+        if not job.future.cancel():
+            job.cancel_event.set()
+
+    def active_jobs(self):
+        return [job for job in self.jobs if not job.done]
+
+    def clear_finished(self):
+        with self._lock:
+            self.jobs = [job for job in self.jobs if not job.done]
+
+    def shutdown(self):
+        if self._executor is None:
+            return
+        for job in self.active_jobs():
+            self.cancel(job)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._manager.shutdown()
+        logger.log_info("Rapor iş havuzu kapatıldı")
@@ -0,0 +1,90 @@
+# Modules/report_rows.py
+from itertools import islice
+
+# Görünen sütun adı -> database.REPORT_SELECT anahtarı
+REPORT_COLUMNS = {
+    "Giriş Tarihi": "entryDate", "Plaka": "plaka", "Dorse Plaka": "dorsePlaka", "Sürücü": "surucu",
+    "Telefon": "telefon", "Sürücü Firması": "surucuFirma", "Gelinen Firma": "gelinenFirma",
+    "Çıkış Tarihi": "exitDate", "Notlar": "notes", "Bekleme Süresi": "calculated_wait_time"
+}
+
+# Arayüzdeki eşleşme seçenekleri -> fetch_custom_report_data match_mode
+MATCH_MODES = {"İçerir": "contains", "İle Başlar": "prefix", "Tam Eşleşme": "exact"}
+
+# Biçimlendirmenin bir seferde uygulandığı satır sayısı
+FORMAT_CHUNK_SIZE = 5000
+
+def format_report_date(value):
+    """'YYYY-AA-GG SS:DD' -> 'GG.AA.YYYY SS:DD'; beklenmeyen biçimler olduğu gibi bırakılır"""
+    if value and len(value) >= 16 and value[4] == '-' and value[7] == '-':
+        return f"{value[8:10]}.{value[5:7]}.{value[0:4]} {value[11:16]}"
+    return value
+
+def format_date_column(values):
+    """format_report_date'in sütun karşılığı"""
+    import numpy as np
+    count = len(values)
+    chars = np.array([value if isinstance(value, str) else "" for value in values], dtype="U16").view("U1").reshape(count, 16)
+    valid = (chars[:, 4] == "-") & (chars[:, 7] == "-") & (chars[:, 15] != "")
+    out = np.empty((count, 16), dtype="U1")
+    out[:, 0:2], out[:, 2], out[:, 3:5], out[:, 5] = chars[:, 8:10], ".", chars[:, 5:7], "."
+    out[:, 6:10], out[:, 10], out[:, 11:16] = chars[:, 0:4], " ", chars[:, 11:16]
+    result = out.view("U16").ravel().tolist()
+    for index in np.flatnonzero(~valid).tolist():
+        result[index] = values[index]
+    return result
+
+_HOUR_TEXT = [f"{hours} sa " if hours else "" for hours in range(24)]
+_MINUTE_TEXT = [f"{minutes} dk" if minutes else "" for minutes in range(60)]
+
+def format_duration_column(values):
+    """format_duration'ın sütun karşılığı: gün/saat/dakika bileşenleri tüm sütun için bir kerede hesaplanır"""
+    import numpy as np
+    seconds = np.array(values, dtype=float)
+    missing = np.isnan(seconds)
+    seconds = np.where(missing, 0, seconds).astype(np.int64)
+    days, remainder = np.divmod(seconds, 86400)
+    hours, remainder = np.divmod(remainder, 3600)
+    minutes = remainder // 60
+    # Gün metni yalnızca farklı gün değerleri için üretilir
+    unique_days, day_index = np.unique(days, return_inverse=True)
+    day_text = np.array([f"{day} gün " if day > 0 else "" for day in unique_days.tolist()], dtype=object)[day_index]
+    text = day_text + np.array(_HOUR_TEXT, dtype=object)[hours] + np.array(_MINUTE_TEXT, dtype=object)[minutes]
+    text = np.char.rstrip(text.astype(str))
+    text = np.where(text == "", "0 dk", text)
+    return np.where(missing, "-", text).tolist()
+
+def _column_formatters(column_keys):
+    formatters = []
+    for key in column_keys:
+        if key in ("entryDate", "exitDate"):
+            formatters.append(format_date_column)
+        elif key == "calculated_wait_time":
+            formatters.append(format_duration_column)
+        else:
+            formatters.append(None)
+    return formatters
+
+def format_report_chunk(rows, column_keys):
+    """Bir satır parçasını sütunlara ayırıp her sütunu tek seferde biçimlendirir"""
+    if not rows:
+        return []
+    columns = list(zip(*rows))
+    for index, formatter in enumerate(_column_formatters(column_keys)):
+        if formatter:
+            columns[index] = formatter(columns[index])
+    return list(zip(*columns))
+
+def format_report_rows(rows, column_keys, chunk_size=FORMAT_CHUNK_SIZE):
+    """Ham satırları (sütun sırası column_keys) parça parça biçimlendirerek akış halinde döndürür"""
+    try:
+        iterator = iter(rows)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            yield from format_report_chunk(chunk, column_keys)
+    finally:
+        # Kaynak bir imleç akışıysa bağlantı kapanmadan önce onu da kapat
+        if hasattr(rows, "close"):
+            rows.close()
@@ -2,7 +2,7 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
 from Modules.custom_windows import CustomMessageBox
-from Modules.helpers import save_settings, manual_cleanup_logs
+from Modules.helpers import save_settings, manual_cleanup_logs, get_backup_dir
 from Modules.logger import logger
 from datetime import datetime, timedelta
 
@@ -26,6 +26,7 @@ class SettingsWindow(tk.Toplevel):
         self.gunluk_temizleme_var = tk.StringVar(value=self.settings.get('gunluk_temizleme', '30 Gün'))
         self.hata_temizleme_var = tk.StringVar(value=self.settings.get('hata_temizleme', '30 Gün'))
         self.compress_backup_var = tk.BooleanVar(value=self.settings.get('enable_backup_compression', True))
+        self.json_log_var = tk.BooleanVar(value=self.settings.get('log_format', 'text') == 'json')
         self.archive_period_var = tk.StringVar(value="1 Yıllık Arşiv") # <-- Önceki haline geri getirildi
 
         main_container = ttk.Frame(self, padding="10")
@@ -100,6 +101,10 @@ class SettingsWindow(tk.Toplevel):
         for option in ["1 Gün", "7 Gün", "30 Gün"]:
             ttk.Radiobutton(hata_frame, text=option, variable=self.hata_temizleme_var, value=option).pack(anchor='w', padx=5)
         
+        format_frame = ttk.LabelFrame(tab, text="Kayıt Biçimi", padding=10)
+        format_frame.pack(fill='x', pady=(0, 10))
+        ttk.Checkbutton(format_frame, text="Kayıtları JSON satırları olarak yaz (program yeniden başlatılınca)", variable=self.json_log_var).pack(anchor='w', padx=5)
+        
         temizleme_frame = ttk.LabelFrame(tab, text="Manuel Temizleme", padding=10)
         temizleme_frame.pack(fill='x', pady=10)
         ttk.Button(temizleme_frame, text="Tüm Eski Logları Temizle", command=self._manual_cleanup, style="Accent.TButton").pack(pady=5)
@@ -155,7 +160,7 @@ class SettingsWindow(tk.Toplevel):
         ttk.Button(btn_frame, text="İptal", command=self.destroy).pack(side='right', padx=10)
 
     def _select_backup_path(self):
-        path = filedialog.askdirectory(title="Yedekleme Klasörünü Seçin", initialdir=self.backup_path_var.get())
+        path = filedialog.askdirectory(title="Yedekleme Klasörünü Seçin", initialdir=get_backup_dir({'backup_path': self.backup_path_var.get()}))
         if path: self.backup_path_var.set(path)
 
     def _manual_cleanup(self):
@@ -214,6 +219,7 @@ class SettingsWindow(tk.Toplevel):
         self.settings['gunluk_temizleme'] = self.gunluk_temizleme_var.get()
         self.settings['hata_temizleme'] = self.hata_temizleme_var.get()
         self.settings['enable_backup_compression'] = self.compress_backup_var.get()
+        self.settings['log_format'] = "json" if self.json_log_var.get() else "text"
 
         save_settings(self.settings)
         self.app.settings = self.settings
@@ -0,0 +1,167 @@
+# Modules/sync_client.py
+import json
+import threading
+from urllib.parse import urlsplit
+from Modules.logger import logger
+
+# Okuyucu bağlantı havuzunda çalışan metotlar
+READ_METHODS = frozenset({
+    "check_connection", "fetch_records", "iter_records", "count_records", "search_records", "count_search_records",
+    "get_record_by_id", "get_blacklist", "get_status_counts", "get_entry_data_for_range", "get_top_firms",
+    "get_top_drivers", "get_top_vehicles", "get_report_aggregates", "iter_dwell_times", "fetch_custom_report_data",
+    "count_custom_report_data", "get_long_stays", "get_oldest_record_date", "get_record_count_before_date",
+    "get_record_count", "is_blacklisted", "get_replica_id", "get_base_id", "get_operations_since", "get_sync_watermark",
+    "find_open_visit", "get_autocomplete_values",
+})
+# Tek yazıcı bağlantısında sırayla çalışan metotlar. get_data_version da burada: sürüm, bütün
+# yazmaları gören yazıcı bağlantısından okunmalı.
+WRITE_METHODS = frozenset({
+    "add_record", "update_record", "delete_record", "checkout_vehicle", "reactivate_vehicle",
+    "add_to_blacklist", "remove_from_blacklist", "fill_missing_sort_keys", "get_data_version", "apply_operations",
+    "checkout_by_plate", "publish_legacy_records",
+})
+# Akış (generator) döndüren metotlar: sunucu listeye çevirir, istemci yeniden yineleyici döndürür
+STREAM_METHODS = frozenset({"iter_records", "iter_dwell_times", "fetch_custom_report_data"})
+# JSON'da listeye dönüşen tek satırlık sonuçlar
+TUPLE_RESULTS = frozenset({"get_record_by_id", "find_open_visit", "get_status_counts", "get_data_version"})
+
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 30
+TOKEN_HEADER = "X-Sync-Token"
+SNAPSHOT_CHUNK = 1024 * 1024
+
+class RemoteError(Exception):
+    """Sunucuda çalışan çağrının hatası (type: sunucudaki istisna türü)"""
+
+    def __init__(self, message, error_type=None):
+        super().__init__(message)
+        self.error_type = error_type
+
+def is_remote_location(location):
+    return isinstance(location, str) and location.startswith(("http://", "https://"))
+
+def _restore_rows(method, value):
+    """JSON'un listeye çevirdiği satırları Database'in döndürdüğü demetlere geri çevirir"""
+    if method in TUPLE_RESULTS:
+        return tuple(value) if isinstance(value, list) else value
+    if isinstance(value, list) and value and isinstance(value[0], list):
+        return [tuple(row) for row in value]
+    return value
+
+class RemoteDatabase:
+    """Sunucudaki veritabanına Database arayüzüyle erişir"""
+    # Yedek dosya adlarında kullanılır (adres dosya adı olarak kullanılamaz)
+    backup_name = "arac_veritabani_sunucu"
+
+    def __init__(self, url, token=None, timeout=DEFAULT_TIMEOUT):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Geçersiz sunucu adresi: {url}")
+        self.db_path = url.rstrip("/")
+        self.token = token or None
+        self.timeout = timeout
+        self._scheme, self._host, self._port = parts.scheme, parts.hostname, parts.port or DEFAULT_PORT
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def open_reader(self, db_path=None):
+        """Arka plan işleri için ayrı bir istemci (Database.open_reader ile aynı kullanım)"""
+        return RemoteDatabase(db_path or self.db_path, self.token, self.timeout)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import http.client
+            connection_class = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+            conn = self._local.conn = connection_class(self._host, self._port, timeout=self.timeout)
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _request(self, method, path, body=None):
+        """İstek gönderir, (durum, yanıt nesnesi) döndürür. Kalıcı bağlantı sunucu tarafından kapatılmışsa bir kez yeniden bağlanır."""
+        import http.client
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+        for attempt in (1, 2):
+            conn = self._connection()
+            reused = conn.sock is not None
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                return conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if attempt == 2 or not reused:
+                    raise
+
+    def call_batch(self, calls):
+        """[(metot, args, kwargs), ...] çağrılarını tek istekte gönderir, sonuçları sırayla döndürür"""
+        payload = {"calls": [{"method": method, "args": list(args), "kwargs": kwargs or {}} for method, args, kwargs in calls]}
+        response = self._request("POST", "/rpc", json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+        data = json.loads(response.read().decode("utf-8"))
+        if response.status != 200:
+            raise RemoteError(data.get("error", f"HTTP {response.status}"), data.get("type"))
+        results = []
+        for (method, _, _), result in zip(calls, data["results"]):
+            if not result["ok"]:
+                raise RemoteError(f"{method}: {result['error']}", result.get("type"))
+            value = _restore_rows(method, result["result"])
+            results.append(iter(value) if method in STREAM_METHODS else value)
+        return results
+
+    def _call(self, method, *args, **kwargs):
+        return self.call_batch([(method, args, kwargs)])[0]
+
+    def __getattr__(self, name):
+        if name in READ_METHODS or name in WRITE_METHODS:
+            return lambda *args, **kwargs: self._call(name, *args, **kwargs)
+        raise AttributeError(f"'{type(self).__name__}' nesnesinde '{name}' yok (sunucu modunda desteklenmiyor)")
+
+    def health(self):
+        response = self._request("GET", "/health")
+        return json.loads(response.read().decode("utf-8"))
+
+    def download_snapshot(self, file_path):
+        """Sunucudaki veritabanının tutarlı bir kopyasını file_path'e indirir"""
+        response = self._request("GET", "/snapshot")
+        if response.status != 200:
+            data = json.loads(response.read().decode("utf-8"))
+            raise RemoteError(data.get("error", f"HTTP {response.status}"), data.get("type"))
+        with open(file_path, "wb") as f:
+            while True:
+                chunk = response.read(SNAPSHOT_CHUNK)
+                if not chunk:
+                    break
+                f.write(chunk)
+        return file_path
+
+    def backup_database(self, backup_path):
+        """Yedek, sunucudan indirilen anlık kopyadır"""
+        import os
+        os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+        return self.download_snapshot(backup_path)
+
+    def cleanup_old_backups(self, backup_dir, retention_days, prefix):
+        from database import Database
+        Database.cleanup_old_backups(self, backup_dir, retention_days, prefix)
+
+    def archive_records_before_date(self, archive_db_path, date_str):
+        raise RemoteError("Arşivleme sunucu modunda istemciden yapılamaz; sunucu bilgisayarında komut satırıyla çalıştırın")
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+def open_database(settings, db_path, **options):
+    """Ayarlara göre yerel Database veya sunucuya bağlanan RemoteDatabase açar"""
+    if settings.get("sync_mode") == "client":
+        url = settings.get("sync_server_url") or f"http://127.0.0.1:{DEFAULT_PORT}"
+        logger.log_info(f"Veritabanı sunucusu kullanılıyor: {url}")
+        return RemoteDatabase(url, settings.get("sync_token"))
+    from database import Database
+    return Database(db_path, **options)
@@ -0,0 +1,250 @@
+# Modules/sync_server.py
+import asyncio
+import hmac
+import ipaddress
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from database import Database, SCHEMA_VERSION
+from Modules.logger import logger
+from Modules.sync_client import READ_METHODS, WRITE_METHODS, DEFAULT_PORT, TOKEN_HEADER, SNAPSHOT_CHUNK
+
+DEFAULT_READERS = 4
+# Tek istekte kabul edilen en büyük gövde ve en fazla çağrı sayısı
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_BATCH_CALLS = 500
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+def is_loopback_host(host):
+    """Dinleme adresine yalnızca bu bilgisayardan erişilebiliyor mu (localhost, 127.x.x.x, ::1)"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def require_token_for_host(host, token):
+    """Ağa açık adreste erişim anahtarsız dinlemeyi reddeder; anahtarı (boşsa None) döndürür"""
+    token = token or None
+    if token is None and not is_loopback_host(host):
+        raise ValueError(f"{host} adresi ağa açık; erişim anahtarı (--token veya ayarlar) olmadan dinlenemez")
+    return token
+
+def token_matches(headers, token):
+    """İstekteki erişim anahtarını sabit sürede karşılaştırır; anahtar yoksa (yalnızca yerel adres) herkes kabul edilir"""
+    if token is None:
+        return True
+    received = headers.get(TOKEN_HEADER.lower(), "")
+    return hmac.compare_digest(received.encode("utf-8"), token.encode("utf-8"))
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+async def read_request(reader, writer, max_body=MAX_BODY_BYTES):
+    """Bir HTTP/1.1 isteği okur: (metot, adres, başlıklar, gövde, kalıcı mı); bağlantı kapandıysa None"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > max_body:
+        await write_json(writer, 413, {"error": "İstek çok büyük"}, keep_alive=False)
+        return None
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body, headers.get("connection", "").lower() != "close"
+
+async def write_json(writer, status, payload, keep_alive):
+    data = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+    writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                 f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+    await writer.drain()
+
+def open_wal_writer(db_path):
+    """Sunucuların tek yazıcı bağlantısı: WAL kipinde okumalar yazmaları beklemez"""
+    db = Database(db_path)
+    mode = db.conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    db.conn.execute("PRAGMA busy_timeout=5000")
+    logger.log_info(f"Sunucu yazıcı bağlantısı açıldı (günlük modu: {mode})")
+    return db
+
+def _materialize(result):
+    """Akış döndüren metotların sonucunu JSON'a yazılabilir listeye çevirir"""
+    if result is None or isinstance(result, (list, tuple, dict, str, int, float, bool)):
+        return result
+    return list(result)
+
+class SyncServer:
+    """DatabaseService'in kullandığı Database metotlarını ağ üzerinden sunar"""
+
+    def __init__(self, db_path, host="127.0.0.1", port=DEFAULT_PORT, readers=DEFAULT_READERS, token=None):
+        self.db_path = os.path.abspath(db_path)
+        self.host, self.port = host, port
+        self.readers = readers
+        self.token = require_token_for_host(host, token)
+        self._local = threading.local()
+        self._writer_executor = None
+        self._reader_executor = None
+        self._server = None
+        self.requests = 0
+
+    # --- Bağlantılar (her iş parçacığında bir tane) ---
+
+    def _open_writer(self):
+        self._local.db = open_wal_writer(self.db_path)
+
+    def _open_reader(self):
+        self._local.db = Database.open_reader(self.db_path)
+        self._local.db.conn.execute("PRAGMA busy_timeout=5000")
+
+    def _run_calls(self, calls):
+        """Aynı türden ardışık çağrıları bu iş parçacığının bağlantısında sırayla çalıştırır"""
+        db, results = self._local.db, []
+        for call in calls:
+            try:
+                result = _materialize(getattr(db, call["method"])(*call["args"], **call["kwargs"]))
+                results.append({"ok": True, "result": result})
+            except Exception as e:
+                logger.log_error(f"Sunucu çağrısı başarısız: {call['method']}", e)
+                results.append({"ok": False, "error": str(e), "type": type(e).__name__})
+        return results
+
+    def _write_snapshot(self):
+        handle, path = tempfile.mkstemp(prefix="sunucu_kopya_", suffix=".db")
+        os.close(handle)
+        return Database.create_snapshot(self.db_path, path)
+
+    # --- Yaşam döngüsü ---
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sunucu_yazici", initializer=self._open_writer)
+        # Şema ve WAL ayarı okuyucular açılmadan önce yazıcıda yapılsın
+        await loop.run_in_executor(self._writer_executor, lambda: None)
+        self._reader_executor = ThreadPoolExecutor(max_workers=self.readers, thread_name_prefix="sunucu_okuyucu", initializer=self._open_reader)
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.log_info(f"Senkronizasyon sunucusu başlatıldı: http://{self.host}:{self.port} ({self.readers} okuyucu, {self.db_path})")
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+        for executor in (self._reader_executor, self._writer_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        logger.log_info(f"Senkronizasyon sunucusu durduruldu ({self.requests} istek)")
+
+    # --- HTTP ---
+
+    async def _handle_client(self, reader, writer):
+        """Bir istemci bağlantısı; HTTP/1.1 kalıcı bağlantıda istekler sırayla karşılanır"""
+        try:
+            while (request := await read_request(reader, writer)) is not None:
+                method, path, headers, body, keep_alive = request
+                self.requests += 1
+                if method == "GET" and path == "/snapshot" and self._authorized(headers):
+                    await self._send_snapshot(writer, keep_alive)
+                else:
+                    status, payload = await self._dispatch(method, path, headers, body)
+                    await write_json(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _authorized(self, headers):
+        return token_matches(headers, self.token)
+
+    async def _dispatch(self, method, path, headers, body):
+        try:
+            if not self._authorized(headers):
+                raise HttpError(401, "Geçersiz erişim anahtarı")
+            if path == "/health":
+                version = await self._execute_group(self._writer_executor, [{"method": "get_data_version", "args": [], "kwargs": {}}])
+                return 200, {"ok": True, "schema_version": SCHEMA_VERSION, "data_version": version[0].get("result"), "requests": self.requests}
+            if path != "/rpc":
+                raise HttpError(404, f"Bilinmeyen adres: {path}")
+            if method != "POST":
+                raise HttpError(405, "POST bekleniyor")
+            return 200, {"results": await self._run_batch(self._parse_calls(body))}
+        except HttpError as e:
+            return e.status, {"error": str(e), "type": "HttpError"}
+        except Exception as e:
+            logger.log_error("Sunucu isteği işlenemedi", e)
+            return 500, {"error": str(e), "type": type(e).__name__}
+
+    def _parse_calls(self, body):
+        try:
+            calls = json.loads(body.decode("utf-8"))["calls"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise HttpError(400, f"Geçersiz istek gövdesi: {e}")
+        if not isinstance(calls, list) or not 0 < len(calls) <= MAX_BATCH_CALLS:
+            raise HttpError(400, f"Bir istekte 1-{MAX_BATCH_CALLS} çağrı olmalı")
+        for call in calls:
+            if not isinstance(call, dict) or call.get("method") not in READ_METHODS | WRITE_METHODS:
+                raise HttpError(400, f"İzin verilmeyen çağrı: {call.get('method') if isinstance(call, dict) else call}")
+            call.setdefault("args", [])
+            call.setdefault("kwargs", {})
+            if not isinstance(call["args"], list) or not isinstance(call["kwargs"], dict):
+                raise HttpError(400, f"Geçersiz argümanlar: {call['method']}")
+        return calls
+
+    async def _run_batch(self, calls):
+        """Çağrıları sıralarını koruyarak ardışık okuma/yazma gruplarına ayırıp çalıştırır"""
+        results, group, group_is_write = [], [], None
+        for call in calls:
+            is_write = call["method"] in WRITE_METHODS
+            if group and is_write != group_is_write:
+                results += await self._execute_group(self._writer_executor if group_is_write else self._reader_executor, group)
+                group = []
+            group.append(call)
+            group_is_write = is_write
+        results += await self._execute_group(self._writer_executor if group_is_write else self._reader_executor, group)
+        return results
+
+    async def _execute_group(self, executor, calls):
+        return await asyncio.get_running_loop().run_in_executor(executor, self._run_calls, calls)
+
+    async def _send_snapshot(self, writer, keep_alive):
+        loop = asyncio.get_running_loop()
+        path = await loop.run_in_executor(self._reader_executor, self._write_snapshot)
+        try:
+            size = os.path.getsize(path)
+            writer.write(f"HTTP/1.1 200 OK\r\nContent-Type: application/octet-stream\r\nContent-Length: {size}\r\n"
+                         f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1"))
+            with open(path, "rb") as f:
+                while chunk := await loop.run_in_executor(None, f.read, SNAPSHOT_CHUNK):
+                    writer.write(chunk)
+                    await writer.drain()
+        finally:
+            os.remove(path)
+
+def run_server(db_path, host="127.0.0.1", port=DEFAULT_PORT, readers=DEFAULT_READERS, token=None):
+    """Sunucuyu Ctrl+C'ye kadar çalıştırır (komut satırı: python -m Modules.cli serve)"""
+    server = SyncServer(db_path, host, port, readers, token)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,96 @@
+# Modules/ui/autocomplete_popup.py
+import tkinter as tk
+from Modules.logger import logger
+
+# Öneri listesini açmayan tuşlar (gezinme ve seçim)
+_NAVIGATION_KEYS = {"Up", "Down", "Return", "KP_Enter", "Escape", "Tab", "Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R"}
+
+class AutocompletePopup:
+    """Giriş kutusunun altında açılan öneri listesi"""
+
+    def __init__(self, entry, suggest, placeholder=None, rows=8):
+        self.entry = entry
+        self.suggest = suggest
+        self.placeholder = placeholder
+        self.rows = rows
+        self.window = None
+        self.listbox = None
+        entry.bind("<KeyRelease>", self._on_key_release, add="+")
+        entry.bind("<Down>", lambda e: self._move(1))
+        entry.bind("<Up>", lambda e: self._move(-1))
+        entry.bind("<Return>", self._on_return, add="+")
+        entry.bind("<Escape>", lambda e: self.hide(), add="+")
+        # Listeye tıklama odağı kaçırır; kapatma tıklama işlendikten sonra yapılır
+        entry.bind("<FocusOut>", lambda e: entry.after(150, self.hide), add="+")
+
+    def _create_window(self):
+        self.window = tk.Toplevel(self.entry)
+        self.window.wm_overrideredirect(True)
+        self.window.withdraw()
+        self.listbox = tk.Listbox(self.window, height=self.rows, activestyle="none", exportselection=False)
+        self.listbox.pack(fill="both", expand=True)
+        self.listbox.bind("<ButtonRelease-1>", lambda e: self._accept())
+
+    def _on_key_release(self, event):
+        if event.keysym in _NAVIGATION_KEYS:
+            return
+        text = self.entry.get().strip()
+        if not text or text == self.placeholder:
+            self.hide()
+            return
+        try:
+            suggestions = self.suggest(text)
+        except Exception as e:
+            logger.log_error("Otomatik tamamlama hatası", e)
+            suggestions = []
+        # Tam olarak yazılmış tek öneri gösterilmez
+        if not suggestions or suggestions == [text.upper()]:
+            self.hide()
+            return
+        self._show(suggestions)
+
+    def _show(self, suggestions):
+        if self.window is None:
+            self._create_window()
+        self.listbox.delete(0, tk.END)
+        for suggestion in suggestions:
+            self.listbox.insert(tk.END, suggestion)
+        self.listbox.config(height=min(len(suggestions), self.rows))
+        self.window.geometry(f"{self.entry.winfo_width()}x{self.listbox.winfo_reqheight()}"
+                             f"+{self.entry.winfo_rootx()}+{self.entry.winfo_rooty() + self.entry.winfo_height()}")
+        self.window.deiconify()
+        self.window.lift()
+
+    def _visible(self):
+        return self.window is not None and self.window.winfo_viewable()
+
+    def _move(self, step):
+        if not self._visible():
+            return None
+        current = self.listbox.curselection()
+        index = (current[0] + step) if current else (0 if step > 0 else self.listbox.size() - 1)
+        index = max(0, min(index, self.listbox.size() - 1))
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+        return "break"
+
+    def _on_return(self, event):
+        if self._visible() and self.listbox.curselection():
+            self._accept()
+            return "break"
+        self.hide()
+        return None
+
+    def _accept(self):
+        selection = self.listbox.curselection()
+        if selection:
+            self.entry.delete(0, tk.END)
+            self.entry.insert(0, self.listbox.get(selection[0]))
+            self.entry.icursor(tk.END)
+        self.hide()
+        self.entry.focus_set()
+
+    def hide(self):
+        if self.window is not None:
+            self.window.withdraw()
@@ -2,6 +2,7 @@
 import tkinter as tk
 from tkinter import ttk
 from Modules.logger import logger
+from Modules.ui.autocomplete_popup import AutocompletePopup
 
 def _clear_placeholder(event, widget, placeholder_map):
     """Placeholder temizle"""
@@ -28,7 +29,7 @@ def _add_placeholder(event, widget, placeholder_map):
         # Bu hatayı loglamak çok gürültülü olabilir, şimdilik geçelim
         pass
 
-def create_form_frame(parent, placeholder_map, add_callback, clear_callback):
+def create_form_frame(parent, placeholder_map, add_callback, clear_callback, suggest_callback=None):
     """Form çerçevesi oluştur"""
     try:
         form_frame = ttk.LabelFrame(parent, text="Yeni Araç Girişi", padding=(20, 10))
@@ -55,6 +56,8 @@ def create_form_frame(parent, placeholder_map, add_callback, clear_callback):
             entry.config(foreground='grey')
             entry.bind("<FocusIn>", lambda e, w=entry, p=placeholder_map[key]: (w.delete(0, tk.END), w.config(foreground='black')) if w.get() == p else None)
             entry.bind("<FocusOut>", lambda e, w=entry, p=placeholder_map[key]: (w.insert(0, p), w.config(foreground='grey')) if not w.get() else None)
+            if suggest_callback:
+                AutocompletePopup(entry, lambda text, k=key: suggest_callback(k, text), placeholder_map[key])
 
         # Notlar alanı
         ttk.Label(form_frame, text="Notlar:").grid(row=3, column=0, padx=5, pady=8, sticky="nw")
@@ -137,7 +140,7 @@ def create_filter_frame(parent, years, months, apply_callback, filter_callback,
         logger.log_error("Filtre çerçevesi oluşturma hatası", e)
         raise
 
-def create_actions_frame(parent, edit_callback, delete_callback, checkout_callback, reactivate_callback):
+def create_actions_frame(parent, edit_callback, delete_callback, checkout_callback, reactivate_callback, plate_checkout_callback):
     """Aksiyon butonları çerçevesi"""
     try:
         actions_frame = ttk.LabelFrame(parent, text="Liste İşlemleri", padding=(10, 10))
@@ -147,6 +150,15 @@ def create_actions_frame(parent, edit_callback, delete_callback, checkout_callba
         left_actions = ttk.Frame(actions_frame)
         left_actions.grid(row=0, column=0, sticky='w')
         
+        # Plakayla hızlı çıkış: listede aramadan, yazılan plakanın açık ziyareti kapatılır
+        plate_checkout = ttk.Frame(actions_frame)
+        plate_checkout.grid(row=0, column=1)
+        ttk.Label(plate_checkout, text="Plakayla Çıkış:").pack(side='left', padx=(0, 5))
+        plate_checkout_entry = ttk.Entry(plate_checkout, width=14)
+        plate_checkout_entry.pack(side='left', padx=5)
+        plate_checkout_entry.bind("<Return>", lambda e: plate_checkout_callback())
+        ttk.Button(plate_checkout, text="Çıkış Ver", command=plate_checkout_callback).pack(side='left', padx=5)
+        
         right_actions = ttk.Frame(actions_frame)
         right_actions.grid(row=0, column=2, sticky='e')
         
@@ -170,7 +182,8 @@ def create_actions_frame(parent, edit_callback, delete_callback, checkout_callba
             'edit_button': edit_button,
             'delete_button': delete_button,
             'checkout_button': checkout_button,
-            'reactivate_button': reactivate_button
+            'reactivate_button': reactivate_button,
+            'plate_checkout_entry': plate_checkout_entry
         }
         
     except Exception as e:
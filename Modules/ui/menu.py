@@ -15,6 +15,7 @@ def create_main_menu(root, commands):
         file_menu.add_separator()
         file_menu.add_command(label="Excel'e Aktar", command=commands['export_excel'])
         file_menu.add_command(label="Özel Rapor Oluştur...", command=commands['custom_report'])
+        file_menu.add_command(label="Rapor İşleri", command=commands['report_jobs'])
         file_menu.add_separator()
         file_menu.add_command(label="Kara Liste Yönetimi", command=commands['blacklist'])
         file_menu.add_separator()
@@ -30,6 +31,7 @@ def create_main_menu(root, commands):
         about_menu = tk.Menu(menu_bar, tearoff=0)
         menu_bar.add_cascade(label="Hakkında", menu=about_menu)
         about_menu.add_command(label="Hata Kayıtlarını Göster", command=commands['show_errors'])
+        about_menu.add_command(label="Performans", command=commands['performance'])
         about_menu.add_command(label="Program Hakkında", command=commands['about'])
         
         logger.log_info("Ana menü oluşturuldu")
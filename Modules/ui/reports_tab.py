@@ -4,6 +4,7 @@ from tkinter import ttk
 from datetime import datetime
 import calendar
 from Modules.logger import logger
+from Modules.helpers import format_duration
 
 def create_reports_tab(parent, update_callback):
     """Raporlar sekmesi oluşturur."""
@@ -30,6 +31,9 @@ def create_reports_tab(parent, update_callback):
         ttk.Button(options_frame, text="Rapor Oluştur", 
                   command=update_callback, style="Accent.TButton").pack(side='left', padx=10)
         
+        refresh_label = ttk.Label(options_frame, text="", foreground="gray")
+        refresh_label.pack(side='left', padx=10)
+        
         canvas = tk.Canvas(reports_main_frame)
         scrollbar = ttk.Scrollbar(reports_main_frame, orient="vertical", command=canvas.yview)
         scrollable_frame = ttk.Frame(canvas)
@@ -46,7 +50,10 @@ def create_reports_tab(parent, update_callback):
             "📊 Genel Bakış": (("Tarih", 150), ("Giriş Sayısı", 100)),
             "🏢 Firma Analizi": (("Sıra", 50), ("Firma", 300), ("Giriş Sayısı", 100)),
             "👤 Sürücü Performansı": (("Sıra", 50), ("Sürücü", 300), ("Giriş Sayısı", 100)),
-            "🚚 Araç Sıklığı": (("Sıra", 50), ("Plaka", 150), ("Giriş Sayısı", 100))
+            "🚚 Araç Sıklığı": (("Sıra", 50), ("Plaka", 150), ("Giriş Sayısı", 100)),
+            "⏱️ Bekleme Süreleri (Firma)": (("Firma", 200), ("Adet", 60), ("Ortalama", 100), ("p50", 90), ("p90", 90), ("p99", 90)),
+            "📈 Bekleme Dağılımı": (("Süre Aralığı", 150), ("Araç Sayısı", 100)),
+            "🚨 Uzun Süredir İçeride": (("Plaka", 120), ("Sürücü", 160), ("Firma", 160), ("İçeride", 110))
         }
         
         scrollable_frame.columnconfigure(0, weight=1)
@@ -71,6 +78,7 @@ def create_reports_tab(parent, update_callback):
             'start_date_var': start_date_var,
             'end_date_var': end_date_var,
             'report_widgets': report_widgets,
+            'refresh_label': refresh_label,
             'scrollable_frame': scrollable_frame
         }
         
@@ -78,6 +86,20 @@ def create_reports_tab(parent, update_callback):
         logger.log_error("Raporlar sekmesi oluşturma hatası", e)
         raise
 
+def _dwell_rows(dwell, limit=15):
+    """Bekleme özetini 'TÜMÜ' satırı ve en çok gelen firmalar şeklinde tabloya çevirir."""
+    def row(name, summary):
+        return (name, summary['count'], format_duration(summary['mean']), format_duration(summary['p50']),
+                format_duration(summary['p90']), format_duration(summary['p99']))
+    if not dwell or not dwell.get('overall', {}).get('count'):
+        return []
+    firms = sorted(dwell.get('by_firm', {}).items(), key=lambda item: -item[1]['count'])[:limit]
+    return [row("TÜMÜ", dwell['overall'])] + [row(firm, summary) for firm, summary in firms]
+
+def set_refresh_indicator(refresh_label, text=""):
+    """Rapor arka planda yenilenirken durum etiketini gösterir/gizler."""
+    refresh_label.config(text=text)
+
 def update_reports_data_on_ui(report_widgets, report_data):
     """Rapor verilerini UI'da günceller."""
     for report_name, tree in report_widgets.items():
@@ -94,7 +116,11 @@ def update_reports_data_on_ui(report_widgets, report_data):
                                  [(datetime.strptime(d, "%Y-%m-%d").strftime("%d.%m.%Y"), c) for d, c in report_data.get('entry_data', [])],
         "🏢 Firma Analizi": lambda: [(i, f, c) for i, (f, c) in enumerate(report_data.get('top_firms', []), 1)],
         "👤 Sürücü Performansı": lambda: [(i, d, c) for i, (d, c) in enumerate(report_data.get('top_drivers', []), 1)],
-        "🚚 Araç Sıklığı": lambda: [(i, v, c) for i, (v, c) in enumerate(report_data.get('top_vehicles', []), 1)]
+        "🚚 Araç Sıklığı": lambda: [(i, v, c) for i, (v, c) in enumerate(report_data.get('top_vehicles', []), 1)],
+        "⏱️ Bekleme Süreleri (Firma)": lambda: _dwell_rows(report_data.get('dwell', {})),
+        "📈 Bekleme Dağılımı": lambda: [row for row in report_data.get('dwell', {}).get('overall', {}).get('histogram', []) if row[1]],
+        "🚨 Uzun Süredir İçeride": lambda: [(plaka, surucu, firma, format_duration(seconds))
+                                          for _, plaka, surucu, firma, _, seconds in report_data.get('long_stays', [])]
     }
     
     for name, func in report_functions.items():
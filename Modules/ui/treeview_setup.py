@@ -4,8 +4,15 @@ from tkinter import ttk
 from Modules.virtualized_treeview import VirtualizedTreeview
 from datetime import datetime
 
-def create_treeview(parent, settings):
-    """Treeview oluşturur."""
+# Sütun başlığı -> veritabanı sıralama anahtarı (database.SORT_COLUMNS)
+TREE_SORT_KEYS = {
+    "Sıra No": "id", "Giriş Tarihi": "entryDate", "Giriş Saati": "entryTime", "Plaka": "plaka",
+    "Dorse Plaka": "dorsePlaka", "Sürücü": "surucu", "Telefon": "telefon", "Sürücü Firması": "surucuFirma",
+    "Gelinen Firma": "gelinenFirma", "Notlar": "notes", "Çıkış Zamanı": "exitDate"
+}
+
+def create_treeview(parent, settings, sort_callback=None):
+    """Treeview oluşturur. Başlığa tıklanınca sort_callback(sütun_adı) çağrılır."""
     page_size = settings.get("page_size", 100)
     
     tree_container = ttk.Frame(parent)
@@ -25,7 +32,10 @@ def create_treeview(parent, settings):
     tree = VirtualizedTreeview(tree_frame, columns=tree_columns, show='headings', page_size=page_size)
     
     for col in tree["columns"]:
-        tree.heading(col, text=col)
+        if sort_callback:
+            tree.heading(col, text=col, command=lambda c=col: sort_callback(c))
+        else:
+            tree.heading(col, text=col)
         tree.column(col, width=120, anchor='center')
     
     tree.column("Sıra No", width=60, stretch=tk.NO)
@@ -45,11 +55,14 @@ def create_treeview(parent, settings):
         'pagination_frame': pagination_frame
     }
 
-def populate_treeview_data(tree, records, status_label, status_filter, date_filter, search_term):
-    """Treeview'ı verilerle doldurur (Standart Mod için)."""
-    for item in tree.get_children():
-        tree.delete(item)
-    
+def update_sort_indicators(tree, sort_column, descending):
+    """Sıralanan sütunun başlığına yön oku ekler."""
+    for col in tree["columns"]:
+        arrow = (" ▼" if descending else " ▲") if col == sort_column else ""
+        tree.heading(col, text=f"{col}{arrow}")
+
+def update_filter_status_label(status_label, status_filter, date_filter, search_term):
+    """Aktif filtre bilgisini etikete yazar."""
     filter_text = ""
     if search_term:
         filter_text = f"Arama: '{search_term}'"
@@ -60,6 +73,13 @@ def populate_treeview_data(tree, records, status_label, status_filter, date_filt
         filter_text = filter_text_map.get(date_filter, "")
     
     status_label.config(text=f"FİLTRE AKTİF: {filter_text}" if filter_text else "")
+
+def populate_treeview_data(tree, records, status_label, status_filter, date_filter, search_term):
+    """Treeview'ı verilerle doldurur (Standart Mod için)."""
+    for item in tree.get_children():
+        tree.delete(item)
+    
+    update_filter_status_label(status_label, status_filter, date_filter, search_term)
     
     for record in records:
         (id, plaka, dorse, surucu, tel, s_firma, g_firma, entry, exit, status, notes) = record
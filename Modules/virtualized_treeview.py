@@ -1,5 +1,4 @@
 # Modules/virtualized_treeview.py
-import tkinter as tk
 from tkinter import ttk
 from Modules.logger import logger
 
@@ -12,28 +11,52 @@ class VirtualizedTreeview(ttk.Treeview):
         self.current_page = 0
         self.total_pages = 0
         self.all_data = []
+        self.total_count = 0
+        self.page_loader = None
         
     def set_data(self, data):
         """Tüm veriyi ayarla ve sayfalara böl"""
         self.all_data = data
-        self.total_pages = (len(data) + self.page_size - 1) // self.page_size if self.page_size > 0 else 1
+        self.page_loader = None
+        self.total_count = len(data)
+        return self._reset_pages()
+    
+    def set_data_source(self, total_count, page_loader, first_page=None):
+        """Her sayfayı page_loader(offset, limit) ile yükler; first_page hazırsa ilk sayfa sorgulanmaz"""
+        self.all_data = []
+        self.page_loader = page_loader
+        self.total_count = total_count
+        return self._reset_pages(first_page)
+    
+    def _reset_pages(self, first_page=None):
+        self.total_pages = (self.total_count + self.page_size - 1) // self.page_size if self.page_size > 0 else 1
         self.current_page = 0
-        self._display_page(0)
+        self._display_page(0, first_page)
         return self.total_pages
+    
+    def _get_page_rows(self, start_idx, end_idx):
+        """Sayfanın satırlarını bellekten veya veri kaynağından getir"""
+        if self.page_loader:
+            try:
+                return self.page_loader(start_idx, end_idx - start_idx)
+            except Exception as e:
+                logger.log_error("Sayfa yükleme hatası", e)
+                return []
+        return self.all_data[start_idx:end_idx]
         
-    def _display_page(self, page_num):
-        """Belirli bir sayfayı göster"""
+    def _display_page(self, page_num, rows=None):
+        """Belirli bir sayfayı göster (rows verilmişse veri kaynağına gidilmez)"""
         self.delete(*self.get_children()) # Önceki verileri temizle
         
-        if not self.all_data:
+        if not self.total_count:
             return
             
         start_idx = page_num * self.page_size
-        end_idx = min(start_idx + self.page_size, len(self.all_data))
+        end_idx = min(start_idx + self.page_size, self.total_count)
         
         # --- DEĞİŞİKLİK BURADA ---
         # Artık her bir kayıt için hem değerleri hem de renk etiketini alıyoruz
-        for record_values, record_tags in self.all_data[start_idx:end_idx]:
+        for record_values, record_tags in (rows if rows is not None else self._get_page_rows(start_idx, end_idx)):
             self.insert("", "end", values=record_values, tags=record_tags)
         # --- DEĞİŞİKLİK BİTTİ ---
             
@@ -55,10 +78,10 @@ class VirtualizedTreeview(ttk.Treeview):
             
     def get_current_page_info(self):
         """Mevcut sayfa bilgisini döndür"""
-        if not self.all_data:
+        if not self.total_count:
             return "0/0 (0 kayıt)"
             
         start_idx = self.current_page * self.page_size + 1
-        end_idx = min((self.current_page + 1) * self.page_size, len(self.all_data))
+        end_idx = min((self.current_page + 1) * self.page_size, self.total_count)
         
-        return f"Sayfa {self.current_page + 1}/{self.total_pages} ({start_idx}-{end_idx} / {len(self.all_data)} kayıt)"
\ No newline at end of file
+        return f"Sayfa {self.current_page + 1}/{self.total_pages} ({start_idx}-{end_idx} / {self.total_count} kayıt)"
\ No newline at end of file
@@ -0,0 +1,84 @@
+# benchmarks/bench_autocomplete.py
+# Kullanım: python -m benchmarks.bench_autocomplete [--plates N] [--names N] [--queries N] [--target ms]
+# Giriş formu otomatik tamamlamasının (Modules.autocomplete) ölçümü. Sentetik geçmiş değerlerle
+# (kullanım sayıları Zipf dağılımlı) plaka ve sürücü dizinleri kurulur; gerçek değerlerden alınan
+# 1-6 karakterlik rastgele öneklerle öneri gecikmesi ölçülür, araya yeni kayıt eklemeleri girer.
+# Bir örneklemde öneriler kaba kuvvet sıralamasıyla karşılaştırılır. p99 hedefi aşarsa veya
+# sonuçlar uyuşmazsa çıkış kodu 1 döner.
+import argparse
+import os
+import random
+import sys
+import time
+
+# Betikler "python -m benchmarks.<ad>" ile depo kökünden çalıştırılır
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Modules.autocomplete import SuggestionIndex, _score
+from Modules.dwell_analytics import QuantileSketch
+from Modules.helpers import plate_key, turkish_sort_key
+
+FIRST_NAMES = ["AHMET", "MEHMET", "MUSTAFA", "ALİ", "HÜSEYİN", "HASAN", "İBRAHİM", "İSMAİL", "ÖMER", "OSMAN", "YUSUF", "MURAT"]
+LAST_NAMES = ["YILMAZ", "KAYA", "DEMİR", "ŞAHİN", "ÇELİK", "YILDIZ", "YILDIRIM", "ÖZTÜRK", "AYDIN", "ÖZDEMİR", "ARSLAN", "DOĞAN"]
+
+def synthetic_rows(rng, values, key_function):
+    """Database.get_autocomplete_values biçiminde satırlar; az sayıda değer çok kullanılır"""
+    now = time.time()
+    rows = []
+    for rank, value in enumerate(values, start=1):
+        count = max(1, int(2000 / rank ** 0.8 * rng.uniform(0.5, 1.5)))
+        rows.append((key_function(value), value, count, int(now - rng.uniform(0, 3 * 365 * 86400))))
+    rng.shuffle(rows)
+    return rows
+
+def brute_force(index, prefix):
+    key = index.key_function(prefix)
+    matches = [item_key for item_key in index._values if item_key.startswith(key)]
+    matches.sort(key=lambda item_key: _score(*index._values[item_key][1:]), reverse=True)
+    return [index._values[item_key][0] for item_key in matches[:index.limit]]
+
+def measure(name, index, values, rng, queries):
+    latency = QuantileSketch()
+    mismatches = 0
+    for query in range(queries):
+        if query % 50 == 0:
+            # Araya yeni kayıt girer: bazen yeni değer, çoğunlukla bilinen değer
+            index.add(rng.choice(values) if rng.random() < 0.7 else f"{rng.randint(1, 81):02d} Y {rng.randint(1, 9999)}")
+        value = rng.choice(values)
+        prefix = value[:rng.randint(1, 6)]
+        started = time.perf_counter()
+        suggestions = index.suggest(prefix)
+        latency.add((time.perf_counter() - started) * 1000)
+        if query % 20 == 0 and suggestions != brute_force(index, prefix):
+            mismatches += 1
+    print(f"  {name}: {len(index)} değer, öneri p50={latency.quantile(0.5):.3f} ms  p99={latency.quantile(0.99):.3f} ms  "
+          f"en fazla={latency.max:.3f} ms")
+    return latency.quantile(0.99), mismatches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Otomatik tamamlama ölçümü")
+    parser.add_argument("--plates", type=int, default=200000)
+    parser.add_argument("--names", type=int, default=30000)
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--target", type=float, default=0.5, help="Beklenen en yüksek p99 öneri gecikmesi (ms)")
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+    plates = list({f"{rng.randint(1, 81):02d} {''.join(rng.choices('ABCDEFGHJKLMNPRSTUVYZ', k=rng.randint(1, 3)))} {rng.randint(10, 9999)}"
+                   for _ in range(args.plates)})
+    names = list({f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.randint(1, args.names)}" for _ in range(args.names)})
+
+    worst, mismatches = 0.0, 0
+    for name, values, key_function in (("plaka", plates, plate_key), ("sürücü", names, turkish_sort_key)):
+        index = SuggestionIndex(key_function)
+        rows = synthetic_rows(rng, values, key_function)
+        started = time.perf_counter()
+        index.build(rows)
+        print(f"{name}: dizin {(time.perf_counter() - started) * 1000:.0f} ms'de kuruldu")
+        p99, wrong = measure(name, index, values, rng, args.queries)
+        worst, mismatches = max(worst, p99), mismatches + wrong
+    print(f"En kötü p99 {worst:.3f} ms (hedef {args.target} ms), kaba kuvvetle uyuşmayan {mismatches}")
+    return 0 if worst <= args.target and not mismatches else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+# benchmarks/bench_database.py
+# Kullanım: python -m benchmarks.bench_database [boyut ...] [-o sonuç.json] [--compare eski.json] [--cache-dir klasör]
+#   boyut: 10k, 100k, 1m, 5m veya sayı (varsayılan: 10k 100k)
+# Veritabanı işlemlerinin benchmark takımı. Her boyut için benchmarks.dataset ile tekrarlanabilir bir
+# veri seti üretilir; okuma sorguları (fetch_records, search_records, get_status_counts, rapor toplamları)
+# ve bakım işlemleri (yedekleme, geri yükleme, arşivleme) ölçülür. Sonuçlar JSON olarak yazılır;
+# --compare ile önceki bir sürümün sonuçlarıyla karşılaştırılır. Bakım işlemleri veri setinin
+# kopyası üzerinde çalışır. --cache-dir verilirse üretilen veri setleri sonraki çalıştırmalar için saklanır.
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from benchmarks.common import best_of
+from benchmarks.dataset import GENERATOR_VERSION, build_database, parse_size
+from database import Database
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Karşılaştırmada bu oranın ve mutlak farkın üzerindeki yavaşlamalar işaretlenir
+# (milisaniye altı ölçümlerde oran tek başına gürültüye çok duyarlı)
+REGRESSION_RATIO, REGRESSION_MIN_SECONDS = 1.2, 0.002
+
+def _repeat_for(rows):
+    """Büyük veri setlerinde okuma ölçümleri daha az tekrarlanır"""
+    return 5 if rows <= 100_000 else 3 if rows <= 1_000_000 else 2
+
+def _timed(func):
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+def _dataset_path(rows, seed, end, cache_dir):
+    if not cache_dir:
+        return os.path.join(tempfile.mkdtemp(prefix="arac_bench_"), "bench.db"), False
+    os.makedirs(cache_dir, exist_ok=True)
+    name = f"veri_v{GENERATOR_VERSION}_{rows}_{seed}_{end:%Y%m%d}.db"
+    return os.path.join(cache_dir, name), True
+
+def prepare_dataset(rows, seed, end, cache_dir=None):
+    """Veri setini üretir (veya önbellekten açar); (Database, üretim süresi sn, önbellekli mi) döndürür"""
+    path, cached = _dataset_path(rows, seed, end, cache_dir)
+    if cached and os.path.exists(path):
+        return Database(path), None, cached
+    seconds, db = _timed(lambda: build_database(path, rows, seed, 365, end))
+    return db, seconds, cached
+
+def read_benchmarks(db, end):
+    """(ad, fonksiyon) listesi. Ay ve arama terimleri veri setinin kendisinden seçilir."""
+    last_month = end - timedelta(days=1)
+    year, month = last_month.year, last_month.month
+    report_end = last_month.strftime("%Y-%m-%d")
+    report_start = (end - timedelta(days=90)).strftime("%Y-%m-%d")
+    frequent_plate = db.conn.execute("SELECT plaka FROM vehicles GROUP BY plaka ORDER BY COUNT(*) DESC LIMIT 1").fetchone()[0]
+    surname = db.conn.execute("SELECT surucu FROM vehicles WHERE id = (SELECT MAX(id) / 2 FROM vehicles)").fetchone()[0].split()[-1]
+    month_count = db.count_records(year, month)
+    return [
+        ("fetch_records_month", lambda: db.fetch_records(year, month)),
+        ("fetch_records_page_first", lambda: db.fetch_records(year, month, order_by="plaka", limit=100)),
+        ("fetch_records_page_last", lambda: db.fetch_records(year, month, order_by="plaka", limit=100, offset=max(0, month_count - 100))),
+        ("fetch_records_inside", lambda: db.fetch_records(None, None, status_filter="inside")),
+        ("count_records_month", lambda: db.count_records(year, month)),
+        ("search_records_plate", lambda: db.search_records(frequent_plate.split()[-1])),
+        ("search_records_surname", lambda: db.search_records(surname)),
+        ("get_status_counts", lambda: db.get_status_counts(year, month)),
+        ("get_report_aggregates_90d", lambda: db.get_report_aggregates(report_start, report_end)),
+        ("get_record_count", db.get_record_count),
+    ]
+
+def maintenance_benchmarks(db, end, work_dir):
+    """Yedekleme, geri yükleme ve arşivlemeyi bir kez ölçer (her biri yıkıcı olabileceğinden kopyada)"""
+    from Modules.backup_manager import create_backup, restore_backup
+    results = {}
+    for compressed in (False, True):
+        settings = {'backup_path': os.path.join(work_dir, "Yedekler"), 'enable_backup_compression': compressed}
+        name = "backup_zip" if compressed else "backup_db"
+        seconds, path = _timed(lambda: create_backup(db, settings, "manual"))
+        results[name] = {'seconds': seconds, 'bytes': os.path.getsize(path)}
+        restore_target = os.path.join(work_dir, "geri_yuklenen.db")
+        seconds, _ = _timed(lambda: restore_backup(path, restore_target))
+        results[name.replace("backup", "restore")] = {'seconds': seconds}
+        os.remove(path)
+
+    copy_path = os.path.join(work_dir, "arsiv_kaynak.db")
+    shutil.copyfile(db.db_path, copy_path)
+    copy = Database(copy_path)
+    cutoff = (end - timedelta(days=180)).strftime("%Y-%m-%d")
+    seconds, count = _timed(lambda: copy.archive_records_before_date(os.path.join(work_dir, "arsiv.db"), cutoff))
+    copy.close()
+    results["archive_180d"] = {'seconds': seconds, 'rows': count}
+    return results
+
+def run_size(rows, seed, end, cache_dir):
+    db, build_seconds, cached = prepare_dataset(rows, seed, end, cache_dir)
+    result = {'rows': rows, 'build_seconds': build_seconds, 'file_bytes': os.path.getsize(db.db_path), 'read': {}, 'maintenance': {}}
+    repeat = _repeat_for(rows)
+    for name, func in read_benchmarks(db, end):
+        returned = func()
+        result['read'][name] = {'seconds': best_of(func, repeat), 'rows': len(returned) if isinstance(returned, list) else None}
+        print(f"  {name:<28} {result['read'][name]['seconds'] * 1000:>10.1f} ms", flush=True)
+    work_dir = tempfile.mkdtemp(prefix="arac_bench_bakim_")
+    try:
+        result['maintenance'] = maintenance_benchmarks(db, end, work_dir)
+        for name, values in result['maintenance'].items():
+            print(f"  {name:<28} {values['seconds'] * 1000:>10.1f} ms", flush=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        db.close()
+        if not cached:
+            shutil.rmtree(os.path.dirname(db.db_path), ignore_errors=True)
+    return result
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(old, new):
+    """İki sonuç dosyasındaki ortak ölçümleri oranlarıyla yazdırır; yavaşlayan ölçüm sayısını döndürür"""
+    regressions = 0
+    print(f"\n{'Boyut':>10} {'Ölçüm':<28} {'Eski (ms)':>11} {'Yeni (ms)':>11} {'Oran':>7}")
+    for size, new_result in new['sizes'].items():
+        old_result = old['sizes'].get(size)
+        if not old_result:
+            continue
+        for group in ('read', 'maintenance'):
+            for name, values in new_result[group].items():
+                if name not in old_result[group]:
+                    continue
+                before, after = old_result[group][name]['seconds'], values['seconds']
+                ratio = after / before if before else float("inf")
+                flag = "  <-- yavaşladı" if ratio > REGRESSION_RATIO and after - before > REGRESSION_MIN_SECONDS else ""
+                regressions += bool(flag)
+                print(f"{size:>10} {name:<28} {before * 1000:>11.1f} {after * 1000:>11.1f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Veritabanı benchmark takımı")
+    parser.add_argument("sizes", nargs="*", type=parse_size, default=[10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=lambda value: datetime.strptime(value, "%Y-%m-%d"),
+                        help="Veri setinin son günü (hariç); sürümler arası karşılaştırmada sabit tutun")
+    parser.add_argument("-o", "--output", help="Sonuç dosyası (varsayılan: benchmarks/results/<tarih>.json)")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--cache-dir", help="Üretilen veri setlerinin saklanacağı klasör")
+    args = parser.parse_args(argv)
+    end = args.end or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    results = {
+        'created_at': datetime.now().isoformat(timespec="seconds"), 'git_commit': _git_commit(),
+        'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version, 'platform': platform.platform(),
+        'generator_version': GENERATOR_VERSION, 'seed': args.seed, 'end': end.strftime("%Y-%m-%d"), 'sizes': {},
+    }
+    for rows in args.sizes:
+        print(f"{rows} kayıt:", flush=True)
+        results['sizes'][str(rows)] = run_size(rows, args.seed, end, args.cache_dir)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y-%m-%d_%H-%M-%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"Sonuçlar yazıldı: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(json.load(f), results)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# benchmarks/bench_excel_export.py
+# Kullanım: python -m benchmarks.bench_excel_export [kayıt_sayısı ...]
+# Ana listenin Excel'e aktarımını eski yöntemle (tüm kayıtlar listeye + pandas DataFrame.to_excel)
+# akış tabanlı yalnızca-yazma XLSX aktarıcısıyla karşılaştırır. Tepe bellek ölçümü karışmasın diye
+# her yöntem ayrı bir süreçte çalıştırılır (ru_maxrss; Linux'ta KB, macOS'ta bayt).
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.common import create_benchmark_db, dispose_benchmark_db
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_mode(mode, db_path):
+    from database import Database
+    from Modules.exporters import RECORD_HEADERS, export_to_file
+    output = os.path.join(tempfile.mkdtemp(prefix="arac_bench_xlsx_"), "out.xlsx")
+    started = time.perf_counter()
+    if mode == "pandas":
+        import pandas as pd
+        db = Database(db_path)
+        records = db.fetch_records(None, None)
+        pd.DataFrame(records, columns=RECORD_HEADERS).to_excel(output, index=False)
+        rows = len(records)
+        db.close()
+    else:
+        rows = export_to_file(db_path, {'kind': 'records'}, "Excel", output)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({'rows': rows, 'seconds': elapsed, 'peak_rss_mb': _peak_rss_mb(), 'bytes': os.path.getsize(output)}))
+    os.remove(output)
+
+def main(sizes):
+    print(f"{'Kayıt':>10} {'Yöntem':>8} {'Satır/sn':>10} {'Tepe RSS (MB)':>14} {'Dosya (MB)':>11}")
+    for size in sizes:
+        db = create_benchmark_db(size)
+        db.close()
+        for mode in ("pandas", "stream"):
+            output = subprocess.run([sys.executable, "-m", "benchmarks.bench_excel_export", "--mode", mode, db.db_path],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{size:>10} {mode:>8} {result['rows'] / result['seconds']:>10.0f} "
+                  f"{result['peak_rss_mb']:>14.1f} {result['bytes'] / 1e6:>11.1f}")
+        dispose_benchmark_db(db)
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--mode":
+        run_mode(sys.argv[2], sys.argv[3])
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,150 @@
+# benchmarks/bench_ingest.py
+# Kullanım: python -m benchmarks.bench_ingest [--cameras N] [--vehicles N] [--batch N] [--target olay/sn]
+# Olay alım servisinin yerel yük üreticisi. Geçici bir veritabanı için "python -m Modules.cli ingest"
+# ayrı süreçte başlatılır; her kamera bir iş parçacığında kendi araçlarının giriş olaylarını, sonra
+# çıkış olaylarını --batch'lik gruplar halinde gönderir. Ardından ilk gruplar aynı event_id'lerle
+# yeniden gönderilir (tekrarlar yazılmamalı). Saniyedeki olay sayısı ve istek gecikmesi yazdırılır;
+# hedefin altında kalınırsa veya kayıt sayıları beklenenle uyuşmazsa çıkış kodu 1 döner.
+import argparse
+import http.client
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# Betikler "python -m benchmarks.<ad>" ile depo kökünden çalıştırılır
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_sync import _free_port
+from Modules.dwell_analytics import QuantileSketch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_START_TIMEOUT = 30
+
+def start_ingest_server(db_path, port):
+    """Servisi alt süreçte başlatır ve /health yanıt verene kadar bekler"""
+    process = subprocess.Popen([sys.executable, "-m", "Modules.cli", "--db", db_path, "ingest", "--host", "127.0.0.1", "--port", str(port)],
+                               cwd=os.path.dirname(db_path), env={**os.environ, "PYTHONPATH": ROOT},
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while True:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/health")
+            conn.getresponse().read()
+            conn.close()
+            return process
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f"Servis başlatılamadı: {process.stderr.read().decode(errors='replace')}")
+            time.sleep(0.1)
+
+class Camera(threading.Thread):
+    """Bir kamera: kendi araçlarının giriş ve çıkış olaylarını gruplar halinde gönderir"""
+
+    def __init__(self, number, port, vehicles, batch):
+        super().__init__(name=f"kamera_{number}")
+        self.number, self.port, self.vehicles, self.batch = number, port, vehicles, batch
+        self.latency = QuantileSketch()
+        self.statuses = {}
+        self.error = None
+
+    def _events(self, event_type):
+        return [{"event_id": f"k{self.number}-{event_type}-{i}", "type": event_type, "plate": f"34k{self.number:02d}{i:04d}",
+                 "camera": f"kamera {self.number}", "firm": "NAKLİYAT", "destination": "SÖNMEZ"}
+                for i in range(self.vehicles)]
+
+    def _post(self, conn, events):
+        started = time.perf_counter()
+        conn.request("POST", "/events", body=json.dumps({"events": events}).encode("utf-8"), headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        data = json.loads(response.read())
+        self.latency.add((time.perf_counter() - started) * 1000)
+        if response.status != 200:
+            raise RuntimeError(data.get("error"))
+        for result in data["results"]:
+            key = result["status"] + ("_tekrar" if result.get("duplicate") else "")
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+
+    def run(self):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        try:
+            for event_type in ("entry", "exit"):
+                events = self._events(event_type)
+                for start in range(0, len(events), self.batch):
+                    self._post(conn, events[start:start + self.batch])
+        except Exception as e:
+            self.error = e
+        finally:
+            conn.close()
+
+    def resend(self):
+        """İlk grubu aynı event_id'lerle yeniden gönderir"""
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        try:
+            self._post(conn, self._events("entry")[:self.batch])
+        finally:
+            conn.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Olay alım servisi yük testi")
+    parser.add_argument("--cameras", type=int, default=8, help="Aynı anda gönderen kamera sayısı")
+    parser.add_argument("--vehicles", type=int, default=2000, help="Kamera başına araç (her biri bir giriş ve bir çıkış)")
+    parser.add_argument("--batch", type=int, default=50, help="İstek başına olay")
+    parser.add_argument("--target", type=float, default=2000, help="Beklenen en düşük olay/sn")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="arac_bench_olay_")
+    db_path = os.path.join(work_dir, "olay.db")
+    port = _free_port()
+    process = start_ingest_server(db_path, port)
+    try:
+        cameras = [Camera(number, port, args.vehicles, args.batch) for number in range(args.cameras)]
+        started = time.perf_counter()
+        for camera in cameras:
+            camera.start()
+        for camera in cameras:
+            camera.join()
+        elapsed = time.perf_counter() - started
+        for camera in cameras:
+            camera.resend()
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    try:
+        conn = sqlite3.connect(db_path)
+        total, inside = conn.execute("SELECT COUNT(*), COALESCE(SUM(status = 'inside'), 0) FROM vehicles").fetchone()
+        conn.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    events = 2 * args.cameras * args.vehicles
+    rate = events / elapsed
+    latency = QuantileSketch()
+    statuses = {}
+    for camera in cameras:
+        latency.merge(camera.latency)
+        for key, count in camera.statuses.items():
+            statuses[key] = statuses.get(key, 0) + count
+    print(f"{args.cameras} kamera, {events} olay, istek başına {args.batch}")
+    print(f"  Süre: {elapsed:.2f} sn, {rate:.0f} olay/sn (hedef {args.target:.0f})")
+    print(f"  İstek gecikmesi p50={latency.quantile(0.5):.1f} ms  p95={latency.quantile(0.95):.1f} ms  p99={latency.quantile(0.99):.1f} ms")
+    print(f"  Sonuçlar: {', '.join(f'{key}={count}' for key, count in sorted(statuses.items()))}")
+    print(f"  Veritabanı: {total} kayıt, {inside} içeride")
+    errors = [camera.error for camera in cameras if camera.error]
+    for error in errors:
+        print(f"  Hata: {error!r}", file=sys.stderr)
+    expected_duplicates = args.cameras * min(args.batch, args.vehicles)
+    consistent = (total == args.cameras * args.vehicles and inside == 0 and statuses.get("created_tekrar", 0) == expected_duplicates)
+    if not consistent:
+        print("  Kayıt sayıları beklenenle uyuşmuyor", file=sys.stderr)
+    return 0 if not errors and consistent and rate >= args.target else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
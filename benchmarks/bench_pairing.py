@@ -0,0 +1,148 @@
+# benchmarks/bench_pairing.py
+# Kullanım: python -m benchmarks.bench_pairing [--vehicles N] [--visits N] [--seed N] [--target okuma/sn]
+# Kamera okuması eşleştirme motorunun (Modules.anpr_pairing) sentetik akış testi. Her araç birkaç
+# ziyaret yapar; her geçişte kamera 1-5 okuma üretir, ziyaretlerin ~%10'unda çıkış okunmaz, bazı
+# araçlar yalnızca çıkışta görülür. Okumalar zamana göre karıştırılıp motordan geçirilir; giriş, çıkış,
+# tekrar ve işaret sayıları akış üretilirken bilinen değerlerle karşılaştırılır. Ardından olaylar
+# geçici bir veritabanına Database.ingest_events ile yazılır ve kayıt sayıları denetlenir. Ayrıca
+# çıkışı kaçırılan aracın kara listeye alındıktan sonraki girişinde indeks ve veritabanı denetlenir.
+# Uyuşmazlık varsa veya hız hedefin altındaysa çıkış kodu 1 döner.
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Betikler "python -m benchmarks.<ad>" ile depo kökünden çalıştırılır
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from Modules.anpr_pairing import PairingEngine
+from Modules.ingest_server import validate_event
+
+WRITE_BATCH = 500
+
+def _burst(rng, reads, camera, event_type, plate, moment):
+    """Bir geçişte kameranın ürettiği 1-5 okuma (birkaç saniye arayla); okuma sayısını döndürür"""
+    count = rng.randint(1, 5)
+    for _ in range(count):
+        reads.append({"type": event_type, "plate": plate, "camera": camera, "time": moment.isoformat(timespec="seconds")})
+        moment += timedelta(seconds=rng.randint(1, 8))
+    return count
+
+def build_stream(rng, vehicles, visits, start):
+    """Karışık okuma akışı ve beklenen sayılar"""
+    reads = []
+    expected = {'entries': 0, 'exits': 0, 'missed_exit': 0, 'unmatched_exit': 0, 'inside': 0}
+    for number in range(vehicles):
+        # Kamera plakayı farklı biçimlerde okuyabilir; motor plaka anahtarıyla karşılaştırır
+        plate = rng.choice(["34 ABC {:04d}", "34abc{:04d}", "34-ABC-{:04d}"]).format(number)
+        moment = start + timedelta(minutes=rng.randint(0, 600))
+        if rng.random() < 0.02:
+            _burst(rng, reads, "çıkış", "exit", plate, moment)
+            expected['exits'] += 1
+            expected['unmatched_exit'] += 1
+            continue
+        for visit in range(visits):
+            _burst(rng, reads, "giriş", "entry", plate, moment)
+            expected['entries'] += 1
+            if visit:
+                expected['missed_exit'] += missed
+            moment += timedelta(minutes=rng.randint(15, 240))
+            missed = rng.random() < 0.1
+            if not missed:
+                _burst(rng, reads, "çıkış", "exit", plate, moment)
+                expected['exits'] += 1
+            moment += timedelta(minutes=rng.randint(60, 600))
+        expected['inside'] += missed
+    reads.sort(key=lambda read: read["time"])
+    return reads, expected
+
+def check_blacklisted_reentry(work_dir, start):
+    """Kaçırılan çıkıştan sonra kara listedeki aracın girişi: eski ziyaret kapanmalı, indeks ve veritabanı uyuşmalı"""
+    db = Database(os.path.join(work_dir, "kara_liste.db"))
+    try:
+        engine = PairingEngine()
+        reads = [validate_event({"type": "entry", "plate": "06 KL 100", "time": start.isoformat(timespec="seconds")}, require_id=False),
+                 validate_event({"type": "entry", "plate": "06 KL 100", "time": (start + timedelta(hours=5)).isoformat(timespec="seconds")},
+                                require_id=False)]
+        first, _ = engine.process_many(reads[:1])
+        for event, result in zip(first, db.ingest_events(first)):
+            engine.confirm(event, result)
+        db.add_to_blacklist("06 KL 100", "PLAKA", "deneme")
+        second, flags = engine.process_many(reads[1:])
+        results = db.ingest_events(second)
+        for event, result in zip(second, results):
+            engine.confirm(event, result)
+        inside = db.conn.execute("SELECT COUNT(*) FROM vehicles WHERE status = 'inside'").fetchone()[0]
+        ok = ([flag['flag'] for flag in flags] == ["missed_exit"] and [result['status'] for result in results] == ["blacklisted"]
+              and inside == engine.open_visits == 0)
+        print(f"  Kara listedeki araç yeniden girişi: {results[0]['status']}, {inside} içeride, indekste {engine.open_visits}"
+              f"{'' if ok else ' (beklenen: blacklisted, 0, 0)'}")
+        return ok
+    finally:
+        db.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kamera okuması eşleştirme testi")
+    parser.add_argument("--vehicles", type=int, default=20000)
+    parser.add_argument("--visits", type=int, default=3, help="Araç başına ziyaret")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--target", type=float, default=100000, help="Beklenen en düşük okuma/sn (motor)")
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+    start = datetime.now().replace(microsecond=0) - timedelta(days=2 + args.visits)
+    raw_reads, expected = build_stream(rng, args.vehicles, args.visits, start)
+    reads = [validate_event(raw, require_id=False) for raw in raw_reads]
+
+    engine = PairingEngine()
+    started = time.perf_counter()
+    events, flags = engine.process_many(reads)
+    elapsed = time.perf_counter() - started
+    rate = len(reads) / elapsed
+    counted = {kind: sum(flag['flag'] == kind for flag in flags) for kind in ("missed_exit", "unmatched_exit", "duplicate_entry")}
+    duplicates = len(reads) - expected['entries'] - expected['exits']
+    print(f"{args.vehicles} araç, {len(reads)} okuma -> {len(events)} olay")
+    print(f"  Motor: {elapsed * 1000:.0f} ms, {rate:.0f} okuma/sn (hedef {args.target:.0f})")
+    print(f"  Giriş {engine.stats['entries']}/{expected['entries']}, çıkış {engine.stats['exits']}/{expected['exits']}, "
+          f"tekrar {engine.stats['duplicates']}/{duplicates}")
+    print(f"  İşaretler: {', '.join(f'{kind}={count}/{expected.get(kind, 0)}' for kind, count in counted.items())}")
+    consistent = (engine.stats['entries'] == expected['entries'] and engine.stats['exits'] == expected['exits']
+                  and engine.stats['duplicates'] == duplicates and all(count == expected.get(kind, 0) for kind, count in counted.items()))
+
+    work_dir = tempfile.mkdtemp(prefix="arac_bench_eslestirme_")
+    try:
+        db = Database(os.path.join(work_dir, "eslestirme.db"))
+        # Yeni motor açılışta indeksi veritabanından kurar; yazma sonuçlarıyla güncellenir
+        engine = PairingEngine()
+        engine.load_open_visits(db.get_open_visits())
+        started = time.perf_counter()
+        statuses = {}
+        for first in range(0, len(reads), WRITE_BATCH):
+            batch_events, _ = engine.process_many(reads[first:first + WRITE_BATCH])
+            for event, result in zip(batch_events, db.ingest_events(batch_events)):
+                engine.confirm(event, result)
+                statuses[result['status']] = statuses.get(result['status'], 0) + 1
+        write_elapsed = time.perf_counter() - started
+        total, inside = db.conn.execute("SELECT COUNT(*), COALESCE(SUM(status = 'inside'), 0) FROM vehicles").fetchone()
+        reloaded = PairingEngine()
+        reloaded.load_open_visits(db.get_open_visits())
+        db.close()
+        blacklist_ok = check_blacklisted_reentry(work_dir, start)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print(f"  Veritabanı: {write_elapsed:.2f} sn, {', '.join(f'{key}={count}' for key, count in sorted(statuses.items()))}")
+    print(f"  {total} kayıt, {inside} içeride (beklenen {expected['entries']}, {expected['inside']}); "
+          f"açık ziyaret indeksi {engine.open_visits}, yeniden yüklenen {reloaded.open_visits}")
+    # Kaçırılan çıkışın eski kaydı yeni girişte kapanır; canlı ve yeniden yüklenen indeks veritabanıyla aynıdır
+    written = (total == expected['entries'] and inside == expected['inside'] == engine.open_visits == reloaded.open_visits
+               and statuses.get('no_open_visit', 0) == expected['unmatched_exit'])
+    if not consistent or not written or not blacklist_ok:
+        print("  Sayılar beklenenle uyuşmuyor", file=sys.stderr)
+    return 0 if consistent and written and blacklist_ok and rate >= args.target else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
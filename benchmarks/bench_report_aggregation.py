@@ -0,0 +1,32 @@
+# benchmarks/bench_report_aggregation.py
+# Kullanım: python -m benchmarks.bench_report_aggregation [kayıt_sayısı ...]
+# Raporlar sekmesinin eski dört ayrı sorgusunu tek geçişli toplama motoruyla karşılaştırır.
+import sys
+from datetime import datetime, timedelta
+from benchmarks.common import create_benchmark_db, dispose_benchmark_db, best_of
+
+def four_query_version(db, start_date, end_date):
+    return {
+        'entry_data': db.get_entry_data_for_range(start_date, end_date),
+        'top_firms': db.get_top_firms(start_date, end_date),
+        'top_drivers': db.get_top_drivers(start_date, end_date),
+        'top_vehicles': db.get_top_vehicles(start_date, end_date)
+    }
+
+def main(sizes):
+    end_date = datetime.now().strftime("%Y-%m-%d")
+    start_date = (datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d")
+    print(f"{'Kayıt':>10} {'4 sorgu (ms)':>14} {'Tek geçiş (ms)':>16} {'Hızlanma':>10}")
+    for rows in sizes:
+        db = create_benchmark_db(rows)
+        old = four_query_version(db, start_date, end_date)
+        new = db.get_report_aggregates(start_date, end_date)
+        assert old['entry_data'] == new['entry_data'], "Günlük sayılar farklı"
+        assert sorted(c for _, c in old['top_firms']) == sorted(c for _, c in new['top_firms']), "Firma sayıları farklı"
+        old_time = best_of(lambda: four_query_version(db, start_date, end_date))
+        new_time = best_of(lambda: db.get_report_aggregates(start_date, end_date))
+        print(f"{rows:>10} {old_time * 1000:>14.1f} {new_time * 1000:>16.1f} {old_time / new_time:>9.1f}x")
+        dispose_benchmark_db(db)
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,66 @@
+# benchmarks/bench_report_formatting.py
+# Kullanım: python -m benchmarks.bench_report_formatting [kayıt_sayısı ...]
+# Özel rapor satırlarının biçimlendirilmesini karşılaştırır: eski CustomReportGenerator._process_data
+# döngüsü (satır başına sözlük + dört strptime/strftime), satır satır biçimlendirici ve
+# sütun bazlı (NumPy) parça biçimlendirici. Yalnızca biçimlendirme süresi ölçülür.
+import sys
+from datetime import datetime
+from benchmarks.common import create_benchmark_db, dispose_benchmark_db, best_of
+from Modules.helpers import format_duration
+from Modules.report_rows import REPORT_COLUMNS, format_report_date, format_report_rows
+
+def old_process_data(data, description):
+    """Eski CustomReportGenerator._process_data (karşılaştırma için birebir kopya)"""
+    results = []
+    for row in data:
+        record = dict(zip([desc[0] for desc in description], row))
+        
+        wait_str, wait_seconds = "-", 0
+        if record.get('entryDate') and record.get('exitDate'):
+            try:
+                start = datetime.strptime(record['entryDate'], "%Y-%m-%d %H:%M")
+                end = datetime.strptime(record['exitDate'], "%Y-%m-%d %H:%M")
+                delta = end - start
+                wait_seconds = delta.total_seconds()
+                wait_str = format_duration(wait_seconds)
+            except (ValueError, TypeError):
+                wait_str = "Hesaplanamadı"
+        
+        record['calculated_wait_time'] = wait_str
+        record['wait_time_seconds'] = wait_seconds
+        
+        try:
+            if record.get('entryDate'):
+                record['entryDate'] = datetime.strptime(record['entryDate'], "%Y-%m-%d %H:%M").strftime("%d.%m.%Y %H:%M")
+            if record.get('exitDate'):
+                record['exitDate'] = datetime.strptime(record['exitDate'], "%Y-%m-%d %H:%M").strftime("%d.%m.%Y %H:%M")
+        except (ValueError, TypeError):
+            pass
+        
+        results.append(record)
+    
+    return results
+
+def per_row_format(rows, column_keys):
+    """Satır satır biçimlendirici (önceki format_report_rows)"""
+    formatters = [format_report_date if key in ("entryDate", "exitDate") else format_duration if key == "calculated_wait_time" else None
+                  for key in column_keys]
+    return [tuple(formatter(value) if formatter else value for formatter, value in zip(formatters, row)) for row in rows]
+
+def main(sizes):
+    column_keys = list(REPORT_COLUMNS.values())
+    print(f"{'Kayıt':>10} {'Eski döngü (ms)':>16} {'Satır satır (ms)':>17} {'Sütun bazlı (ms)':>17} {'Eskiye göre':>12}")
+    for size in sizes:
+        db = create_benchmark_db(size)
+        db.cursor.execute("SELECT entryDate, plaka, dorsePlaka, surucu, telefon, surucuFirma, gelinenFirma, exitDate, notes FROM vehicles")
+        old_rows, description = db.cursor.fetchall(), db.cursor.description
+        rows = list(db.fetch_custom_report_data("2000-01-01", "2100-01-01", {}, columns=column_keys))
+        assert list(format_report_rows(rows, column_keys)) == per_row_format(rows, column_keys), "Biçimlendirme sonuçları farklı"
+        old_time = best_of(lambda: old_process_data(old_rows, description), repeat=3)
+        row_time = best_of(lambda: per_row_format(rows, column_keys), repeat=3)
+        column_time = best_of(lambda: list(format_report_rows(rows, column_keys)), repeat=3)
+        print(f"{size:>10} {old_time * 1000:>16.1f} {row_time * 1000:>17.1f} {column_time * 1000:>17.1f} {old_time / column_time:>11.1f}x")
+        dispose_benchmark_db(db)
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
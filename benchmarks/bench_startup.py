@@ -0,0 +1,119 @@
+# benchmarks/bench_startup.py
+# Kullanım: python -m benchmarks.bench_startup [--runs N] [--update]
+# Program açılış süresini ölçer ve benchmarks/startup_budget.json'daki bütçeyle karşılaştırır.
+# Her ölçüm temiz bir Python sürecinde yapılır: main_app'in import süresi, ekran varsa ana
+# pencerenin ilk çizimine kadar geçen süre ve açılışta yüklenmemesi gereken ağır modüller.
+# Bütçe aşılırsa çıkış kodu 1 döner. Bütçe makineye bağlıdır; --update ile yeniden yazılır.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+
+# Yalnızca ilgili özellik kullanılınca yüklenmesi gereken modüller
+DEFERRED_MODULES = (
+    "pandas", "numpy", "openpyxl", "reportlab", "fitz", "matplotlib", "webbrowser", "zipfile",
+    "multiprocessing", "concurrent.futures.process", "urllib.request",
+    "Modules.reporting", "Modules.exporters", "Modules.report_rows", "Modules.log_viewer", "Modules.log_index",
+)
+
+# Alt süreçte çalışan ölçüm kodu; sonucu tek satır JSON olarak yazar
+CHILD_SCRIPT = r"""
+import json, os, sys, tempfile, time
+start = time.perf_counter()
+import main_app
+result = {"import_ms": (time.perf_counter() - start) * 1000}
+try:
+    import tkinter as tk
+    root = tk.Tk()
+except Exception:  # ekran yok (ör. sunucu ortamı)
+    root = None
+if root is not None:
+    from Modules.helpers import DEFAULT_SETTINGS
+    db_dir = tempfile.mkdtemp(prefix="arac_bench_")
+    main_app.get_db_path = lambda: os.path.join(db_dir, "bench.db")
+    app = main_app.VehicleApp(root, dict(DEFAULT_SETTINGS))
+    root.update()
+    result["window_ms"] = (time.perf_counter() - start) * 1000
+    app.shutdown()
+    root.destroy()
+result["loaded"] = sorted(name for name in json.loads(sys.argv[1]) if name in sys.modules)
+print(json.dumps(result))
+"""
+
+def measure_once():
+    output = subprocess.run([sys.executable, "-c", CHILD_SCRIPT, json.dumps(DEFERRED_MODULES)], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def import_breakdown(top=12):
+    """-X importtime çıktısından main_app'in doğrudan alt modüllerini toplam süreye göre sıralar"""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main_app"], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Ad bir boşluk ve her seviye için iki boşlukla girintilidir; main_app'in doğrudan import ettikleri 1. seviye
+        if (len(name) - len(name.lstrip()) - 1) // 2 == 1:
+            modules.append((int(cumulative) / 1000, name.strip()))
+    return sorted(modules, reverse=True)[:top]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Açılış süresi bütçe kontrolü")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--update", action="store_true", help="Ölçülen değerleri yeni bütçe olarak kaydet")
+    args = parser.parse_args(argv)
+
+    measure_once()  # .pyc dosyaları oluşsun; ilk ölçüm sayılmaz
+    results = [measure_once() for _ in range(args.runs)]
+    measured = {"import_ms": statistics.median(r["import_ms"] for r in results)}
+    if all("window_ms" in r for r in results):
+        measured["window_ms"] = statistics.median(r["window_ms"] for r in results)
+    loaded = sorted(set().union(*(r["loaded"] for r in results)))
+
+    print(f"{'Modül':<40} {'Toplam (ms)':>12}")
+    for elapsed, name in import_breakdown():
+        print(f"{name:<40} {elapsed:>12.1f}")
+    print()
+    for key, value in measured.items():
+        print(f"{key:<12}: {value:.1f} ms (medyan, {args.runs} ölçüm)")
+    if "window_ms" not in measured:
+        print("window_ms   : ölçülemedi (ekran yok)")
+
+    if args.update:
+        budget = {"tolerance": 0.25, **{key: round(value, 1) for key, value in measured.items()}}
+        if os.path.exists(BUDGET_PATH):
+            with open(BUDGET_PATH, encoding="utf-8") as f:
+                previous = json.load(f)
+            budget = {**previous, **budget, "tolerance": previous.get("tolerance", 0.25)}
+        with open(BUDGET_PATH, "w", encoding="utf-8") as f:
+            json.dump(budget, f, indent=2)
+            f.write("\n")
+        print(f"Bütçe güncellendi: {BUDGET_PATH}")
+        return 0
+
+    failures = [f"Açılışta yüklenmemesi gereken modüller yüklendi: {', '.join(loaded)}"] if loaded else []
+    if os.path.exists(BUDGET_PATH):
+        with open(BUDGET_PATH, encoding="utf-8") as f:
+            budget = json.load(f)
+        limit_factor = 1 + budget.get("tolerance", 0.25)
+        for key, value in measured.items():
+            if key in budget and value > budget[key] * limit_factor:
+                failures.append(f"{key} bütçeyi aştı: {value:.1f} ms > {budget[key]:.1f} ms x {limit_factor:.2f}")
+    else:
+        print(f"Bütçe dosyası yok ({BUDGET_PATH}); --update ile oluşturun")
+
+    for failure in failures:
+        print(f"HATA: {failure}", file=sys.stderr)
+    if not failures:
+        print("Açılış bütçesi içinde")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
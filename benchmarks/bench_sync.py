@@ -0,0 +1,141 @@
+# benchmarks/bench_sync.py
+# Kullanım: python -m benchmarks.bench_sync [--gates N] [--records N] [--batch N] [--readers N] [--rows N]
+# Senkronizasyon sunucusunun yerel yük testi. Geçici bir veritabanı (isteğe bağlı --rows kadar örnek
+# kayıtla) için "python -m Modules.cli serve" ayrı süreçte başlatılır; her kapı bir iş parçacığında
+# kendi RemoteDatabase istemcisiyle araç girişi yapar, her girişten sonra kendi içerideki araçlarını
+# okur ve sonunda girişlerin yarısının çıkışını verir. --batch > 1 ise girişler call_batch ile
+# gruplanır. İstek gecikmesinin dağılımı ve saniyedeki işlem sayısı yazdırılır; son kayıt sayıları
+# beklenenle uyuşmazsa (kayıp veya çift yazma) çıkış kodu 1 döner.
+import argparse
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# Betikler "python -m benchmarks.<ad>" ile depo kökünden çalıştırılır
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Modules.dwell_analytics import QuantileSketch
+from Modules.sync_client import RemoteDatabase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_START_TIMEOUT = 30
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(db_path, port, readers):
+    """Sunucuyu alt süreçte başlatır ve /health yanıt verene kadar bekler"""
+    process = subprocess.Popen([sys.executable, "-m", "Modules.cli", "--db", db_path, "serve", "--host", "127.0.0.1",
+                                "--port", str(port), "--readers", str(readers)], cwd=os.path.dirname(db_path),
+                               env={**os.environ, "PYTHONPATH": ROOT}, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    client = RemoteDatabase(f"http://127.0.0.1:{port}")
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while True:
+        try:
+            client.health()
+            client.close()
+            return process
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f"Sunucu başlatılamadı: {process.stderr.read().decode(errors='replace')}")
+            client.close()
+            time.sleep(0.1)
+
+class Gate(threading.Thread):
+    """Bir kapı bilgisayarı: giriş, okuma ve çıkış işlemleri"""
+
+    def __init__(self, number, url, records, batch):
+        super().__init__(name=f"kapi_{number}")
+        self.number, self.url, self.records, self.batch = number, url, records, batch
+        self.latencies = {"add": QuantileSketch(), "read": QuantileSketch(), "checkout": QuantileSketch()}
+        self.operations = 0
+        self.error = None
+
+    def _timed(self, kind, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        self.latencies[kind].add((time.perf_counter() - started) * 1000)
+        return result
+
+    def run(self):
+        db = RemoteDatabase(self.url)
+        prefix = f"34 K{self.number:03d}"
+        try:
+            for start in range(0, self.records, self.batch):
+                calls = [("add_record", (f"{prefix} {i:04d}", "", f"SÜRÜCÜ {self.number}", "", "FİRMA", "SÖNMEZ", ""), None)
+                         for i in range(start, min(start + self.batch, self.records))]
+                self._timed("add", db.call_batch, calls)
+                self._timed("read", db.search_records, prefix)
+                self.operations += len(calls) + 1
+            own = [row[0] for row in db.search_records(prefix) if row[9] == "inside"]
+            for record_id in own[:len(own) // 2]:
+                self._timed("checkout", db.checkout_vehicle, record_id)
+                self.operations += 1
+        except Exception as e:
+            self.error = e
+        finally:
+            db.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Senkronizasyon sunucusu yük testi")
+    parser.add_argument("--gates", type=int, default=8, help="Aynı anda çalışan kapı sayısı")
+    parser.add_argument("--records", type=int, default=200, help="Kapı başına araç girişi")
+    parser.add_argument("--batch", type=int, default=1, help="Tek istekte gönderilen giriş sayısı")
+    parser.add_argument("--readers", type=int, default=4, help="Sunucudaki okuma bağlantısı sayısı")
+    parser.add_argument("--rows", type=int, default=0, help="Veritabanına önceden yazılacak örnek kayıt sayısı")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="arac_bench_sync_")
+    db_path = os.path.join(work_dir, "sunucu.db")
+    if args.rows:
+        from benchmarks.dataset import build_database
+        build_database(db_path, args.rows).close()
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    process = start_server(db_path, port, args.readers)
+    try:
+        before = RemoteDatabase(url).get_record_count()
+        gates = [Gate(number, url, args.records, args.batch) for number in range(args.gates)]
+        started = time.perf_counter()
+        for gate in gates:
+            gate.start()
+        for gate in gates:
+            gate.join()
+        elapsed = time.perf_counter() - started
+
+        errors = [gate.error for gate in gates if gate.error]
+        check = RemoteDatabase(url)
+        added = check.get_record_count() - before
+        inside = sum(1 for gate in gates for row in check.search_records(f"34 K{gate.number:03d}") if row[9] == "inside")
+        check.close()
+        expected_added = args.gates * args.records
+        expected_inside = args.gates * (args.records - args.records // 2)
+
+        print(f"{args.gates} kapı, kapı başına {args.records} giriş, grup {args.batch}, {args.readers} okuyucu, {before} mevcut kayıt")
+        print(f"  Süre: {elapsed:.2f} sn, {sum(gate.operations for gate in gates) / elapsed:.0f} işlem/sn")
+        for kind in ("add", "read", "checkout"):
+            sketch = QuantileSketch()
+            for gate in gates:
+                sketch.merge(gate.latencies[kind])
+            if sketch.count:
+                print(f"  {kind:<9} n={sketch.count:<6} p50={sketch.quantile(0.5):7.1f} ms  p95={sketch.quantile(0.95):7.1f} ms  "
+                      f"p99={sketch.quantile(0.99):7.1f} ms")
+        print(f"  Eklenen: {added}/{expected_added}, içeride: {inside}/{expected_inside}")
+        for error in errors:
+            print(f"  Hata: {error!r}", file=sys.stderr)
+        return 0 if not errors and added == expected_added and inside == expected_inside else 1
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
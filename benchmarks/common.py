@@ -0,0 +1,31 @@
+# benchmarks/common.py
+# Benchmark betiklerinin ortak yardımcıları
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Betikler "python -m benchmarks.<ad>" ile depo kökünden çalıştırılır
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.dataset import build_database
+
+def create_benchmark_db(rows, seed=42, days=365, end=None):
+    """Geçici klasörde benchmarks.dataset üreticisiyle verilen sayıda kayıt içeren bir veritabanı oluşturur"""
+    db_path = os.path.join(tempfile.mkdtemp(prefix="arac_bench_"), "bench.db")
+    return build_database(db_path, rows, seed, days, end)
+
+def dispose_benchmark_db(db):
+    """Benchmark veritabanını kapatıp geçici klasörünü siler"""
+    db.close()
+    shutil.rmtree(os.path.dirname(db.db_path), ignore_errors=True)
+
+def best_of(func, repeat=5):
+    """func'ı repeat kez çalıştırıp en iyi süreyi (saniye) döndürür"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
@@ -0,0 +1,211 @@
+# benchmarks/dataset.py
+# Kullanım: python -m benchmarks.dataset kayıt_sayısı hedef.db [--seed N] [--days N] [--end YYYY-AA-GG]
+# Gerçekçi dağılımlı, tekrarlanabilir sentetik kayıt üreticisi. Aynı (kayıt sayısı, seed, gün, bitiş)
+# için her zaman aynı veri üretilir. Özellikler:
+#   - Araçlar Zipf benzeri dağılımla tekrar gelir (az sayıda araç kayıtların büyük kısmını oluşturur);
+#     her aracın bir veya birkaç sürücüsü, kendi firması ve çoğunlukla gittiği firmalar vardır.
+#   - Günlük hacim haftalık (hafta sonu düşük) ve yıllık mevsimselliğe, giriş saati mesai yoğunluğuna uyar.
+#   - Bekleme süresi log-normal dağılır; bitiş anında hâlâ içeride olanlar ve unutulmuş
+#     (çıkışı hiç verilmemiş) kayıtlar açık ziyaret olarak kalır.
+# Kayıtlar zaman sırasıyla, sıralama anahtarları hesaplanmış olarak yazılır; 5M kayıt bellekte tutulmaz.
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+# Betikler "python -m benchmarks.<ad>" ile depo kökünden çalıştırılır
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Modules.helpers import turkish_sort_key, plate_key
+
+# Üretici mantığı değişince artırılır (önbelleğe alınmış veri setlerini ayırt etmek için)
+GENERATOR_VERSION = 1
+
+# Standart boyutlar: komut satırında 10k, 100k, 1m, 5m olarak da yazılabilir
+STANDARD_SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "5m": 5_000_000}
+
+FIRST_NAMES = ["AHMET", "MEHMET", "MUSTAFA", "ALİ", "HÜSEYİN", "HASAN", "İBRAHİM", "İSMAİL", "OSMAN", "YUSUF",
+               "MURAT", "ÖMER", "RAMAZAN", "HALİL", "SÜLEYMAN", "ABDULLAH", "MAHMUT", "SALİH", "KEMAL", "ŞÜKRÜ",
+               "ÇAĞLAR", "ERDOĞAN", "GÖKHAN", "ÜMİT", "İLHAN", "OĞUZ", "SERKAN", "BÜLENT", "FATİH", "EMRE"]
+LAST_NAMES = ["YILMAZ", "KAYA", "DEMİR", "ŞAHİN", "ÇELİK", "YILDIZ", "YILDIRIM", "ÖZTÜRK", "AYDIN", "ÖZDEMİR",
+              "ARSLAN", "DOĞAN", "KILIÇ", "ASLAN", "ÇETİN", "KARA", "KOÇ", "KURT", "ÖZKAN", "ŞİMŞEK",
+              "POLAT", "ÖZCAN", "KORKMAZ", "ÇAKIR", "ERDOĞAN", "GÜNEŞ", "AKTAŞ", "İPEK", "ÜNAL", "GÜLER"]
+FIRM_WORDS = ["ANADOLU", "MARMARA", "EGE", "KARADENİZ", "AKDENİZ", "YILDIZ", "GÜNEŞ", "ÖZGÜR", "ÇINAR", "DOĞU",
+              "BATI", "KUZEY", "GÜNEY", "ASYA", "AVRASYA", "TUNA", "ŞAFAK", "ÜNAL", "İLKE", "ERCİYES"]
+FIRM_TYPES = ["LOJİSTİK", "NAKLİYAT", "TEKSTİL", "GIDA", "İNŞAAT", "KİMYA", "PLASTİK", "AMBALAJ", "OTOMOTİV", "TARIM"]
+FIRM_SUFFIXES = ["LTD. ŞTİ.", "A.Ş.", "SAN. TİC. A.Ş.", "TİC. LTD. ŞTİ."]
+PLATE_LETTERS = "ABCDEFGHJKLMNPRSTUVYZ"
+NOTES = ["Yükleme rampası 3", "Evrak eksik, ofise uğrayacak", "Soğuk zincir", "Randevulu", "Kantar bekliyor"]
+
+# Plaka il kodu ağırlıkları: büyük iller daha sık
+PROVINCE_WEIGHTS = {34: 30, 16: 8, 41: 8, 35: 6, 6: 6, 59: 4, 54: 3, 1: 2, 42: 2, 27: 2}
+# Saat ağırlıkları (0-23): mesai başı ve öğleden sonra yoğun, gece az
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 4, 9, 14, 14, 12, 9, 6, 9, 12, 12, 10, 8, 5, 3, 2, 2, 1, 1]
+# Haftanın günleri (Pazartesi=0) için hacim katsayısı
+WEEKDAY_FACTORS = [1.0, 1.05, 1.05, 1.0, 0.95, 0.55, 0.2]
+
+# Zipf üssü: birkaç düzenli araç trafiğin belirgin bir kısmını oluşturur, kalanı uzun kuyruktur
+ZIPF_EXPONENT = 0.9
+# Bekleme süresi: medyan ~80 dk log-normal, en fazla 3 gün
+DWELL_MEDIAN_MINUTES, DWELL_SIGMA, DWELL_MAX_MINUTES = 80, 0.9, 3 * 1440
+# Bitişten bağımsız olarak çıkışı hiç verilmemiş kayıtların oranı
+FORGOTTEN_RATIO = 0.002
+
+def parse_size(text):
+    """'100k', '1m', '5M' veya düz sayıyı kayıt sayısına çevirir"""
+    text = text.strip().lower().replace("_", "")
+    if text in STANDARD_SIZES:
+        return STANDARD_SIZES[text]
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if multiplier > 1 else text) * multiplier)
+
+def _zipf_cum_weights(count, exponent=ZIPF_EXPONENT):
+    return list(accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+def _pick(rng, cum_weights):
+    """random.choices'ın tek elemanlı ve hızlı karşılığı: ağırlıklı rastgele sıra numarası"""
+    return bisect_left(cum_weights, rng.random() * cum_weights[-1])
+
+class _Population:
+    """Araç, sürücü ve firma havuzları; boyutlar kayıt sayısıyla alt-doğrusal büyür"""
+
+    def __init__(self, rng, rows):
+        firm_count = max(50, min(5000, int(12 * math.sqrt(rows))))
+        driver_count = max(100, min(200_000, rows // 20))
+        vehicle_count = max(80, min(150_000, rows // 25))
+
+        self.firms = [self._firm(rng, index) for index in range(firm_count)]
+        self.firm_weights = _zipf_cum_weights(firm_count)
+        self.drivers = [(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", f"05{rng.randrange(30, 60)} {rng.randrange(100, 1000)} "
+                         f"{rng.randrange(10, 100)} {rng.randrange(10, 100)}") for _ in range(driver_count)]
+        self.driver_keys = [turkish_sort_key(name) for name, _ in self.drivers]
+
+        provinces = list(PROVINCE_WEIGHTS) + [code for code in range(1, 82) if code not in PROVINCE_WEIGHTS]
+        province_weights = list(accumulate([PROVINCE_WEIGHTS.get(code, 0.5) for code in provinces]))
+        self.vehicles = []
+        for _ in range(vehicle_count):
+            plate = self._plate(rng, provinces[_pick(rng, province_weights)])
+            trailer = self._plate(rng, provinces[_pick(rng, province_weights)]) if rng.random() < 0.4 else ""
+            drivers = [rng.randrange(driver_count) for _ in range(rng.choice((1, 1, 1, 2, 2, 3)))]
+            home_firm = _pick(rng, self.firm_weights)
+            destinations = [_pick(rng, self.firm_weights) for _ in range(rng.choice((1, 2, 3, 5)))]
+            self.vehicles.append((plate, trailer, plate_key(plate), plate_key(trailer), drivers, home_firm, destinations))
+        # Araçların sırası rastgele olduğundan en sık gelenler farklı illerden ve firmalardan olur
+        self.vehicle_weights = _zipf_cum_weights(vehicle_count)
+
+    @staticmethod
+    def _plate(rng, province):
+        letters = "".join(rng.choice(PLATE_LETTERS) for _ in range(rng.choice((1, 2, 3))))
+        digits = rng.randrange(10, 100) if len(letters) == 3 else rng.randrange(100, 10000)
+        return f"{province:02d} {letters} {digits}"
+
+    @staticmethod
+    def _firm(rng, index):
+        name = f"{rng.choice(FIRM_WORDS)} {rng.choice(FIRM_TYPES)} {rng.choice(FIRM_SUFFIXES)}"
+        # Aynı adlı firmalar ayrışsın diye bazılarına şube numarası eklenir
+        name = name if index < 200 else f"{name} {index}"
+        return name, turkish_sort_key(name)
+
+def _day_weights(start_day, days):
+    weights = []
+    for offset in range(days):
+        day = start_day + timedelta(days=offset)
+        season = 1 + 0.2 * math.sin(2 * math.pi * (day.timetuple().tm_yday - 80) / 365)
+        weights.append(WEEKDAY_FACTORS[day.weekday()] * season)
+    return weights
+
+def generate_records(rows, seed=42, days=365, end=None):
+    """
+    Kayıtları giriş zamanına göre sıralı olarak üretir. Her eleman INSERT_COLUMNS sırasında bir demettir.
+    end verilmezse bugünün başlangıcı kullanılır; kayıtlar [end - days, end) aralığına düşer.
+    """
+    rng = random.Random(seed)
+    end = end or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start_day = end - timedelta(days=days)
+    population = _Population(rng, rows)
+    vehicles, vehicle_weights = population.vehicles, population.vehicle_weights
+    drivers, driver_keys, firms, firm_weights = population.drivers, population.driver_keys, population.firms, population.firm_weights
+    hour_weights = list(accumulate(HOUR_WEIGHTS))
+    dwell_mu = math.log(DWELL_MEDIAN_MINUTES)
+
+    # Günlük kayıt sayıları: ağırlıklara göre paylaştırılır, yuvarlama artıkları sırayla dağıtılır
+    weights = _day_weights(start_day, days)
+    total_weight = sum(weights)
+    exact = [rows * weight / total_weight for weight in weights]
+    per_day = [int(value) for value in exact]
+    for index in sorted(range(days), key=lambda i: per_day[i] - exact[i])[:rows - sum(per_day)]:
+        per_day[index] += 1
+
+    for offset, count in enumerate(per_day):
+        day = start_day + timedelta(days=offset)
+        minutes = sorted(_pick(rng, hour_weights) * 60 + rng.randrange(60) for _ in range(count))
+        for minute in minutes:
+            entry = day + timedelta(minutes=minute)
+            plate, trailer, plate_k, trailer_k, driver_ids, home_firm, destinations = vehicles[_pick(rng, vehicle_weights)]
+            driver_id = rng.choice(driver_ids)
+            driver, phone = drivers[driver_id]
+            # Araç çoğunlukla bilinen firmalarına gider, bazen yeni bir firmaya
+            destination = rng.choice(destinations) if rng.random() < 0.85 else _pick(rng, firm_weights)
+            dwell = min(DWELL_MAX_MINUTES, max(3, int(rng.lognormvariate(dwell_mu, DWELL_SIGMA))))
+            exit_time = entry + timedelta(minutes=dwell)
+            is_open = exit_time >= end or rng.random() < FORGOTTEN_RATIO
+            yield (plate, trailer if rng.random() < 0.9 else "", driver, phone, firms[home_firm][0], firms[destination][0],
+                   entry.strftime("%Y-%m-%d %H:%M"), None if is_open else exit_time.strftime("%Y-%m-%d %H:%M"),
+                   "inside" if is_open else "checked_out", rng.choice(NOTES) if rng.random() < 0.05 else "",
+                   plate_k, trailer_k, driver_keys[driver_id], firms[home_firm][1], firms[destination][1])
+
+INSERT_COLUMNS = ("plaka", "dorsePlaka", "surucu", "telefon", "surucuFirma", "gelinenFirma", "entryDate", "exitDate", "status",
+                  "notes", "plaka_key", "dorse_key", "surucu_key", "surucu_firma_key", "gelinen_firma_key")
+
+def build_database(db_path, rows, seed=42, days=365, end=None, batch_size=50_000):
+    """
+    db_path'te şeması hazır bir veritabanı oluşturup sentetik kayıtlarla doldurur ve Database nesnesini döndürür.
+    Yükleme sırasında ikincil indeksler kaldırılıp sonda yeniden oluşturulur (büyük boyutlarda çok daha hızlı).
+    """
+    from database import Database
+    from itertools import islice
+    db = Database(db_path)
+    conn = db.conn
+    indexes = conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'vehicles' AND sql IS NOT NULL").fetchall()
+    conn.execute("PRAGMA synchronous = OFF")
+    for name, _ in indexes:
+        conn.execute(f"DROP INDEX {name}")
+    insert = f"INSERT INTO vehicles ({', '.join(INSERT_COLUMNS)}) VALUES ({', '.join('?' * len(INSERT_COLUMNS))})"
+    records = generate_records(rows, seed, days, end)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        conn.executemany(insert, batch)
+        conn.commit()
+    for _, sql in indexes:
+        conn.execute(sql)
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA synchronous = FULL")
+    return db
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sentetik araç takip veritabanı üretir")
+    parser.add_argument("rows", type=parse_size, help="Kayıt sayısı (ör. 10k, 100k, 1m, 5m)")
+    parser.add_argument("output", help="Oluşturulacak veritabanı dosyası (var olmamalı)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--end", type=lambda value: datetime.strptime(value, "%Y-%m-%d"), help="Son gün (hariç); varsayılan bugün")
+    args = parser.parse_args(argv)
+    if os.path.exists(args.output):
+        parser.error(f"Dosya zaten var: {args.output}")
+    started = time.perf_counter()
+    db = build_database(args.output, args.rows, args.seed, args.days, args.end)
+    total, inside = db.conn.execute("SELECT COUNT(*), SUM(status = 'inside') FROM vehicles").fetchone()
+    db.close()
+    print(f"{total} kayıt ({inside} içeride) {time.perf_counter() - started:.1f} sn: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
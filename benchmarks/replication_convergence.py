@@ -0,0 +1,158 @@
+# benchmarks/replication_convergence.py
+# Kullanım: python -m benchmarks.replication_convergence [--seeds N] [--replicas N] [--steps N]
+# Çoğaltmanın yakınsama denetimi (rastgele, özellik tabanlı). Her tohum için başlangıç veritabanı
+# (işlem günlüğünden önceki kayıtlar dahil) kopyalanarak replikalar kurulur; çift tohumlarda replikaların
+# bir kısmı ayrı kurulmuş ikinci bir tabandan gelir. Replikalarda rastgele sırayla giriş, düzenleme, çıkış,
+# yeniden giriş ve silme yapılır, araya rastgele eşler arasında küçük parçalı ve yarıda kesilen eşitlemeler
+# girer. Üçün katı tohumlarda ilk replika ara bir yedekten geri yüklenir (geri yüklemede kaybolan ama eşlere
+# ulaşmış kayıtlar geri gelmeli, sonraki yazmalar eşlere gitmeli). Sonunda herkes herkesle eşitlenir ve denetlenir: bütün replikaların kayıtları (genel kimliğe göre)
+# aynı olmalı, her kayıtta status='checked_out' ile çıkış tarihinin varlığı birbirini gerektirmeli ve
+# silinmemiş her başlangıç kaydı (her iki tabandan) bulunmalıdır. Başarısız tohum varsa çıkış kodu 1.
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Betikler "python -m benchmarks.<ad>" ile depo kökünden çalıştırılır
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, REPLICATED_FIELDS
+from Modules.backup_manager import restore_backup
+from Modules.replication import pull_operations, synchronize
+
+WORDS = ["ANADOLU", "MARMARA", "ŞAFAK", "ÇINAR", "İLKE", "ÜNAL", "ÖZGÜR", "GÜNEŞ"]
+
+def _random_text(rng):
+    return f"{rng.choice(WORDS)} {rng.randint(1, 99)}"
+
+# Kaydın karşılaştırma kimliği: dokunulmamış günlük öncesi kayıtların uid'si henüz atanmamıştır
+RECORD_KEY_SQL = "COALESCE(uid, 'L' || (SELECT value FROM sync_state WHERE key = 'base_id') || ':' || id)"
+
+def build_base(path, legacy_rows, prefix="34 ESK"):
+    """Günlük tutulmadan önce yazılmış (uid'siz) kayıtlar içeren başlangıç veritabanı; başlangıç kayıtlarının kimlikleri"""
+    db = Database(path)
+    db.conn.executemany("INSERT INTO vehicles (plaka, dorsePlaka, surucu, telefon, surucuFirma, gelinenFirma, notes, entryDate, status) "
+                        "VALUES (?, '', ?, '', ?, ?, '', '2025-01-01 08:00', 'inside')",
+                        [(f"{prefix} {i}", f"SÜRÜCÜ {i}", "FİRMA", "SÖNMEZ") for i in range(legacy_rows)])
+    db.conn.commit()
+    keys = {row[0] for row in db.conn.execute(f"SELECT {RECORD_KEY_SQL} FROM vehicles")}
+    db.close()
+    return keys
+
+def random_edit(db, rng, deleted):
+    ids = [row[0] for row in db.conn.execute("SELECT id FROM vehicles")]
+    action = rng.random()
+    if action < 0.35 or not ids:
+        db.add_record(f"34 {rng.choice('ABCDEF')} {rng.randint(1, 999)}", "", _random_text(rng), "", _random_text(rng), _random_text(rng), "")
+        return
+    record = db.get_record_by_id(rng.choice(ids))
+    if action < 0.6:
+        _, plaka, dorse, surucu, telefon, surucu_firma, gelinen_firma, entry, exit_date, _, notes = record
+        if rng.random() < 0.5:
+            notes = _random_text(rng)
+        else:
+            surucu = _random_text(rng)
+        db.update_record(record[0], plaka, dorse, surucu, telefon, surucu_firma, gelinen_firma, notes, entry, exit_date)
+    elif action < 0.8:
+        db.checkout_vehicle(record[0])
+    elif action < 0.92:
+        db.reactivate_vehicle(record[0])
+    else:
+        deleted.add(db.conn.execute(f"SELECT {RECORD_KEY_SQL} FROM vehicles WHERE id = ?", (record[0],)).fetchone()[0])
+        db.delete_record(record[0])
+
+def state(db):
+    """Replikanın kayıtları; yerel id'ler replikadan replikaya değiştiği için genel kimliğe göre"""
+    return sorted(db.conn.execute(f"SELECT {RECORD_KEY_SQL}, {', '.join(REPLICATED_FIELDS)} FROM vehicles").fetchall())
+
+def invariant_violations(records):
+    """Çıkış yapmış kayıtta çıkış tarihi olmalı, içerideki kayıtta olmamalı"""
+    status_index, exit_index = 1 + REPLICATED_FIELDS.index("status"), 1 + REPLICATED_FIELDS.index("exitDate")
+    return [record[0] for record in records if (record[status_index] == "checked_out") != (record[exit_index] is not None)]
+
+def run_seed(seed, replica_count, steps, work_dir):
+    """(denetim hataları, kayıt sayısı)"""
+    rng = random.Random(seed)
+    bases = [os.path.join(work_dir, "ortak.db")]
+    initial = build_base(bases[0], rng.randint(0, 30))
+    if seed % 2 == 0:
+        # Ayrı kurulmuş ikinci kapı: aynı id'lerde ilgisiz kayıtlar
+        bases.append(os.path.join(work_dir, "ikinci.db"))
+        initial |= build_base(bases[1], rng.randint(1, 30), prefix="35 İKİ")
+    replicas = []
+    for number in range(replica_count):
+        path = os.path.join(work_dir, f"replika_{number}.db")
+        shutil.copyfile(bases[number % len(bases)], path)
+        db = Database(path)
+        db.reset_replica_id()
+        replicas.append(db)
+    deleted = set()
+    backup_path = os.path.join(work_dir, "yedek.db")
+    for step in range(steps):
+        if seed % 3 == 0 and step == steps // 3:
+            replicas[0].backup_database(backup_path)
+        elif seed % 3 == 0 and step == 2 * steps // 3:
+            path = replicas[0].db_path
+            replicas[0].close()
+            restore_backup(backup_path, path)
+            replicas[0] = Database(path)
+        elif rng.random() < 0.15:
+            target, source = rng.sample(replicas, 2)
+            if rng.random() < 0.5:
+                pull_operations(target, source, batch_size=rng.randint(1, 8))
+            else:
+                # Yarıda kesilen eşitleme: yalnızca ilk parça aktarılır
+                since = target.get_sync_watermark(source.get_replica_id())
+                target.apply_operations(source.get_replica_id(), source.get_operations_since(since, target.get_replica_id(), rng.randint(1, 5)))
+        else:
+            random_edit(rng.choice(replicas), rng, deleted)
+    for _ in range(2):
+        for first in replicas:
+            for second in replicas:
+                if first is not second:
+                    synchronize(first, second, batch_size=rng.randint(1, 50))
+    states = [state(db) for db in replicas]
+    for db in replicas:
+        db.close()
+    problems = []
+    if any(other != states[0] for other in states[1:]):
+        problems.append("replikalar ayrıştı")
+    for number, records in enumerate(states):
+        broken = invariant_violations(records)
+        if broken:
+            problems.append(f"replika {number}: {len(broken)} kayıtta durum/çıkış tarihi tutarsız")
+        missing = initial - deleted - {record[0] for record in records}
+        if missing:
+            problems.append(f"replika {number}: silinmemiş {len(missing)} başlangıç kaydı yok")
+    return problems, len(states[0])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Çoğaltma yakınsama denetimi")
+    parser.add_argument("--seeds", type=int, default=30)
+    parser.add_argument("--replicas", type=int, default=3)
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--first-seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    failures = []
+    started = time.perf_counter()
+    for seed in range(args.first_seed, args.first_seed + args.seeds):
+        work_dir = tempfile.mkdtemp(prefix="arac_replika_")
+        try:
+            problems, records = run_seed(seed, args.replicas, args.steps, work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        if problems:
+            failures.append(seed)
+            print(f"  tohum {seed}: {'; '.join(problems)}")
+    print(f"{args.seeds} tohum, {args.replicas} replika, {args.steps} adım: {args.seeds - len(failures)} başarılı "
+          f"({time.perf_counter() - started:.1f} sn)")
+    if failures:
+        print(f"Başarısız tohumlar: {', '.join(map(str, failures))}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
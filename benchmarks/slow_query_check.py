@@ -0,0 +1,48 @@
+# benchmarks/slow_query_check.py
+# Kullanım: python -m benchmarks.slow_query_check [--rows N]
+# Yavaş sorgu günlüğünün denetimi: eşik çok düşük tutularak conn.execute, imleç ve akış kullanan
+# Database metotları çağrılır; her biri için SQL'in ve sorgu planının kaydedildiği denetlenir.
+# Eksik varsa çıkış kodu 1.
+import argparse
+import sys
+
+from benchmarks.common import create_benchmark_db, dispose_benchmark_db
+from Modules.query_stats import query_stats
+
+# Metot -> çağrı ve kaydedilen SQL'de bulunması gereken parça
+CHECKS = {
+    "find_open_visit": (lambda db: db.find_open_visit("34 ABC 123"), "plaka_key"),
+    "get_operations_since": (lambda db: db.get_operations_since(0, None, 100), "FROM oplog"),
+    "get_autocomplete_values": (lambda db: db.get_autocomplete_values("plaka"), "GROUP BY"),
+    "count_records": (lambda db: db.count_records(), "COUNT(*)"),
+    "iter_records": (lambda db: sum(1 for _ in db.iter_records()), "FROM vehicles"),
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Yavaş sorgu günlüğü denetimi")
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args(argv)
+    db = create_benchmark_db(args.rows)
+    previous = query_stats.slow_query_ms
+    query_stats.slow_query_ms = 1e-6  # her çağrı yavaş sayılır
+    try:
+        query_stats.reset()
+        for call, _ in CHECKS.values():
+            call(db)
+        logged = {entry['method']: entry for entry in query_stats.slow_queries()}
+    finally:
+        query_stats.slow_query_ms = previous
+        dispose_benchmark_db(db)
+    failures = []
+    for method, (_, fragment) in CHECKS.items():
+        entry = logged.get(method)
+        if entry is None or not entry['sql'] or fragment not in entry['sql'] or not entry['plan']:
+            failures.append(method)
+            print(f"  {method}: SQL veya plan kaydedilmedi ({entry and entry['sql']!r})")
+        else:
+            print(f"  {method}: {' '.join(entry['sql'].split())[:70]}... plan: {entry['plan'][0].strip()}")
+    print(f"{len(CHECKS) - len(failures)}/{len(CHECKS)} metot SQL ve planıyla kaydedildi")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
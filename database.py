@@ -1,19 +1,173 @@
 # database.py
 import sqlite3
 import os
+import hashlib
+import json
+import re
+import time
+import uuid
+from pathlib import Path
 from datetime import datetime, timedelta
 from Modules.logger import logger
+from Modules.helpers import turkish_sort_key, plate_key
+from Modules.report_engine import aggregate_report, DEFAULT_METRICS
+from Modules.query_stats import TimedConnection, query_stats, timed_query
+
+# SELECT * yerine kullanılan sabit sütun sırası (sıralama anahtarı sütunları hariç)
+RECORD_COLUMNS = "id, plaka, dorsePlaka, surucu, telefon, surucuFirma, gelinenFirma, entryDate, exitDate, status, notes"
+
+# Şema sürümü (PRAGMA user_version). Tablo, sütun veya indeks eklendiğinde artırılır;
+# veritabanı güncel sürümdeyse açılışta şema komutları hiç çalıştırılmaz.
+SCHEMA_VERSION = 5
+
+# Sıralama anahtarı doldurma işleminin bir adımda güncellediği en fazla kayıt sayısı
+SORT_KEY_FILL_BATCH = 5000
+
+# Türkçe sıralama için önceden hesaplanan anahtar sütunları: sütun -> (kaynak sütun, SQL fonksiyonu)
+SORT_KEY_COLUMNS = {
+    "plaka_key": ("plaka", "plate_key"),
+    "dorse_key": ("dorsePlaka", "plate_key"),
+    "surucu_key": ("surucu", "tr_sort_key"),
+    "surucu_firma_key": ("surucuFirma", "tr_sort_key"),
+    "gelinen_firma_key": ("gelinenFirma", "tr_sort_key"),
+}
+
+# Arayüzdeki sıralama isteklerinin SQL ORDER BY ifadelerine karşılığı
+SORT_COLUMNS = {
+    "id": "id",
+    "entryDate": "entryDate",
+    "entryTime": "substr(entryDate, 12, 5)",
+    "plaka": "plaka_key",
+    "dorsePlaka": "dorse_key",
+    "surucu": "surucu_key",
+    "telefon": "telefon",
+    "surucuFirma": "surucu_firma_key",
+    "gelinenFirma": "gelinen_firma_key",
+    "notes": "tr_sort_key(COALESCE(notes, ''))",
+    "exitDate": "exitDate",
+    "calculated_wait_time": "(julianday(exitDate) - julianday(entryDate))",
+}
+
+# Bekleme süresi (saniye) SQL tarafında hesaplanır; çıkışı olmayan kayıtlarda NULL döner
+DWELL_SECONDS_SQL = "CAST(ROUND((julianday(exitDate) - julianday(entryDate)) * 86400) AS INTEGER)"
+
+# Özel rapor sütunlarının SELECT ifadeleri (yalnızca seçilen sütunlar sorgulanır)
+REPORT_SELECT = {
+    "entryDate": "entryDate", "plaka": "plaka", "dorsePlaka": "dorsePlaka", "surucu": "surucu",
+    "telefon": "telefon", "surucuFirma": "surucuFirma", "gelinenFirma": "gelinenFirma",
+    "exitDate": "exitDate", "notes": "notes", "calculated_wait_time": DWELL_SECONDS_SQL,
+}
+
+# Özel rapor filtreleri indeksli sıralama anahtarı sütunları üzerinde çalışır
+REPORT_FILTER_KEYS = {
+    "plaka": ("plaka_key", plate_key),
+    "surucu": ("surucu_key", turkish_sort_key),
+    "gelinenFirma": ("gelinen_firma_key", turkish_sort_key),
+}
+
+# Giriş formunda otomatik tamamlanan sütunlar -> arama anahtarı (Modules.autocomplete ile aynı anahtar fonksiyonları);
+# anahtar sütunu henüz doldurulmamış eski kayıtlarda anahtar sorguda hesaplanır
+AUTOCOMPLETE_KEYS = {source: f"COALESCE({key_column}, {key_function}({source}))"
+                     for key_column, (source, key_function) in SORT_KEY_COLUMNS.items()}
+AUTOCOMPLETE_KEYS["telefon"] = "plate_key(telefon)"
+
+# Çoğaltmada (replikasyon) işlem günlüğüyle taşınan kayıt alanları
+REPLICATED_FIELDS = ("plaka", "dorsePlaka", "surucu", "telefon", "surucuFirma", "gelinenFirma", "notes", "entryDate", "exitDate", "status")
+# Günlük tutulmaya başlamadan önceki kayıtların ortak kimliği: "L" + taban kimliği + ":" + id. Taban kimliği
+# dosyanın parmak izidir (sync_state 'base_id'); yalnızca aynı dosyadan kopyalanan replikalarda aynıdır.
+_LEGACY_UID_RE = re.compile(r"L([0-9a-f]+):(\d+)")
+# Taban parmak izinde kullanılan en eski kayıt sayısı
+BASE_FINGERPRINT_ROWS = 1000
+# get_operations_since'in bir çağrıda döndürdüğü en fazla işlem
+OPERATION_BATCH = 1000
+
+def _key_filter(key_column, key, match_mode):
+    """exact/prefix eşleşmeleri indeks kullanır; contains tam tarama gerektirir"""
+    if match_mode == "exact":
+        return f"{key_column} = ?", [key]
+    if match_mode == "prefix":
+        return f"{key_column} >= ? AND {key_column} < ?", [key, key[:-1] + chr(ord(key[-1]) + 1)]
+    return f"instr({key_column}, ?) > 0", [key]
+
+def _readonly_uri(db_path):
+    """Salt okunur bağlantı için SQLite URI'si (urllib yerine pathlib: açılışta ağır modül yüklenmez)"""
+    return Path(os.path.abspath(db_path)).as_uri() + "?mode=ro"
+
+def _stream_rows(cursor, batch_size):
+    """İmleçten satırları fetchmany ile parça parça okuyarak bellek kullanımını sınırlar"""
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cursor.close()
+
+def _month_range(year, month):
+    """Ay filtresini indeks kullanabilen [başlangıç, bitiş) aralığına çevirir"""
+    start = f"{int(year):04d}-{int(month):02d}-01"
+    end = f"{int(year) + 1:04d}-01-01" if int(month) == 12 else f"{int(year):04d}-{int(month) + 1:02d}-01"
+    return start, end
+
+def _order_clause(order_by, descending):
+    expression = SORT_COLUMNS.get(order_by, "id")
+    direction = "DESC" if descending else "ASC"
+    return f" ORDER BY {expression} {direction}, id {direction}"
 
 class Database:
-    def __init__(self, db_path):
+    def __init__(self, db_path, fill_sort_keys=True):
+        """fill_sort_keys=False ise eksik sıralama anahtarları açılışta doldurulmaz (fill_missing_sort_keys)"""
         db_dir = os.path.dirname(db_path)
         os.makedirs(db_dir, exist_ok=True)
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, factory=TimedConnection)
+        query_stats.attach(self.conn)
+        self._register_functions()
         self.cursor = self.conn.cursor()
         self._update_schema()
+        if fill_sort_keys:
+            while self.fill_missing_sort_keys():
+                pass
         logger.log_info("Veritabanı bağlantısı kuruldu")
 
+    @classmethod
+    def open_reader(cls, db_path):
+        """Arka plan işleri için ayrı ve salt okunur bir bağlantı açar (şema güncellemesi yapılmaz)."""
+        reader = cls.__new__(cls)
+        reader.db_path = db_path
+        reader.conn = sqlite3.connect(_readonly_uri(db_path), uri=True, check_same_thread=False, factory=TimedConnection)
+        query_stats.attach(reader.conn)
+        reader._register_functions()
+        reader.cursor = reader.conn.cursor()
+        return reader
+
+    @staticmethod
+    def create_snapshot(db_path, snapshot_path):
+        """Veritabanının tutarlı bir kopyasını SQLite yedekleme API'siyle snapshot_path'e yazar"""
+        source = sqlite3.connect(_readonly_uri(db_path), uri=True)
+        target = sqlite3.connect(snapshot_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        return snapshot_path
+
+    def _register_functions(self):
+        self.conn.create_function("tr_sort_key", 1, turkish_sort_key, deterministic=True)
+        self.conn.create_function("plate_key", 1, plate_key, deterministic=True)
+
+    def close(self):
+        self.conn.close()
+
+    @timed_query
+    def get_data_version(self):
+        """Verinin değişip değişmediğini anlamak için ucuz bir sürüm anahtarı döndürür"""
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return (self.conn.total_changes, data_version)
+
+    @timed_query
     def check_connection(self):
         try:
             self.cursor.execute("SELECT 1")
@@ -22,6 +176,8 @@ class Database:
             return False
 
     def _update_schema(self):
+        if self.cursor.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
         self.cursor.execute("""
         CREATE TABLE IF NOT EXISTS vehicles (
             id INTEGER PRIMARY KEY AUTOINCREMENT, plaka TEXT, dorsePlaka TEXT, 
@@ -33,64 +189,356 @@ class Database:
             id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NOT NULL,
             value TEXT NOT NULL, reason TEXT, date_added TEXT, UNIQUE(type, value)
         )""")
+        # Sıralama anahtarı sütunları (eski veritabanlarına eklenir, fill_missing_sort_keys ile doldurulur)
+        existing_columns = {row[1] for row in self.cursor.execute("PRAGMA table_info(vehicles)").fetchall()}
+        for key_column in SORT_KEY_COLUMNS:
+            if key_column not in existing_columns:
+                self.cursor.execute(f"ALTER TABLE vehicles ADD COLUMN {key_column} TEXT")
+        # Çoğaltma: genel kayıt kimliği, işlem günlüğü, replika kimliği/saati ve eşlerden alınan son işlem
+        if "uid" not in existing_columns:
+            self.cursor.execute("ALTER TABLE vehicles ADD COLUMN uid TEXT")
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS oplog (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT, clock INTEGER NOT NULL, site TEXT NOT NULL,
+            uid TEXT NOT NULL, op TEXT NOT NULL, data TEXT, UNIQUE(site, clock)
+        )""")
+        self.cursor.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value)")
+        # Bu veritabanından arşivlenmiş kayıtlar: eşlerden gelen işlemler bunları yeniden oluşturmaz
+        self.cursor.execute("CREATE TABLE IF NOT EXISTS archived_uids (uid TEXT PRIMARY KEY) WITHOUT ROWID")
+        self.cursor.execute("CREATE TABLE IF NOT EXISTS sync_peers (peer TEXT PRIMARY KEY, pulled_seq INTEGER NOT NULL, synced_at TEXT)")
+        # Kamera/turnike olaylarının kimlikleri: aynı olay tekrar gönderilirse ilk sonucu döner
+        self.cursor.execute("CREATE TABLE IF NOT EXISTS ingested_events (event_id TEXT PRIMARY KEY, status TEXT NOT NULL, record_id INTEGER, received_at TEXT) WITHOUT ROWID")
+        self.cursor.execute("INSERT OR IGNORE INTO sync_state (key, value) VALUES ('replica_id', ?), ('clock', 0)", (uuid.uuid4().hex[:16],))
+        if self.cursor.execute("SELECT 1 FROM sync_state WHERE key = 'base_id'").fetchone() is None:
+            self._init_base_id()
         # Indexler
+        self.cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_uid ON vehicles(uid)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_oplog_uid ON oplog(uid)")
         self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_entry_date ON vehicles(entryDate)")
         self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_plaka ON vehicles(plaka)")
+        for key_column in SORT_KEY_COLUMNS:
+            self.cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{key_column} ON vehicles({key_column})")
+        # Kısmi indeks: yalnızca içerideki araçlar; "bu plaka içeride mi?" sorusu tek indeks aramasıdır
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_open_visits ON vehicles(plaka_key) WHERE status = 'inside'")
+        self.cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.commit()
+        logger.log_info(f"Veritabanı şeması güncellendi (sürüm {SCHEMA_VERSION})")
+
+    @timed_query
+    def fill_missing_sort_keys(self, batch_size=SORT_KEY_FILL_BATCH):
+        """Anahtarı boş kayıtların en fazla batch_size tanesini doldurur; güncellenen satır sayısını döndürür"""
+        updated = 0
+        for key_column, (source_column, key_function) in SORT_KEY_COLUMNS.items():
+            self.cursor.execute(f"UPDATE vehicles SET {key_column} = {key_function}({source_column}) "
+                                f"WHERE id IN (SELECT id FROM vehicles WHERE {key_column} IS NULL LIMIT ?)", (batch_size,))
+            updated += self.cursor.rowcount
         self.conn.commit()
+        return updated
 
+    def _sort_keys(self, plaka, dorsePlaka, surucu, surucuFirma, gelinenFirma):
+        return (plate_key(plaka), plate_key(dorsePlaka), turkish_sort_key(surucu),
+                turkish_sort_key(surucuFirma), turkish_sort_key(gelinenFirma))
+
+    @timed_query
     def add_record(self, plaka, dorsePlaka, surucu, telefon, surucuFirma, gelinenFirma, notes):
         entry_time = datetime.now().strftime("%Y-%m-%d %H:%M")
-        params = (plaka.upper(), dorsePlaka.upper(), surucu.upper(), telefon, surucuFirma.upper(), gelinenFirma.upper(), notes, entry_time, 'inside')
-        self.cursor.execute("INSERT INTO vehicles (plaka, dorsePlaka, surucu, telefon, surucuFirma, gelinenFirma, notes, entryDate, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", params)
+        self._insert_record((plaka.upper(), dorsePlaka.upper(), surucu.upper(), telefon, surucuFirma.upper(), gelinenFirma.upper()), notes, entry_time)
         self.conn.commit()
         return True
 
-    def fetch_records(self, year=None, month=None, status_filter=None, date_filter=None):
-        query = "SELECT * FROM vehicles"
+    def _insert_record(self, values, notes, entry_time):
+        """Yeni kaydı ve işlem günlüğü kaydını yazar (commit çağırana aittir); kaydın id'sini döndürür"""
+        uid = uuid.uuid4().hex
+        params = values + (notes, entry_time, 'inside') + self._sort_keys(values[0], values[1], values[2], values[4], values[5]) + (uid,)
+        self.cursor.execute("INSERT INTO vehicles (plaka, dorsePlaka, surucu, telefon, surucuFirma, gelinenFirma, notes, entryDate, status, "
+                            "plaka_key, dorse_key, surucu_key, surucu_firma_key, gelinen_firma_key, uid) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", params)
+        self._log_operation(uid, "add", dict(zip(REPLICATED_FIELDS, values + (notes, entry_time, None, 'inside'))))
+        return self.cursor.lastrowid
+
+    def _record_filters(self, year=None, month=None, status_filter=None):
         conditions, params = [], []
-        
-        if year: conditions.append("strftime('%Y', entryDate) = ?"); params.append(str(year))
-        if month: conditions.append("strftime('%m', entryDate) = ?"); params.append(f"{month:02d}")
+        if year and month:
+            start, end = _month_range(year, month)
+            conditions.append("entryDate >= ? AND entryDate < ?"); params.extend((start, end))
+        elif year:
+            conditions.append("entryDate >= ? AND entryDate < ?"); params.extend((f"{int(year):04d}-01-01", f"{int(year) + 1:04d}-01-01"))
+        elif month:
+            conditions.append("strftime('%m', entryDate) = ?"); params.append(f"{month:02d}")
         if status_filter: conditions.append("status = ?"); params.append(status_filter)
-        
-        if conditions: query += " WHERE " + " AND ".join(conditions)
-        query += " ORDER BY id DESC"
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+    def _records_query(self, year=None, month=None, status_filter=None, search_term=None, order_by=None, descending=True):
+        if search_term:
+            term = f"%{search_term.upper()}%"
+            query = (f"SELECT {RECORD_COLUMNS} FROM vehicles WHERE id IN (SELECT id FROM vehicles WHERE UPPER(plaka) LIKE ? OR UPPER(dorsePlaka) LIKE ? "
+                     f"OR UPPER(surucu) LIKE ? OR UPPER(gelinenFirma) LIKE ? ORDER BY id DESC LIMIT 1000)")
+            return query + _order_clause(order_by, descending), [term, term, term, term]
+        where, params = self._record_filters(year, month, status_filter)
+        return f"SELECT {RECORD_COLUMNS} FROM vehicles{where}" + _order_clause(order_by, descending), params
+
+    @timed_query
+    def fetch_records(self, year=None, month=None, status_filter=None, date_filter=None, order_by=None, descending=True, limit=None, offset=0):
+        query, params = self._records_query(year, month, status_filter, order_by=order_by, descending=descending)
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"; params.extend((limit, offset))
         
         self.cursor.execute(query, tuple(params))
         return self.cursor.fetchall()
 
-    def search_records(self, search_term):
-        term = f"%{search_term.upper()}%"
-        query = "SELECT * FROM vehicles WHERE UPPER(plaka) LIKE ? OR UPPER(dorsePlaka) LIKE ? OR UPPER(surucu) LIKE ? OR UPPER(gelinenFirma) LIKE ? ORDER BY id DESC LIMIT 1000"
-        self.cursor.execute(query, (term, term, term, term))
+    @timed_query
+    def iter_records(self, year=None, month=None, status_filter=None, search_term=None, order_by=None, descending=True, batch_size=2000):
+        """fetch_records/search_records ile aynı sonucu listeye toplamadan akış halinde döndürür"""
+        query, params = self._records_query(year, month, status_filter, search_term, order_by, descending)
+        cursor = self.conn.cursor()
+        cursor.execute(query, params)
+        return _stream_rows(cursor, batch_size)
+
+    @timed_query
+    def count_records(self, year=None, month=None, status_filter=None):
+        where, params = self._record_filters(year, month, status_filter)
+        self.cursor.execute(f"SELECT COUNT(*) FROM vehicles{where}", tuple(params))
+        return self.cursor.fetchone()[0]
+
+    @timed_query
+    def search_records(self, search_term, order_by=None, descending=True, limit=1000, offset=0):
+        query, params = self._records_query(search_term=search_term, order_by=order_by, descending=descending)
+        self.cursor.execute(query + " LIMIT ? OFFSET ?", params + [limit, offset])
         return self.cursor.fetchall()
 
+    @timed_query
+    def count_search_records(self, search_term):
+        term = f"%{search_term.upper()}%"
+        self.cursor.execute("SELECT COUNT(*) FROM (SELECT 1 FROM vehicles WHERE UPPER(plaka) LIKE ? OR UPPER(dorsePlaka) LIKE ? OR UPPER(surucu) LIKE ? OR UPPER(gelinenFirma) LIKE ? LIMIT 1000)", (term, term, term, term))
+        return self.cursor.fetchone()[0]
+
+    @timed_query
     def get_record_by_id(self, record_id):
-        self.cursor.execute("SELECT * FROM vehicles WHERE id = ?", (record_id,))
+        self.cursor.execute(f"SELECT {RECORD_COLUMNS} FROM vehicles WHERE id = ?", (record_id,))
         return self.cursor.fetchone()
 
+    @timed_query
     def update_record(self, record_id, plaka, dorsePlaka, surucu, telefon, surucuFirma, gelinenFirma, notes, entryDate, exitDate):
-        params = (plaka.upper(), dorsePlaka.upper(), surucu.upper(), telefon, surucuFirma.upper(), gelinenFirma.upper(), notes, entryDate, exitDate, record_id)
-        self.cursor.execute("UPDATE vehicles SET plaka=?, dorsePlaka=?, surucu=?, telefon=?, surucuFirma=?, gelinenFirma=?, notes=?, entryDate=?, exitDate=? WHERE id=?", params)
+        values = (plaka.upper(), dorsePlaka.upper(), surucu.upper(), telefon, surucuFirma.upper(), gelinenFirma.upper())
+        params = values + (notes, entryDate, exitDate) + self._sort_keys(values[0], values[1], values[2], values[4], values[5]) + (record_id,)
+        current = self.conn.execute(f"SELECT {', '.join(REPLICATED_FIELDS)} FROM vehicles WHERE id = ?", (record_id,)).fetchone()
+        self.cursor.execute("UPDATE vehicles SET plaka=?, dorsePlaka=?, surucu=?, telefon=?, surucuFirma=?, gelinenFirma=?, notes=?, entryDate=?, exitDate=?, "
+                            "plaka_key=?, dorse_key=?, surucu_key=?, surucu_firma_key=?, gelinen_firma_key=? WHERE id=?", params)
+        if current is not None:
+            # Yalnızca değişen alanlar günlüğe yazılır; düzenleyicideki eski değerler eşlerin değişikliklerini ezmez.
+            # exitDate ile status birlikte taşınır: biri tek başına birleşirse "çıkış yaptı ama çıkış tarihi yok" oluşur.
+            current = dict(zip(REPLICATED_FIELDS, current))
+            changed = {field: value for field, value in zip(REPLICATED_FIELDS, values + (notes, entryDate, exitDate)) if current[field] != value}
+            if "exitDate" in changed:
+                changed["status"] = current["status"]
+            if changed:
+                self._log_record_operation(record_id, "update", changed)
         self.conn.commit()
 
+    @timed_query
     def delete_record(self, record_id):
+        self._log_record_operation(record_id, "delete", None)
         self.cursor.execute("DELETE FROM vehicles WHERE id = ?", (record_id,))
         self.conn.commit()
 
+    @timed_query
     def checkout_vehicle(self, record_id):
-        exit_time = datetime.now().strftime("%Y-%m-%d %H:%M")
-        self.cursor.execute("UPDATE vehicles SET exitDate = ?, status = 'checked_out' WHERE id = ?", (exit_time, record_id))
+        self._checkout(record_id, datetime.now().strftime("%Y-%m-%d %H:%M"))
         self.conn.commit()
+
+    def _checkout(self, record_id, exit_time):
+        self.cursor.execute("UPDATE vehicles SET exitDate = ?, status = 'checked_out' WHERE id = ?", (exit_time, record_id))
+        self._log_record_operation(record_id, "update", {"exitDate": exit_time, "status": "checked_out"})
         
+    def _open_visit_id(self, plate, before=None):
+        """Plakanın en son açık ziyaretinin id'si (idx_open_visits üzerinden); before verilirse o andan önce girilmiş olmalı"""
+        if before is None:
+            row = self.conn.execute("SELECT id FROM vehicles WHERE plaka_key = ? AND status = 'inside' ORDER BY entryDate DESC, id DESC LIMIT 1",
+                                    (plate_key(plate),)).fetchone()
+        else:
+            row = self.conn.execute("SELECT id FROM vehicles WHERE plaka_key = ? AND status = 'inside' AND entryDate <= ? "
+                                    "ORDER BY entryDate DESC, id DESC LIMIT 1", (plate_key(plate), before)).fetchone()
+        return row[0] if row else None
+
+    @timed_query
+    def find_open_visit(self, plate):
+        """Plaka içerideyse en son açık kaydını (RECORD_COLUMNS sırasıyla), değilse None döndürür"""
+        return self.conn.execute(f"SELECT {RECORD_COLUMNS} FROM vehicles WHERE plaka_key = ? AND status = 'inside' "
+                                 "ORDER BY entryDate DESC, id DESC LIMIT 1", (plate_key(plate),)).fetchone()
+
+    @timed_query
+    def checkout_by_plate(self, plate):
+        """Plakanın açık ziyaretine çıkış verir; kapatılan kaydın id'sini veya içeride değilse None döndürür"""
+        record_id = self._open_visit_id(plate)
+        if record_id is not None:
+            self._checkout(record_id, datetime.now().strftime("%Y-%m-%d %H:%M"))
+            self.conn.commit()
+        return record_id
+
+    @timed_query
     def reactivate_vehicle(self, record_id):
         self.cursor.execute("UPDATE vehicles SET exitDate = NULL, status = 'inside' WHERE id = ?", (record_id,))
+        self._log_record_operation(record_id, "update", {"exitDate": None, "status": "inside"})
+        self.conn.commit()
+
+    # --- Çoğaltma (replikasyon) ---
+    # Her yazma, aynı işlemde oplog tablosuna alan düzeyinde bir kayıt ekler. İşlemler (saat, replika)
+    # sırasıyla tam sıralıdır; bir kaydın son hali, mevcut satırın üzerine o kayda ait tüm işlemlerin
+    # bu sırayla uygulanmasıdır (alan bazında son yazan kazanır, silme her zaman kazanır). Sonuç
+    # işlemlerin geliş sırasından bağımsız olduğundan aynı işlemleri alan replikalar aynı veriye ulaşır.
+
+    def get_replica_id(self):
+        return self.conn.execute("SELECT value FROM sync_state WHERE key = 'replica_id'").fetchone()[0]
+
+    def reset_replica_id(self):
+        """Dosya kopyalanarak kurulan yeni replikaya kendi kimliğini verir (aynı kimlikli iki replika eşitlenemez)"""
+        replica_id = uuid.uuid4().hex[:16]
+        self.conn.execute("UPDATE sync_state SET value = ? WHERE key = 'replica_id'", (replica_id,))
+        self.conn.commit()
+        return replica_id
+
+    def get_base_id(self):
+        """Taban dosyanın parmak izi: aynı dosyadan kopyalanan replikalar günlük öncesi kayıtları ortak kimlikle paylaşır"""
+        return self.conn.execute("SELECT value FROM sync_state WHERE key = 'base_id'").fetchone()[0]
+
+    def _init_base_id(self):
+        """Taban parmak izini en eski günlük öncesi kayıtlardan üretir; eski "L<id>" kimliklerini taşır"""
+        rows = self.conn.execute("SELECT id, entryDate FROM vehicles WHERE uid IS NULL OR uid LIKE 'L%' ORDER BY id LIMIT ?",
+                                 (BASE_FINGERPRINT_ROWS,)).fetchall()
+        base_id = hashlib.sha1(json.dumps(rows).encode("utf-8")).hexdigest()[:16] if rows else uuid.uuid4().hex[:16]
+        self.conn.execute("INSERT INTO sync_state (key, value) VALUES ('base_id', ?)", (base_id,))
+        self.conn.execute("UPDATE vehicles SET uid = 'L' || ? || ':' || substr(uid, 2) WHERE uid GLOB 'L[0-9]*'", (base_id,))
+        self.conn.execute("UPDATE oplog SET uid = 'L' || ? || ':' || substr(uid, 2) WHERE uid GLOB 'L[0-9]*'", (base_id,))
+
+    def _legacy_uid(self, record_id):
+        return f"L{self.get_base_id()}:{record_id}"
+
+    def _next_clock(self):
+        """Hibrit Lamport saati: duvar saati (ms) ile bilinen en büyük saatin bir fazlasından büyük olanı"""
+        clock = max(int(time.time() * 1000), self.conn.execute("SELECT value FROM sync_state WHERE key = 'clock'").fetchone()[0] + 1)
+        self.conn.execute("UPDATE sync_state SET value = ? WHERE key = 'clock'", (clock,))
+        return clock
+
+    def _log_operation(self, uid, op, fields):
+        self.conn.execute("INSERT INTO oplog (clock, site, uid, op, data) VALUES (?, ?, ?, ?, ?)",
+                          (self._next_clock(), self.get_replica_id(), uid, op,
+                           json.dumps(fields, ensure_ascii=False) if fields is not None else None))
+
+    def _log_record_operation(self, record_id, op, fields):
+        """Kaydın genel kimliğini bulur (günlük öncesi kayda "L" + id atar) ve işlemi günlüğe yazar"""
+        row = self.conn.execute("SELECT uid FROM vehicles WHERE id = ?", (record_id,)).fetchone()
+        if row is None:
+            return
+        uid = row[0]
+        if uid is None:
+            uid = self._legacy_uid(record_id)
+            self.conn.execute("UPDATE vehicles SET uid = ? WHERE id = ?", (uid, record_id))
+        self._log_operation(uid, op, fields)
+
+    def _row_for_uid(self, uid):
+        row = self.conn.execute(f"SELECT id, {', '.join(REPLICATED_FIELDS)} FROM vehicles WHERE uid = ?", (uid,)).fetchone()
+        legacy = _LEGACY_UID_RE.fullmatch(uid)
+        # Başka tabanın günlük öncesi kaydı buradaki aynı id'li kayıtla ilgisizdir; eşin 'add' işlemiyle yeni kayıt olur
+        if row is None and legacy and legacy.group(1) == self.get_base_id():
+            row = self.conn.execute(f"SELECT id, {', '.join(REPLICATED_FIELDS)} FROM vehicles WHERE id = ? AND uid IS NULL",
+                                    (int(legacy.group(2)),)).fetchone()
+            if row is not None:
+                self.conn.execute("UPDATE vehicles SET uid = ? WHERE id = ?", (uid, row[0]))
+        return row
+
+    def _is_archived(self, uid):
+        return self.conn.execute("SELECT 1 FROM archived_uids WHERE uid = ?", (uid,)).fetchone() is not None
+
+    def _materialize(self, uid):
+        """Kaydın son halini işlem günlüğünden yeniden hesaplayıp vehicles tablosuna yazar"""
+        if self._is_archived(uid):
+            return
+        operations = self.conn.execute("SELECT op, data FROM oplog WHERE uid = ? ORDER BY clock, site", (uid,)).fetchall()
+        row = self._row_for_uid(uid)
+        if any(op == "delete" for op, _ in operations):
+            if row is not None:
+                self.conn.execute("DELETE FROM vehicles WHERE id = ?", (row[0],))
+            return
+        additions = [data for op, data in operations if op == "add"]
+        if row is None and not additions:
+            return  # kayıt burada arşivlenmiş ya da oluşturma işlemi henüz gelmemiş
+        # 'add' kaydın başlangıç halidir: satır burada varsa zaten onu içerir, yoksa güncellemelerden önce uygulanır.
+        # (Günlük öncesi kayıtlar için birden fazla replika 'add' yazabilir; aynı tabandan geldikleri için tutarlıdır.)
+        if row is not None:
+            state = dict(zip(REPLICATED_FIELDS, row[1:]))
+        else:
+            state = {field: "" for field in REPLICATED_FIELDS}
+            for data in additions:
+                state.update(json.loads(data))
+        for op, data in operations:
+            if op != "add" and data:
+                state.update(json.loads(data))
+        values = tuple(state[field] for field in REPLICATED_FIELDS)
+        keys = self._sort_keys(state["plaka"], state["dorsePlaka"], state["surucu"], state["surucuFirma"], state["gelinenFirma"])
+        if row is not None:
+            self.conn.execute(f"UPDATE vehicles SET {', '.join(f'{field}=?' for field in REPLICATED_FIELDS)}, plaka_key=?, dorse_key=?, "
+                              "surucu_key=?, surucu_firma_key=?, gelinen_firma_key=? WHERE id=?", values + keys + (row[0],))
+        else:
+            self.conn.execute(f"INSERT INTO vehicles ({', '.join(REPLICATED_FIELDS)}, plaka_key, dorse_key, surucu_key, surucu_firma_key, "
+                              f"gelinen_firma_key, uid) VALUES ({', '.join('?' * (len(REPLICATED_FIELDS) + 6))})", values + keys + (uid,))
+
+    @timed_query
+    def publish_legacy_records(self):
+        """Günlük öncesi kayıtlar için tam 'add' işlemi yazar (başka tabanlı eşle eşitlemeden önce)"""
+        rows = self.conn.execute(f"SELECT id, uid, {', '.join(REPLICATED_FIELDS)} FROM vehicles WHERE uid IS NULL OR "
+                                 "(uid LIKE 'L%' AND uid NOT IN (SELECT uid FROM oplog WHERE op = 'add'))").fetchall()
+        for row in rows:
+            uid = row[1] or self._legacy_uid(row[0])
+            if row[1] is None:
+                self.conn.execute("UPDATE vehicles SET uid = ? WHERE id = ?", (uid, row[0]))
+            self._log_operation(uid, "add", dict(zip(REPLICATED_FIELDS, row[2:])))
         self.conn.commit()
+        return len(rows)
 
+    @timed_query
+    def get_operations_since(self, since_seq, exclude_site=None, limit=OPERATION_BATCH):
+        """seq'i since_seq'ten büyük işlemler (seq, saat, replika, uid, işlem, veri); exclude_site'ın kendi işlemleri hariç"""
+        return self.conn.execute("SELECT seq, clock, site, uid, op, data FROM oplog WHERE seq > ? AND site != ? ORDER BY seq LIMIT ?",
+                                 (since_seq, exclude_site or "", limit)).fetchall()
+
+    @timed_query
+    def get_sync_watermark(self, peer_id):
+        """peer_id'den alınan son işlemin (eşin günlüğündeki) seq'i; eşitleme buradan devam eder"""
+        row = self.conn.execute("SELECT pulled_seq FROM sync_peers WHERE peer = ?", (peer_id,)).fetchone()
+        return row[0] if row else 0
+
+    @timed_query
+    def apply_operations(self, peer_id, operations):
+        """Eşten alınan işlemleri uygular ve eşin filigranını aynı işlemde ilerletir; yeni işlem sayısını döndürür"""
+        if not operations:
+            return 0
+        affected, applied, max_clock = set(), 0, 0
+        try:
+            for _, clock, site, uid, op, data in operations:
+                if self._is_archived(uid):
+                    continue
+                inserted = self.conn.execute("INSERT OR IGNORE INTO oplog (clock, site, uid, op, data) VALUES (?, ?, ?, ?, ?)",
+                                             (clock, site, uid, op, data)).rowcount
+                if inserted:
+                    applied += 1
+                    affected.add(uid)
+                    max_clock = max(max_clock, clock)
+            for uid in affected:
+                self._materialize(uid)
+            self.conn.execute("UPDATE sync_state SET value = MAX(value, ?) WHERE key = 'clock'", (max_clock,))
+            self.conn.execute("INSERT OR REPLACE INTO sync_peers (peer, pulled_seq, synced_at) VALUES (?, ?, ?)",
+                              (peer_id, max(operation[0] for operation in operations), datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return applied
+
+    @timed_query
     def get_blacklist(self):
         self.cursor.execute("SELECT type, value, reason, date_added FROM blacklist ORDER BY date_added DESC")
         return self.cursor.fetchall()
 
+    @timed_query
     def add_to_blacklist(self, item_value, item_type, reason):
         date_added = datetime.now().strftime("%Y-%m-%d %H:%M")
         try:
@@ -100,38 +548,178 @@ class Database:
         except sqlite3.IntegrityError:
             return False
 
+    @timed_query
     def remove_from_blacklist(self, item_value, item_type):
         self.cursor.execute("DELETE FROM blacklist WHERE type = ? AND value = ?", (item_type.upper(), item_value.upper()))
         self.conn.commit()
 
+    @timed_query
+    def is_blacklisted(self, item_value, item_type):
+        """Plakalar boşluk/tire farkı gözetilmeden, sürücüler büyük harfe çevrilerek karşılaştırılır"""
+        plates, drivers = self._blacklist_keys()
+        if item_type.upper() == "PLAKA":
+            return plate_key(item_value) in plates
+        return item_value.upper() in drivers
+
+    def _blacklist_keys(self):
+        """(plaka anahtarları, sürücü adları) kümeleri; kara liste küçük olduğundan tamamı okunur"""
+        plates, drivers = set(), set()
+        for item_type, value in self.conn.execute("SELECT type, value FROM blacklist"):
+            if item_type == "PLAKA":
+                plates.add(plate_key(value))
+            else:
+                drivers.add(value)
+        return plates, drivers
+
+    @timed_query
+    def get_open_visits(self):
+        """İçerideki araçlar (id, plaka, giriş tarihi); kamera eşleştirme motorunun başlangıç indeksi"""
+        return self.conn.execute("SELECT id, plaka, entryDate FROM vehicles WHERE status = 'inside'").fetchall()
+
+    @timed_query
+    def ingest_events(self, events):
+        """Doğrulanmış kamera/turnike olaylarını tek işlemde yazar; sonuçlar olaylarla aynı sırada"""
+        received_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        blocked = self._blacklist_keys()
+        results = []
+        try:
+            for event in events:
+                previous = self.conn.execute("SELECT status, record_id FROM ingested_events WHERE event_id = ?", (event['event_id'],)).fetchone()
+                if previous:
+                    results.append({'event_id': event['event_id'], 'status': previous[0], 'record_id': previous[1], 'duplicate': True})
+                    continue
+                status, record_id = self._ingest_event(event, blocked)
+                self.conn.execute("INSERT INTO ingested_events (event_id, status, record_id, received_at) VALUES (?, ?, ?, ?)",
+                                  (event['event_id'], status, record_id, received_at))
+                results.append({'event_id': event['event_id'], 'status': status, 'record_id': record_id})
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return results
+
+    def _ingest_event(self, event, blocked):
+        plates, drivers = blocked
+        plate, driver = event['plate'], event.get('driver', '').upper()
+        if event['type'] == "exit":
+            row = None
+            if event.get('record_id') is not None:
+                # Eşleştirme motoru ziyareti biliyorsa plakayla arama yapılmaz
+                row = self.conn.execute("SELECT id FROM vehicles WHERE id = ? AND status = 'inside'", (event['record_id'],)).fetchone()
+            record_id = row[0] if row else self._open_visit_id(plate, event['time'])
+            if record_id is None:
+                return "no_open_visit", None
+            self._checkout(record_id, event['time'])
+            return "checked_out", record_id
+        # İçerideyken gelen yeni giriş önceki ziyaretin çıkışının kaçırıldığını gösterir; araç en geç bu
+        # girişte çıkmıştır. Önceki ziyaret kapatılır (giriş kara liste nedeniyle yazılmasa da), yoksa
+        # sonsuza kadar içeride görünür.
+        for (stale_id,) in self.conn.execute("SELECT id FROM vehicles WHERE plaka_key = ? AND status = 'inside' AND entryDate <= ?",
+                                             (plate_key(plate), event['time'])).fetchall():
+            self._checkout(stale_id, event['time'])
+        if plate_key(plate) in plates or (driver and driver in drivers):
+            logger.log_warning(f"Kara listedeki araç girişi engellendi: {plate} {driver} (kaynak: {event.get('camera') or '-'})")
+            return "blacklisted", None
+        values = (plate, event.get('trailer', '').upper(), driver, event.get('phone', ''), event.get('firm', '').upper(),
+                  event.get('destination', '').upper())
+        return "created", self._insert_record(values, event.get('notes', ''), event['time'])
+
+    @timed_query
     def get_status_counts(self, year, month):
-        params = (str(year), f"{month:02d}")
-        self.cursor.execute("SELECT COUNT(*) FROM vehicles WHERE status = 'inside' AND strftime('%Y', entryDate) = ? AND strftime('%m', entryDate) = ?", params)
-        inside = self.cursor.fetchone()[0]
-        self.cursor.execute("SELECT COUNT(*) FROM vehicles WHERE status = 'checked_out' AND strftime('%Y', entryDate) = ? AND strftime('%m', entryDate) = ?", params)
-        checked_out = self.cursor.fetchone()[0]
+        start, end = _month_range(year, month)
+        self.cursor.execute("SELECT COALESCE(SUM(status = 'inside'), 0), COALESCE(SUM(status = 'checked_out'), 0) FROM vehicles WHERE entryDate >= ? AND entryDate < ?", (start, end))
+        inside, checked_out = self.cursor.fetchone()
         return inside, checked_out
 
+    @timed_query
     def get_entry_data_for_range(self, start_date, end_date):
         self.cursor.execute("SELECT strftime('%Y-%m-%d', entryDate), COUNT(*) FROM vehicles WHERE date(entryDate) BETWEEN ? AND ? GROUP BY 1 ORDER BY 1 ASC", (start_date, end_date))
         return self.cursor.fetchall()
 
+    @timed_query
     def get_top_firms(self, start_date, end_date, limit=10):
         self.cursor.execute("SELECT gelinenFirma, COUNT(*) c FROM vehicles WHERE date(entryDate) BETWEEN ? AND ? AND gelinenFirma != '' GROUP BY 1 ORDER BY 2 DESC LIMIT ?", (start_date, end_date, limit))
         return self.cursor.fetchall()
 
+    @timed_query
     def get_top_drivers(self, start_date, end_date, limit=10):
         self.cursor.execute("SELECT surucu, COUNT(*) c FROM vehicles WHERE date(entryDate) BETWEEN ? AND ? AND surucu != '' GROUP BY 1 ORDER BY 2 DESC LIMIT ?", (start_date, end_date, limit))
         return self.cursor.fetchall()
         
+    @timed_query
     def get_top_vehicles(self, start_date, end_date, limit=10):
         self.cursor.execute("SELECT plaka, COUNT(*) c FROM vehicles WHERE date(entryDate) BETWEEN ? AND ? AND plaka != '' GROUP BY 1 ORDER BY 2 DESC LIMIT ?", (start_date, end_date, limit))
         return self.cursor.fetchall()
 
+    @timed_query
+    def get_report_aggregates(self, start_date, end_date, metrics=DEFAULT_METRICS):
+        """Tüm rapor metriklerini aralığı tek geçişte okuyarak hesaplar (bkz. report_engine)"""
+        return aggregate_report(self.conn.cursor(), start_date, end_date, metrics)
+
+    @timed_query
+    def iter_dwell_times(self, start_date, end_date, batch_size=5000):
+        """Aralıktaki çıkış yapmış kayıtların (firma, bekleme_saniye) satırlarını akış halinde döndürür"""
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT gelinenFirma, {DWELL_SECONDS_SQL} FROM vehicles "
+                       "WHERE entryDate >= ? AND entryDate < date(?, '+1 day') AND exitDate IS NOT NULL AND exitDate != ''", (start_date, end_date))
+        return _stream_rows(cursor, batch_size)
+
+    def _custom_report_conditions(self, start_date, end_date, filters, match_mode):
+        conditions, params = ["entryDate >= ?", "entryDate < date(?, '+1 day')"], [start_date, end_date]
+        for column, value in (filters or {}).items():
+            if column not in REPORT_FILTER_KEYS or not value:
+                continue
+            key_column, key_function = REPORT_FILTER_KEYS[column]
+            key = key_function(value)
+            if key:
+                condition, condition_params = _key_filter(key_column, key, match_mode)
+                conditions.append(condition); params.extend(condition_params)
+        return " AND ".join(conditions), params
+
+    @timed_query
+    def fetch_custom_report_data(self, start_date, end_date, filters=None, columns=None, sort_by=None, descending=False,
+                                 match_mode="contains", batch_size=2000):
+        """Özel rapor verisini akış halinde döndürür (match_mode: 'exact', 'prefix', 'contains')"""
+        columns = list(columns or REPORT_SELECT)
+        where, params = self._custom_report_conditions(start_date, end_date, filters, match_mode)
+        select_list = ", ".join(f"{REPORT_SELECT[column]} AS {column}" for column in columns)
+        query = f"SELECT {select_list} FROM vehicles WHERE {where}" + _order_clause(sort_by, descending)
+        cursor = self.conn.cursor()
+        cursor.execute(query, params)
+        return _stream_rows(cursor, batch_size)
+
+    @timed_query
+    def count_custom_report_data(self, start_date, end_date, filters=None, match_mode="contains"):
+        where, params = self._custom_report_conditions(start_date, end_date, filters, match_mode)
+        self.cursor.execute(f"SELECT COUNT(*) FROM vehicles WHERE {where}", params)
+        return self.cursor.fetchone()[0]
+
+    @timed_query
+    def get_long_stays(self, threshold_hours, limit=200):
+        """Eşikten uzun süredir içeride olan araçları en eskiden başlayarak döndürür"""
+        cutoff = (datetime.now() - timedelta(hours=threshold_hours)).strftime("%Y-%m-%d %H:%M")
+        self.cursor.execute("SELECT id, plaka, surucu, gelinenFirma, entryDate, "
+                            "CAST((julianday('now', 'localtime') - julianday(entryDate)) * 86400 AS INTEGER) "
+                            "FROM vehicles WHERE status = 'inside' AND entryDate < ? ORDER BY entryDate LIMIT ?", (cutoff, limit))
+        return self.cursor.fetchall()
+
+    @timed_query
+    def get_autocomplete_values(self, column):
+        """Sütunun değerleri: (anahtar, en son yazım, kullanım sayısı, son giriş epoch sn)"""
+        if column not in AUTOCOMPLETE_KEYS:
+            raise ValueError(f"Otomatik tamamlama sütunu değil: {column}")
+        return self.conn.execute(f"SELECT {AUTOCOMPLETE_KEYS[column]}, {column}, COUNT(*), CAST(strftime('%s', MAX(entryDate), 'utc') AS INTEGER) "
+                                 f"FROM vehicles WHERE {column} != '' GROUP BY 1").fetchall()
+
+    @timed_query
     def backup_database(self, backup_path):
         os.makedirs(os.path.dirname(backup_path), exist_ok=True)
-        with sqlite3.connect(backup_path) as bck:
+        # "with" yalnızca commit eder; dosyanın hemen silinebilmesi için bağlantı açıkça kapatılır
+        bck = sqlite3.connect(backup_path)
+        try:
             self.conn.backup(bck)
+        finally:
+            bck.close()
         return backup_path
     
     def cleanup_old_backups(self, backup_dir, retention_days, prefix):
@@ -151,17 +739,20 @@ class Database:
                 except (IndexError, ValueError):
                     continue
             
+    @timed_query
     def get_oldest_record_date(self):
         self.cursor.execute("SELECT MIN(entryDate) FROM vehicles")
         result = self.cursor.fetchone()
         return result[0] if result else None
 
+    @timed_query
     def get_record_count_before_date(self, date_str):
         self.cursor.execute("SELECT COUNT(*) FROM vehicles WHERE entryDate < ?", (date_str,))
         return self.cursor.fetchone()[0]
 
+    @timed_query
     def archive_records_before_date(self, archive_db_path, date_str):
-        self.cursor.execute("SELECT * FROM vehicles WHERE entryDate < ?", (date_str,))
+        self.cursor.execute(f"SELECT {RECORD_COLUMNS} FROM vehicles WHERE entryDate < ?", (date_str,))
         records_to_archive = self.cursor.fetchall()
         if not records_to_archive: return 0
         
@@ -172,10 +763,16 @@ class Database:
         archive_conn.commit()
         archive_conn.close()
         
+        # Arşivlenen kayıtlara mezar taşı konur ve işlemleri silinir; filigranı eski bir eş (yeni kurulan veya
+        # sıfırlanan) 'add' işlemini yeniden gönderse de kayıt geri gelmez (_materialize, apply_operations)
+        self.cursor.execute("INSERT OR IGNORE INTO archived_uids (uid) SELECT COALESCE(uid, 'L' || ? || ':' || id) FROM vehicles WHERE entryDate < ?",
+                            (self.get_base_id(), date_str))
+        self.cursor.execute("DELETE FROM oplog WHERE uid IN (SELECT uid FROM vehicles WHERE entryDate < ? AND uid IS NOT NULL)", (date_str,))
         self.cursor.execute("DELETE FROM vehicles WHERE entryDate < ?", (date_str,))
         self.conn.commit()
         return len(records_to_archive)
 
+    @timed_query
     def get_record_count(self):
         self.cursor.execute("SELECT COUNT(*) FROM vehicles")
         return self.cursor.fetchone()[0]
\ No newline at end of file
@@ -39,6 +39,7 @@ def main():
         logger.log_info("VehicleApp başlatıldı")
         
         root.mainloop()
+        app.shutdown()
         logger.log_info("Uygulama normal şekilde sonlandı")
         
     except Exception as e:
@@ -68,6 +69,10 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Rapor işleri ayrı süreçlerde çalışır; paketlenmiş (exe) sürümde gerekli
+    if getattr(sys, 'frozen', False):
+        import multiprocessing
+        multiprocessing.freeze_support()
     # Temel loggingi kur
     setup_basic_logging()
     main()
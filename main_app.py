@@ -5,21 +5,30 @@ import sv_ttk
 from datetime import datetime, timedelta
 import os
 import calendar
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 # Modüllerden importlar
-from database import Database
 from Modules.database_service import DatabaseService
 from Modules.helpers import get_db_path
+from Modules.sync_client import open_database
 from Modules.backup_manager import BackupManager
+from Modules.report_cache import ReportCache
+from Modules.report_jobs import ReportJobQueue
 from Modules.logger import logger
+from Modules.query_stats import query_stats, format_query_stats
+from Modules.diagnostics import EventLoopLagMonitor, StallWatchdog, STALL_THRESHOLD_MS
 from Modules.virtualized_treeview import VirtualizedTreeview
 from Modules.custom_windows import CustomMessageBox
+from Modules.autocomplete import FormAutocomplete
 
 # UI importları
 from Modules.ui.menu import create_main_menu
 from Modules.ui.main_tab_widgets import create_form_frame, create_filter_frame, create_actions_frame
 from Modules.ui.reports_tab import create_reports_tab
-from Modules.ui.treeview_setup import create_treeview, populate_treeview_data, create_right_click_menu, update_right_click_menu_state
+from Modules.ui.treeview_setup import (create_treeview, populate_treeview_data, create_right_click_menu, update_right_click_menu_state,
+                                      update_sort_indicators, update_filter_status_label, TREE_SORT_KEYS)
 
 # Handler importları
 from Modules.handlers import main_handlers, menu_handlers, window_handlers
@@ -28,13 +37,26 @@ class VehicleApp:
     def __init__(self, root, settings):
         try:
             logger.log_info("VehicleApp başlatılıyor")
+            # Açılış aşamalı yapılır: önce pencere çizilir, bu ayın kayıtları arka planda yüklenir,
+            # raporlar sekmesi ilk açılışta kurulur, bakım işleri boşta kalınca yapılır.
+            self.startup_started = time.perf_counter()
+            self.startup_timings = {}
             self.root = root
             self.settings = settings
-            sv_ttk.set_theme(self.settings.get('theme', 'light'))
+            with self.startup_stage("tema"):
+                sv_ttk.set_theme(self.settings.get('theme', 'light'))
             
-            db_instance = Database(get_db_path())
-            self.db = DatabaseService(db_instance)
+            with self.startup_stage("veritabanı"):
+                query_stats.configure(self.settings)
+                # Eksik sıralama anahtarları açılışı bekletmesin; boşta parça parça doldurulur.
+                # İstemci modunda (sync_mode) kayıtlar sunucudaki veritabanına gider.
+                db_instance = open_database(self.settings, get_db_path(), fill_sort_keys=False)
+                self.db = DatabaseService(db_instance)
             self.backup_manager = BackupManager(self)
+            self.report_cache = ReportCache(self.settings.get("report_cache_size", 12))
+            self.report_jobs = ReportJobQueue(self.settings.get("report_job_workers", 2))
+            self.stall_watchdog = StallWatchdog(self.settings.get("stall_threshold_ms", STALL_THRESHOLD_MS))
+            self.loop_monitor = EventLoopLagMonitor(self.root, watchdog=self.stall_watchdog)
             
             self.root.title("Sönmez Flament Araç Takip Programı")
             self.root.state('zoomed')
@@ -42,11 +64,10 @@ class VehicleApp:
             
             self.setup_variables()
             self.apply_styles()
-            self.create_widgets()
-            
-            self.check_virtualization_and_populate()
-            self.backup_manager.start_schedulers()
+            with self.startup_stage("arayüz"):
+                self.create_widgets()
             
+            self.root.after_idle(self._on_first_paint)
             self.root.after(100, self.center_window)
             logger.log_info("VehicleApp başarıyla başlatıldı")
             
@@ -54,9 +75,137 @@ class VehicleApp:
             logger.log_error("VehicleApp başlatma hatası", e)
             raise
 
+    @contextmanager
+    def startup_stage(self, name):
+        """Açılış aşamasının süresini ölçüp günlüğe yazar ve startup_timings'e kaydeder"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.startup_timings[name] = (now - started) * 1000
+            logger.log_info(f"Açılış aşaması '{name}': {self.startup_timings[name]:.0f} ms "
+                            f"(başlangıçtan {(now - self.startup_started) * 1000:.0f} ms)")
+
+    def _mark_startup(self, name):
+        """Tek bir an olan açılış olayını (ilk çizim, etkileşime hazır) başlangıca göre kaydeder"""
+        self.startup_timings[name] = (time.perf_counter() - self.startup_started) * 1000
+        logger.log_info(f"Açılış: {name} {self.startup_timings[name]:.0f} ms")
+
+    def _on_first_paint(self):
+        """Pencere ilk kez çizildikten sonra (Tk boşta) çalışır: kayıt yüklemesini başlatır"""
+        self.root.update_idletasks()  # bekleyen yerleşim ve çizim işleri bitmiş olsun
+        self._mark_startup("ilk çizim")
+        self.load_initial_view()
+
+    def load_initial_view(self):
+        """Bu ayın kayıtlarını ve durum sayılarını ayrı bir iş parçacığında hazırlar; pencere bu sırada kullanılabilir"""
+        self.initial_view_pending = True
+        self.filter_status_label.config(text="Kayıtlar yükleniyor...")
+        year, month = self.db.selected_year_month(self.year_var, self.month_var)
+        options = (year, month, TREE_SORT_KEYS.get(self.sort_column, 'id'), self.sort_descending,
+                   self.settings.get("virtualization_threshold", 100), self.settings.get("enable_virtualization", True),
+                   self.tree.page_size)
+        started = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="acilis")
+        future = executor.submit(self.db.compute_initial_view, *options)
+        executor.shutdown(wait=False)
+        self.root.after(20, lambda: self._poll_initial_view(future, started))
+
+    def _poll_initial_view(self, future, started):
+        if not future.done():
+            self.root.after(20, lambda: self._poll_initial_view(future, started))
+            return
+        self.startup_timings["kayıt sorgusu"] = (time.perf_counter() - started) * 1000
+        logger.log_info(f"Açılış aşaması 'kayıt sorgusu': {self.startup_timings['kayıt sorgusu']:.0f} ms (arka planda)")
+        try:
+            view = future.result()
+        except Exception as e:
+            logger.log_error("Açılış kayıt yükleme hatası", e)
+            view = None
+        # Kullanıcı bu arada filtre veya arama yaptıysa onun sonucu ekranda kalır
+        if self.initial_view_pending:
+            with self.startup_stage("kayıt gösterimi"):
+                if view is None:
+                    self.check_virtualization_and_populate()
+                else:
+                    self._show_initial_view(view)
+        self._mark_startup("etkileşime hazır")
+        self.root.after_idle(self._run_idle_startup_tasks)
+
+    def _show_initial_view(self, view):
+        self.initial_view_pending = False
+        self.use_virtualization_for_current_data = view['virtualize'] and isinstance(self.tree, VirtualizedTreeview)
+        self.current_filters = {'status_filter': None, 'date_filter': None, 'search_term': None}
+        if self.use_virtualization_for_current_data:
+            self.tree.set_data_source(view['count'], self._page_loader(None, None, None),
+                                      first_page=self._process_records_for_display(view['records']))
+            update_filter_status_label(self.filter_status_label, None, None, None)
+        else:
+            populate_treeview_data(self.tree, view['records'], self.filter_status_label, None, None, None)
+        self.update_status_counts(view['counts'])
+        self._update_pagination_controls()
+        self.update_action_buttons_state()
+
+    def _run_idle_startup_tasks(self):
+        """Açılışı bekletmesi gerekmeyen işler: durum çubuğu, zamanlayıcılar, şema bakımı"""
+        with self.startup_stage("durum çubuğu ve zamanlayıcılar"):
+            self.update_status_bar()
+            self.backup_manager.start_schedulers()
+            self.loop_monitor.start()
+        self.root.after(5000, lambda: window_handlers.schedule_report_prewarm(self))
+        self.root.after_idle(self._fill_sort_keys_step)
+        self.root.after_idle(self._load_autocomplete)
+
+    def _load_autocomplete(self):
+        """Form alanlarının öneri dizinlerini ayrı bir iş parçacığında kurar; bu sırada öneri gösterilmez"""
+        if not self.autocomplete:
+            return
+        started = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="oneriler")
+        future = executor.submit(self.db.compute_autocomplete_indexes, self.settings.get("autocomplete_limit", 8))
+        executor.shutdown(wait=False)
+        self.root.after(50, lambda: self._poll_autocomplete(future, started))
+
+    def _poll_autocomplete(self, future, started):
+        if not future.done():
+            self.root.after(50, lambda: self._poll_autocomplete(future, started))
+            return
+        try:
+            indexes = future.result()
+        except Exception as e:
+            logger.log_error("Otomatik tamamlama yükleme hatası", e)
+            return
+        self.autocomplete.load(indexes)
+        logger.log_info(f"Otomatik tamamlama hazır: {sum(len(index) for index in indexes.values())} değer "
+                        f"({(time.perf_counter() - started) * 1000:.0f} ms, arka planda)")
+
+    def _fill_sort_keys_step(self, filled=0):
+        """Eksik sıralama anahtarlarını (eski veritabanından geçişte) arayüzü kilitlemeden parça parça doldurur"""
+        try:
+            updated = self.db.db.fill_missing_sort_keys()
+        except Exception as e:
+            logger.log_error("Sıralama anahtarı doldurma hatası", e)
+            return
+        if updated:
+            self.root.after(10, lambda: self._fill_sort_keys_step(filled + updated))
+        elif filled:
+            logger.log_info(f"Eksik sıralama anahtarları dolduruldu ({filled} güncelleme)")
+            self.populate_treeview(**self.current_filters)
+
     def setup_variables(self):
+        self.initial_view_pending = False
+        self.reports_tab_built = False
         self.last_backup_date = datetime.now().date() - timedelta(days=1)
         self.use_virtualization_for_current_data = False
+        self.sort_column, self.sort_descending = "Sıra No", True
+        self.current_filters = {}
+        self.jobs_window, self.report_jobs_polling, self.notified_jobs = None, False, set()
+        self.performance_window = None
+        self.log_viewer = None
+        # Form önerileri; dizinler açılıştan sonra arka planda kurulur (_load_autocomplete)
+        autocomplete_limit = self.settings.get("autocomplete_limit", 8)
+        self.autocomplete = FormAutocomplete(autocomplete_limit) if autocomplete_limit else None
         self.placeholder_map = {
             "Plaka": "Plaka giriniz", "Dorse": "Dorse plakası (varsa)", 
             "Sürücü": "Sürücü adı soyadı", "Telefon": "Telefon numarası", 
@@ -94,7 +243,7 @@ class VehicleApp:
         self.notebook.bind("<<NotebookTabChanged>>", lambda e: window_handlers.on_tab_change(self, e))
 
         self.create_main_tab_widgets()
-        self.create_reports_tab_widgets()
+        # Raporlar sekmesinin içeriği sekme ilk açıldığında kurulur (ensure_reports_tab)
         self.setup_system_status(main_container)
         
         self.tree.bind("<<TreeviewSelect>>", self.update_action_buttons_state)
@@ -104,17 +253,20 @@ class VehicleApp:
             'settings': lambda: menu_handlers.open_settings_window(self),
             'export_excel': lambda: menu_handlers.export_to_excel(self),
             'custom_report': lambda: menu_handlers.open_custom_report_generator(self),
+            'report_jobs': lambda: menu_handlers.show_report_jobs(self),
             'blacklist': lambda: menu_handlers.open_blacklist_manager(self),
             'exit': self.root.quit,
             'backup_now': lambda: menu_handlers.manual_backup(self),
             'restore_backup': lambda: menu_handlers.restore_from_backup(self),
             'show_errors': lambda: menu_handlers.show_error_logs(self),
+            'performance': lambda: menu_handlers.show_performance(self),
             'about': lambda: menu_handlers.show_about(self)
         }
         self.menu_bar = create_main_menu(self.root, menu_commands)
 
     def create_main_tab_widgets(self):
-        form_data = create_form_frame(self.main_tab, self.placeholder_map, lambda: main_handlers.add_record(self), self.clear_form)
+        suggest = self.autocomplete.suggest if self.autocomplete else None
+        form_data = create_form_frame(self.main_tab, self.placeholder_map, lambda: main_handlers.add_record(self), self.clear_form, suggest)
         self.entries, self.notes_entry = form_data['entries'], form_data['notes_entry']
         
         years = [str(y) for y in range(datetime.now().year, datetime.now().year - 6, -1)]
@@ -125,12 +277,14 @@ class VehicleApp:
         self.inside_button, self.checked_out_button = filter_data['inside_button'], filter_data['checked_out_button']
         self.filter_status_label = filter_data['filter_status_label']
         
-        action_data = create_actions_frame(self.main_tab, self.open_editor_window, lambda: main_handlers.delete_record(self), lambda: main_handlers.checkout_selected(self), lambda: main_handlers.reactivate_record(self))
+        action_data = create_actions_frame(self.main_tab, self.open_editor_window, lambda: main_handlers.delete_record(self), lambda: main_handlers.checkout_selected(self), lambda: main_handlers.reactivate_record(self), lambda: main_handlers.checkout_by_plate(self))
         self.edit_button, self.delete_button = action_data['edit_button'], action_data['delete_button']
         self.checkout_button, self.reactivate_button = action_data['checkout_button'], action_data['reactivate_button']
+        self.plate_checkout_entry = action_data['plate_checkout_entry']
         
-        tree_data = create_treeview(self.main_tab, self.settings)
+        tree_data = create_treeview(self.main_tab, self.settings, lambda column: main_handlers.sort_by_column(self, column))
         self.tree, self.pagination_frame = tree_data['tree'], tree_data['pagination_frame']
+        update_sort_indicators(self.tree, self.sort_column, self.sort_descending)
         
         self.create_pagination_controls()
         
@@ -146,9 +300,17 @@ class VehicleApp:
         self.next_page_button.pack(side='right', padx=5)
         self.pagination_frame.grid_remove()
         
+    def ensure_reports_tab(self):
+        """Raporlar sekmesinin bileşenlerini ilk kullanımda bir kez oluşturur"""
+        if not self.reports_tab_built:
+            with self.startup_stage("raporlar sekmesi"):
+                self.create_reports_tab_widgets()
+            self.reports_tab_built = True
+
     def create_reports_tab_widgets(self):
         reports_data = create_reports_tab(self.reports_tab, lambda: window_handlers.update_reports_data(self))
         self.start_date_var, self.end_date_var, self.report_widgets = reports_data['start_date_var'], reports_data['end_date_var'], reports_data['report_widgets']
+        self.report_refresh_label = reports_data['refresh_label']
 
     def setup_system_status(self, parent):
         ttk.Separator(parent, orient='horizontal').pack(side='bottom', fill='x', padx=10)
@@ -173,8 +335,6 @@ class VehicleApp:
         ttk.Label(error_frame, text="Hata Durumu:", style='Bold.TLabel').pack(side='left')
         self.error_status_label = ttk.Label(error_frame, text="-", font=("Segoe UI", 9), cursor="hand2"); self.error_status_label.pack(side='left', padx=5)
         self.error_status_label.bind("<Button-1>", lambda e: menu_handlers.show_error_logs(self))
-        
-        self.root.after(1000, self.update_status_bar)
 
     def update_status_bar(self):
         try:
@@ -223,20 +383,44 @@ class VehicleApp:
         last_backup_month = self.backup_manager.last_monthly_backup or 'Hiç'
         CustomMessageBox(self.root, "Aylık Yedek Bilgisi", f"Aylık yedekler her ayın son günü ({last_day}. gün) otomatik alınır.\nSon alınan aylık yedek: {last_backup_month}. ay")
     
+    def shutdown(self):
+        """Arka plan rapor hesaplamalarını ve rapor iş havuzunu kapatır, sorgu istatistiklerini günlüğe yazar."""
+        self.loop_monitor.stop()
+        self.report_cache.shutdown()
+        self.report_jobs.shutdown()
+        if query_stats.snapshot():
+            logger.log_info("Oturum sorgu istatistikleri:\n" + format_query_stats(query_stats.snapshot(), top=15))
+
     def check_virtualization_and_populate(self):
         total_records = self.db.db.get_record_count()
         threshold = self.settings.get("virtualization_threshold", 100)
         self.use_virtualization_for_current_data = self.settings.get("enable_virtualization", True) and total_records > threshold
         self.populate_treeview()
 
+    def _sort_options(self):
+        return {'order_by': TREE_SORT_KEYS.get(self.sort_column, 'id'), 'descending': self.sort_descending}
+
+    def _page_loader(self, status_filter, date_filter, search_term):
+        """Sanal mod için sayfa yükleyici: sadece görünen sayfa veritabanından sıralı olarak çekilir"""
+        sort_options = self._sort_options()
+        def load_page(offset, limit):
+            records = self.db.get_filtered_records(self.year_var, self.month_var, status_filter, date_filter, search_term,
+                                                   limit=limit, offset=offset, **sort_options)
+            return self._process_records_for_display(records)
+        return load_page
+
     def populate_treeview(self, status_filter=None, date_filter=None, search_term=None):
         try:
-            records = self.db.get_filtered_records(self.year_var, self.month_var, status_filter, date_filter, search_term)
+            self.initial_view_pending = False
+            self.current_filters = {'status_filter': status_filter, 'date_filter': date_filter, 'search_term': search_term}
+            sort_options = self._sort_options()
             
             if self.use_virtualization_for_current_data and isinstance(self.tree, VirtualizedTreeview):
-                processed_data = self._process_records_for_display(records)
-                self.tree.set_data(processed_data)
+                total = self.db.count_filtered_records(self.year_var, self.month_var, status_filter, date_filter, search_term)
+                self.tree.set_data_source(total, self._page_loader(status_filter, date_filter, search_term))
+                update_filter_status_label(self.filter_status_label, status_filter, date_filter, search_term)
             else:
+                records = self.db.get_filtered_records(self.year_var, self.month_var, status_filter, date_filter, search_term, **sort_options)
                 populate_treeview_data(self.tree, records, self.filter_status_label, status_filter, date_filter, search_term)
             
             self.update_status_counts()
@@ -271,8 +455,9 @@ class VehicleApp:
 
         return processed
 
-    def update_status_counts(self):
-        counts = self.db.get_status_counts(self.year_var, self.month_var)
+    def update_status_counts(self, counts=None):
+        if counts is None:
+            counts = self.db.get_status_counts(self.year_var, self.month_var)
         self.inside_button.config(text=f"Aktif İçeride: {counts['inside']}")
         self.checked_out_button.config(text=f"Çıkış Yapan: {counts['checked_out']}")
 